@@ -0,0 +1,73 @@
+"""
+Compare the chunked bulk operations of BitArray against the original
+per-byte Python loop.
+
+Run from the repository root: python benchmarks/bench_bit_array.py
+"""
+
+
+import os
+import sys
+from timeit import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+from src import BitArray  # noqa: E402
+
+
+def legacy_or(self: BitArray, other: BitArray) -> None:
+    # The byte-at-a-time loop BitArray.bitwise_or used to run
+    for i in range(len(self._arr)):
+        self._arr[i] |= other._arr[i]
+
+
+def legacy_count(self: BitArray) -> int:
+    return sum(bin(byte).count("1") for byte in self._arr)
+
+
+def bench(size: int, repeat: int = 3) -> None:
+    a = BitArray(size)
+    b = BitArray(size)
+    for i in range(0, size, 97):
+        b[i] = 1
+
+    old = timeit(lambda: legacy_or(a, b), number=repeat) / repeat
+    new = timeit(lambda: a.bitwise_or(b), number=repeat) / repeat
+    print(
+        f"or     n={size:>12,}  loop {old * 1e3:9.2f} ms  "
+        f"bulk {new * 1e3:8.2f} ms  x{old / new:7.1f}"
+    )
+
+    old = timeit(lambda: legacy_count(b), number=repeat) / repeat
+    new = timeit(lambda: b.count(), number=repeat) / repeat
+    print(
+        f"count  n={size:>12,}  loop {old * 1e3:9.2f} ms  "
+        f"bulk {new * 1e3:8.2f} ms  x{old / new:7.1f}"
+    )
+
+    for name, op in [
+        ("and", lambda: a & b),
+        ("xor", lambda: a ^ b),
+        ("andnot", lambda: a - b),
+        ("invert", lambda: ~a),
+        ("eq", lambda: a == b),
+    ]:
+        t = timeit(op, number=repeat) / repeat
+        print(f"{name:<6} n={size:>12,}  bulk {t * 1e3:8.2f} ms")
+
+
+def bench_scan(size: int, density: float = 0.001) -> None:
+    bit_array = BitArray(size)
+    bit_array.set_many(range(0, size, int(1 / density)))
+    t = timeit(lambda: sum(1 for _ in bit_array.iter_ones()), number=1)
+    print(
+        f"iter_ones n={size:>12,}  {bit_array.count():,} set  "
+        f"{t * 1e3:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for size in (10_000_000, 100_000_000):
+        bench(size)
+        bench_scan(size)
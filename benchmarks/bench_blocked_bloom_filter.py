@@ -0,0 +1,56 @@
+"""
+Compare BlockedBloomFilter against the classic BloomFilter layout:
+lookup latency on filters far larger than the CPU caches, and the false
+positive rate each layout actually reaches for the same n and fp_rate.
+
+Run from the repository root: python benchmarks/bench_blocked_bloom_filter.py
+"""
+
+
+import os
+import sys
+from timeit import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+from src import BlockedBloomFilter  # noqa: E402
+from src import BloomFilter  # noqa: E402
+
+LAYOUTS = (("classic", BloomFilter), ("blocked", BlockedBloomFilter))
+
+
+def bench_latency(n: int, queries: int = 200_000) -> None:
+    keys = [f"key-{i}" for i in range(queries)]
+    for name, cls in LAYOUTS:
+        bloom = cls(n, 0.01)
+        # Every bit set: each query reads all k of its bits, like a hit
+        with bloom._bit_array.memory as mem:
+            mem[:] = b"\xff" * len(mem)
+        mib = len(bloom._bit_array) / 8 / 2**20
+        seconds = timeit(lambda: [bloom.may_contain(k) for k in keys], number=1)
+        print(
+            f"{name:<8} m={mib:>8,.0f} MiB  "
+            f"{seconds / queries * 1e6:6.2f} us/lookup"
+        )
+
+
+def bench_fpp(n: int, fp_rate: float) -> None:
+    keys = [f"key-{i}" for i in range(n)]
+    misses = [f"miss-{i}" for i in range(n)]
+    for name, cls in LAYOUTS:
+        bloom = cls(n, fp_rate)
+        bloom.put_many(keys)
+        measured = sum(bloom.may_contain_many(misses)) / n
+        expected = bloom.expected_fpp()
+        print(
+            f"{name:<8} fp_rate={fp_rate:<6} expected={expected:.5f}  "
+            f"measured={measured:.5f}"
+        )
+
+
+if __name__ == "__main__":
+    for n in (1_000_000, 100_000_000, 1_000_000_000):
+        bench_latency(n)
+    for fp_rate in (0.05, 0.01, 0.001):
+        bench_fpp(200_000, fp_rate)
@@ -0,0 +1,84 @@
+"""
+Compare BloomFilter put/may_contain throughput against the original
+implementation, which ran up to k cryptographic digests per item.
+
+Run from the repository root: python benchmarks/bench_bloom_filter.py
+"""
+
+
+import hashlib
+import os
+import sys
+from timeit import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+from src import BloomFilter  # noqa: E402
+
+_LEGACY_POOL = [
+    hashlib.blake2s,
+    hashlib.blake2b,
+    hashlib.sha1,
+    hashlib.md5,
+    hashlib.sha256,
+    hashlib.sha224,
+    hashlib.sha512,
+    hashlib.sha384,
+    hashlib.sha3_384,
+    hashlib.sha3_512,
+    hashlib.sha3_224,
+    hashlib.sha3_256,
+]
+
+
+def legacy_put(bloom: BloomFilter, item) -> None:
+    bit_array = bloom._bit_array
+    signature = hash(item).to_bytes(64, byteorder="big", signed=True)
+    for hasher in _LEGACY_POOL[: bloom._num_hashes]:
+        digest = hasher(signature).digest()
+        bucket = int.from_bytes(digest, byteorder="little") % len(bit_array)
+        bit_array[bucket] = 1
+
+
+def legacy_may_contain(bloom: BloomFilter, item) -> bool:
+    bit_array = bloom._bit_array
+    signature = hash(item).to_bytes(64, byteorder="big", signed=True)
+    for hasher in _LEGACY_POOL[: bloom._num_hashes]:
+        digest = hasher(signature).digest()
+        bucket = int.from_bytes(digest, byteorder="little") % len(bit_array)
+        if bit_array[bucket] == 0:
+            return False
+    return True
+
+
+def report(name: str, n: int, old: float, new: float) -> None:
+    print(
+        f"{name:<12} {n / old:>12,.0f} ops/s (legacy)  "
+        f"{n / new:>12,.0f} ops/s  x{old / new:5.1f}"
+    )
+
+
+def bench(n: int = 100_000, fp_rate: float = 0.01) -> None:
+    keys = [f"key-{i}" for i in range(n)]
+    misses = [f"miss-{i}" for i in range(n)]
+    print(f"n={n:,} fp_rate={fp_rate}")
+
+    old_filter = BloomFilter(n, fp_rate)
+    new_filter = BloomFilter(n, fp_rate)
+    old = timeit(lambda: [legacy_put(old_filter, k) for k in keys], number=1)
+    new = timeit(lambda: [new_filter.put(k) for k in keys], number=1)
+    report("put", n, old, new)
+
+    for name, items in (("hits", keys), ("misses", misses)):
+        old = timeit(
+            lambda: [legacy_may_contain(old_filter, k) for k in items], number=1
+        )
+        new = timeit(
+            lambda: [new_filter.may_contain(k) for k in items], number=1
+        )
+        report(f"query {name}", n, old, new)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,68 @@
+"""
+Compare BloomFilter, XorFilter and CuckooFilter at matching false positive
+rates: memory per key, build time, query throughput and measured fpp.
+
+Run from the repository root: python benchmarks/bench_filters.py
+"""
+
+
+import os
+import sys
+from timeit import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "src")]
+
+from src import BloomFilter  # noqa: E402
+from src import CuckooFilter  # noqa: E402
+from src import XorFilter  # noqa: E402
+
+
+def build_bloom(keys, fp_rate):
+    bloom = BloomFilter(len(keys), fp_rate)
+    bloom.put_many(keys)
+    return bloom
+
+
+def build_cuckoo(keys, bits):
+    cuckoo = CuckooFilter(len(keys), fingerprint_bits=bits)
+    for key in keys:
+        cuckoo.put(key)
+    return cuckoo
+
+
+def bench(n: int = 200_000) -> None:
+    keys = [f"key-{i}" for i in range(n)]
+    misses = [f"miss-{i}" for i in range(n)]
+    candidates = [
+        ("bloom p=1/256", lambda: build_bloom(keys, 1 / 256)),
+        ("xor8", lambda: XorFilter(keys, fingerprint_bits=8)),
+        ("cuckoo8", lambda: build_cuckoo(keys, 8)),
+        ("bloom p=3%", lambda: build_bloom(keys, 0.03)),
+        ("bloom p=1/65536", lambda: build_bloom(keys, 1 / 65536)),
+        ("xor16", lambda: XorFilter(keys, fingerprint_bits=16)),
+        ("cuckoo16", lambda: build_cuckoo(keys, 16)),
+        ("bloom p=0.012%", lambda: build_bloom(keys, 0.00012)),
+    ]
+
+    print(f"n={n:,}")
+    print(
+        f"{'':<16} {'bits/key':>8} {'build s':>8} "
+        f"{'hits/s':>10} {'misses/s':>10} {'fpp':>9}"
+    )
+    for name, build in candidates:
+        built = []
+        build_time = timeit(lambda: built.append(build()), number=1)
+        f = built[0]
+        bits = sys.getsizeof(f) * 8 / n
+        hits = timeit(lambda: [f.may_contain(k) for k in keys], number=1)
+        miss = timeit(lambda: [f.may_contain(k) for k in misses], number=1)
+        fpp = sum(f.may_contain(k) for k in misses) / n
+        print(
+            f"{name:<16} {bits:>8.2f} {build_time:>8.2f} "
+            f"{n / hits:>10,.0f} {n / miss:>10,.0f} {fpp:>9.5f}"
+        )
+
+
+if __name__ == "__main__":
+    bench()
@@ -1,6 +1,50 @@
-from src.bit_array import BitArray
-from src.bloom_filter import BloomFilter
-from src.unique_list import UniqueList
+from bit_array import BitArray
+from bit_array import BitArrayView
+from bit_array import MappedBitArray
+from blocked_bloom_filter import BlockedBloomFilter
+from bloom_cache import BloomCache
+from bloom_cache import CacheInfo
+from bloom_filter import BloomFilter
+from concurrent_bloom_filter import ConcurrentBloomFilter
+from counting_bloom_filter import CountingBloomFilter
+from cuckoo_filter import CuckooFilter
+from hashing import Blake2bHashStrategy
+from hashing import HashStrategy
+from hashing import Murmur3HashStrategy
+from hashing import canonical_bytes
+from indexed_unique_list import IndexedUniqueList
+from locked_bit_array import LockedBitArray
+from rank_select import RankSelect
+from roaring_bitmap import RoaringBitmap
+from scalable_bloom_filter import ScalableBloomFilter
+from shared_bit_array import SharedBitArray
+from unique_list import UniqueList
+from unique_list import UniqueListView
+from xor_filter import XorFilter
 
 
-__all__ = ["BitArray", "BloomFilter", "UniqueList"]
+__all__ = [
+    "BitArray",
+    "BitArrayView",
+    "MappedBitArray",
+    "BlockedBloomFilter",
+    "BloomCache",
+    "CacheInfo",
+    "BloomFilter",
+    "ConcurrentBloomFilter",
+    "CountingBloomFilter",
+    "CuckooFilter",
+    "Blake2bHashStrategy",
+    "HashStrategy",
+    "Murmur3HashStrategy",
+    "canonical_bytes",
+    "IndexedUniqueList",
+    "LockedBitArray",
+    "RankSelect",
+    "RoaringBitmap",
+    "ScalableBloomFilter",
+    "SharedBitArray",
+    "UniqueList",
+    "UniqueListView",
+    "XorFilter",
+]
@@ -9,9 +9,23 @@ and let i be the index an operation is performed on
 build(n)        |   -->     O(n)        |
 get_at(i)       |   -->     O(1)        |
 set_at(i)       |   -->     O(1)        |
-or(other)       |   -->     O(n)        |
+get_many(idx)   |   -->     O(len(idx)) |   Also set_many, test_all
+get_slice(i, j) |   -->     O(j - i)    |   Copies into a new BitArray
+setrange(i, j)  |   -->     O(j - i)    |   Whole bytes written at once
+view(i, j)      |   -->     O(1)        |   Shares memory, no copy
+or(other)       |   -->     O(n)        |   Also and, xor, and-not
+invert()        |   -->     O(n)        |
+count()         |   -->     O(n)        |   Population count
 ------------------------------------------------------------------------------
 
+Bulk operations (or, and, xor, and-not, invert, count, equality) work on
+1 MB chunks converted to Python ints, so the per-bit work happens in C
+rather than in a per-byte Python loop.
+
+BitArray.open(path, n, mode) maps a file instead of allocating memory, so a
+bitmap larger than RAM can be used and reopening it costs O(1): pages are
+only read from disk when they are touched.
+
 Overall, requires O(n) space. Practically, far less than a list for large n.
 Asymptotically approaches a 64x reduction in space
 
@@ -27,21 +41,426 @@ Numbers may vary slightly depending on the Python implementation, version, etc
 """
 
 
+import mmap
+import os
+import pickle
+import re
 import sys
 from array import array
+from operator import and_
+from operator import index
+from operator import or_
+from operator import xor
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Bulk operations work on chunks of this many bytes at a time, converting
+# each chunk to a single Python int. Big enough to amortize interpreter
+# overhead, small enough to keep temporary memory bounded.
+_CHUNK_BYTES = 1 << 20
+
+_ZEROS = bytes(_CHUNK_BYTES)
+
+_INVERT_TABLE = bytes(0xFF ^ i for i in range(256))
+
+# Searching for "any byte that is not 0x00" (or 0xFF) runs in C, so runs of
+# empty (or full) bytes are skipped without any Python-level work
+_NOT_EMPTY = re.compile(rb"[^\x00]")
+_NOT_FULL = re.compile(rb"[^\xff]")
+
+# Positions of the set bits of every possible byte, lowest first
+_BIT_POSITIONS = tuple(
+    tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)
+)
+
+# Bump whenever the layout produced by BitArray.__reduce_ex__ changes
+_PICKLE_VERSION = 1
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+
+    def _popcount(x: int) -> int:
+        return bin(x).count("1")
+
+
+def _andnot(a: int, b: int) -> int:
+    return a & ~b
+
+
+def _unpickle_bit_array(
+    version: int, size: int, data, growable: bool = False
+) -> "BitArray":
+    if version != _PICKLE_VERSION:
+        raise ValueError(f"unsupported BitArray pickle version {version}")
+    if not growable:
+        return BitArray.from_bytes(data, size)
+
+    bit_array = BitArray(0, growable=True)
+    if size:
+        bit_array.extend(BitArray.from_bytes(data, size))
+    return bit_array
+
+
+def _normalize_index(key, size: int) -> int:
+    i = index(key)
+    if i < 0:
+        i += size
+    if not 0 <= i < size:
+        raise IndexError("BitArray index out of range")
+    return i
+
+
+def _read_bits(buf, start: int, stop: int) -> int:
+    # Bits [start, stop) of buf as an int, bit `start` being the lowest
+    lo, hi = start >> 3, (stop + 7) >> 3
+    with memoryview(buf) as view:
+        word = int.from_bytes(view[lo:hi], "little")
+    return (word >> (start & 7)) & ((1 << (stop - start)) - 1)
+
+
+def _write_bits(buf, start: int, stop: int, bits: int) -> None:
+    # Inverse of _read_bits, leaving the bits around [start, stop) untouched
+    lo, hi = start >> 3, (stop + 7) >> 3
+    shift = start & 7
+    mask = ((1 << (stop - start)) - 1) << shift
+    with memoryview(buf) as view:
+        word = int.from_bytes(view[lo:hi], "little")
+        word = (word & ~mask) | (bits << shift)
+        view[lo:hi] = word.to_bytes(hi - lo, "little")
+
+
+def _fill_bits(buf, start: int, stop: int, value: int) -> None:
+    # Partial bytes at either end are masked in, whole bytes in the middle
+    # are overwritten directly
+    if start >= stop:
+        return
+
+    lo, hi = (start + 7) >> 3, stop >> 3
+    if lo >= hi:
+        _write_bits(buf, start, stop, -value & ((1 << (stop - start)) - 1))
+        return
+
+    if start < lo * 8:
+        _write_bits(buf, start, lo * 8, -value & ((1 << (lo * 8 - start)) - 1))
+    with memoryview(buf) as view:
+        view[lo:hi] = (b"\xff" if value else b"\x00") * (hi - lo)
+    if hi * 8 < stop:
+        _write_bits(buf, hi * 8, stop, -value & ((1 << (stop - hi * 8)) - 1))
 
 
 class BitArray:
-    def __init__(self, size: int):
+    # Only BitArrays created with growable=True can change size
+    _growable = False
+
+    def __init__(self, size: int, *, growable: bool = False):
+        """
+        Create a BitArray of `size` bits, all 0.
+
+        With growable=True the size may start at 0 and can change later
+        through append, extend, resize, or by setting a bit past the end.
+        """
         if not isinstance(size, int):
             raise TypeError("size must be an integer")
 
-        if size <= 0:
+        if size < 0 or not (size or growable):
             raise ValueError("size must be positive")
 
         self._size = size
-        # Each slot in self._arr holds 8 bits
+        # Each slot in self._arr holds 8 bits. In growable mode there may be
+        # spare (zeroed) slots after the last one in use.
         self._arr = array("B", bytearray((size + 7) // 8))
+        self._growable = growable
+
+    def append(self, bit: int) -> None:
+        """
+        Add a bit to the end of a growable BitArray. Amortized O(1).
+        """
+        i = self._size
+        self.resize(i + 1)
+        if bit:
+            self._arr[i >> 3] |= 1 << (i & 7)
+
+    def extend(self, bits: Iterable[int]) -> None:
+        """
+        Add bits (an iterable of 0s and 1s, or another BitArray) to the end
+        of a growable BitArray.
+        """
+        start = self._size
+        if isinstance(bits, (BitArray, BitArrayView)):
+            self.resize(start + len(bits))
+            if len(bits):
+                _write_bits(self._arr, start, self._size, bits._as_int())
+            return
+
+        bits = list(bits)
+        self.resize(start + len(bits))
+        self.set_many(i for i, bit in enumerate(bits, start) if bit)
+
+    def resize(self, size: int) -> None:
+        """
+        Change the size of a growable BitArray. New bits are 0.
+
+        Capacity grows geometrically, so repeated growth is amortized O(1)
+        per bit, and is extended in place rather than copied where the
+        allocator allows. Like array.array, raises BufferError while
+        views or memoryviews of the bits exist.
+        """
+        if not self._growable:
+            raise ValueError("BitArray was not created with growable=True")
+
+        if not isinstance(size, int):
+            raise TypeError("size must be an integer")
+
+        if size < 0:
+            raise ValueError("size must not be negative")
+
+        nbytes = (size + 7) // 8
+        if size < self._size:
+            # Keep every bit past the end zero, so growing again is clean
+            _fill_bits(self._arr, size, self._size, 0)
+            if nbytes < len(self._arr) // 4:
+                del self._arr[2 * nbytes :]
+        else:
+            self._reserve(nbytes)
+        self._size = size
+
+    def _reserve(self, nbytes: int) -> None:
+        arr = self._arr
+        capacity = len(arr)
+        if nbytes <= capacity:
+            return
+
+        missing = max(nbytes, capacity + (capacity >> 1) + 8) - capacity
+        # Append from a shared block of zeros instead of building a
+        # temporary buffer as large as the growth
+        while missing > 0:
+            arr.frombytes(memoryview(_ZEROS)[: min(missing, _CHUNK_BYTES)])
+            missing -= _CHUNK_BYTES
+
+    def _grow_for(self, i: int) -> int:
+        # Called when position i is out of range for a write
+        if not self._growable or i < self._size:
+            raise IndexError("BitArray index out of range")
+        self.resize(i + 1)
+        return self._size
+
+    @staticmethod
+    def _from_array(size: int, arr: array) -> "BitArray":
+        # Skips validation so that internal callers can build empty results
+        bit_array = BitArray.__new__(BitArray)
+        bit_array._size = size
+        bit_array._arr = arr
+        return bit_array
+
+    @classmethod
+    def open(
+        cls, path: str, size: int, mode: str = "r", *, offset: int = 0
+    ) -> "MappedBitArray":
+        """
+        Open a BitArray of `size` bits stored in the file at path.
+
+        The file is memory-mapped rather than read: pages are loaded lazily
+        by the OS and read-only mappings of the same file share one copy in
+        the page cache across processes. See MappedBitArray for the modes.
+        """
+        return MappedBitArray(path, size, mode, offset=offset)
+
+    @classmethod
+    def from_bytes(
+        cls, data, size: int = None, *, copy: bool = True
+    ) -> "BitArray":
+        """
+        Build a BitArray from a bytes-like object, as produced by to_bytes().
+
+        Bit i is bit (i % 8) of byte i // 8. `size` defaults to all the
+        bits in data; otherwise data must hold exactly (size + 7) // 8
+        bytes. With copy=False the BitArray uses data's memory directly:
+        writes go to data (and fail if data is read-only). Bits of the last
+        byte past `size` are then cleared in data, or must already be zero
+        if data is read-only, so that `memory` matches to_bytes().
+        """
+        with memoryview(data) as view:
+            nbytes = view.nbytes
+
+        if size is None:
+            size = nbytes * 8
+
+        if not isinstance(size, int):
+            raise TypeError("size must be an integer")
+
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        if nbytes != (size + 7) // 8:
+            raise ValueError(f"{size} bits need {(size + 7) // 8} bytes")
+
+        if not copy:
+            view = memoryview(data).cast("B")
+            bit_array = BitArray._from_array(size, view)
+            if view[-1] & ~bit_array._tail_mask():
+                if view.readonly:
+                    view.release()
+                    raise ValueError("bits past size must be zero")
+                bit_array._clear_padding()
+            return bit_array
+
+        arr = array("B")
+        arr.frombytes(data)
+        bit_array = BitArray._from_array(size, arr)
+        bit_array._clear_padding()
+        return bit_array
+
+    def to_bytes(self) -> bytes:
+        """
+        Return the bits packed 8 per byte, bit i in bit (i % 8) of byte
+        i // 8. Bits past the end of the last byte are zero.
+        """
+        data = bytearray(self.memory)
+        if data:
+            data[-1] &= self._tail_mask()
+        return bytes(data)
+
+    @property
+    def memory(self) -> memoryview:
+        """
+        A memoryview of the bytes holding the bits, without copying.
+        """
+        with memoryview(self._arr) as view:
+            return view[: self._nbytes()]
+
+    def copy(self) -> "BitArray":
+        """
+        Return an independent, in-memory copy of this BitArray.
+        """
+        arr = array("B")
+        with memoryview(self._arr) as view:
+            arr.frombytes(view[: self._nbytes()])
+        clone = BitArray._from_array(self._size, arr)
+        clone._growable = self._growable
+        return clone
+
+    def fill(self, value: int) -> None:
+        """
+        Set every bit to value (0 or 1).
+        """
+        self.setrange(0, self._size, value)
+
+    def setrange(self, start: int, stop: int, value: int = 1) -> None:
+        """
+        Set bits [start, stop) to value (0 or 1).
+
+        Equivalent to self[start:stop] = value. Whole bytes inside the range
+        are written directly, so the cost is proportional to the number of
+        bytes touched rather than the number of bits.
+        """
+        if value not in (0, 1):
+            raise ValueError("value must be 0 or 1")
+
+        start, stop, _ = slice(start, stop).indices(self._size)
+        _fill_bits(self._arr, start, stop, value)
+
+    def iter_ones(self, start: int = 0, stop: int = None) -> Iterator[int]:
+        """
+        Yield the positions of the set bits in [start, stop), in order.
+
+        Runs of zero bytes are skipped in C, so the cost is proportional to
+        the number of set bits rather than to the length of the range.
+        """
+        return self._iter_bits(1, start, stop)
+
+    def iter_zeros(self, start: int = 0, stop: int = None) -> Iterator[int]:
+        """
+        Yield the positions of the unset bits in [start, stop), in order.
+        """
+        return self._iter_bits(0, start, stop)
+
+    def find_first(
+        self, value: int = 1, start: int = 0, stop: int = None
+    ) -> int:
+        """
+        Return the lowest position in [start, stop) holding value, or -1.
+        """
+        return next(self._iter_bits(value, start, stop), -1)
+
+    def find_last(
+        self, value: int = 1, start: int = 0, stop: int = None
+    ) -> int:
+        """
+        Return the highest position in [start, stop) holding value, or -1.
+        """
+        start, stop, _ = slice(start, stop).indices(self._size)
+        skip = b"\x00" if value else b"\xff"
+        flip = 0 if value else 0xFF
+        lowest = start >> 3
+        hi = (stop + 7) >> 3
+        with self.memory as mem:
+            while hi > lowest:
+                lo = max(lowest, hi - _CHUNK_BYTES)
+                found = len(mem[lo:hi].tobytes().rstrip(skip))
+                if not found:
+                    hi = lo
+                    continue
+
+                # The byte may only match outside [start, stop), in which
+                # case the search carries on below it
+                hi = lo + found - 1
+                base = hi * 8
+                for bit in reversed(_BIT_POSITIONS[mem[hi] ^ flip]):
+                    if start <= base + bit < stop:
+                        return base + bit
+        return -1
+
+    def next_set_bit(self, i: int) -> int:
+        """
+        Return the position of the first set bit at or after i, or -1.
+        """
+        return self.find_first(1, i)
+
+    def _iter_bits(self, value: int, start: int, stop: int) -> Iterator[int]:
+        start, stop, _ = slice(start, stop).indices(self._size)
+        if start >= stop:
+            return
+
+        pattern = _NOT_EMPTY if value else _NOT_FULL
+        flip = 0 if value else 0xFF
+        positions = _BIT_POSITIONS
+        with self.memory as mem:
+            for match in pattern.finditer(mem, start >> 3, (stop + 7) >> 3):
+                byte_index = match.start()
+                base = byte_index * 8
+                if start <= base and base + 8 <= stop:
+                    for bit in positions[mem[byte_index] ^ flip]:
+                        yield base + bit
+                else:
+                    for bit in positions[mem[byte_index] ^ flip]:
+                        if start <= base + bit < stop:
+                            yield base + bit
+
+    def view(self, start: int = 0, stop: int = None) -> "BitArrayView":
+        """
+        Return a BitArrayView over bits [start, stop) sharing this
+        BitArray's memory.
+        """
+        start, stop, _ = slice(start, stop).indices(self._size)
+        return BitArrayView(self, start, max(start, stop))
+
+    def bitwise_and(self, other: "BitArray") -> None:
+        """
+        AND the bits of self with other, mutating self.
+
+        BitArrays must be of equal length.
+        """
+        self._check_compatible(other, "AND")
+        self._apply(other, and_)
 
     def bitwise_or(self, other: "BitArray") -> None:
         """
@@ -49,26 +468,532 @@ class BitArray:
 
         BitArrays must be of equal length.
         """
+        self._check_compatible(other, "OR")
+        self._apply(other, or_)
+
+    def bitwise_xor(self, other: "BitArray") -> None:
+        """
+        XOR the bits of self with other, mutating self.
+
+        BitArrays must be of equal length.
+        """
+        self._check_compatible(other, "XOR")
+        self._apply(other, xor)
+
+    def bitwise_andnot(self, other: "BitArray") -> None:
+        """
+        Clear every bit of self that is set in other, mutating self.
+
+        BitArrays must be of equal length.
+        """
+        self._check_compatible(other, "AND-NOT")
+        self._apply(other, _andnot)
+
+    def invert(self) -> None:
+        """
+        Flip every bit of self in place.
+        """
+        nbytes = self._nbytes()
+        with memoryview(self._arr) as view:
+            for start in range(0, nbytes, _CHUNK_BYTES):
+                stop = min(start + _CHUNK_BYTES, nbytes)
+                view[start:stop] = (
+                    view[start:stop].tobytes().translate(_INVERT_TABLE)
+                )
+        self._clear_padding()
+
+    def count(self, value: int = 1) -> int:
+        """
+        Return the number of bits equal to value (population count).
+        """
+        ones = sum(_popcount(word) for word in self._words())
+        return ones if value else self._size - ones
+
+    def any(self) -> bool:
+        """
+        Return True if at least one bit is set.
+        """
+        return any(self._words())
+
+    def all(self) -> bool:
+        """
+        Return True if every bit is set.
+        """
+        return self.count() == self._size
+
+    def set_many(self, indices: Iterable[int], value: int = 1) -> None:
+        """
+        Set the bit at every position in indices to value (0 or 1).
+
+        Accepts any iterable of non-negative ints, including buffers such as
+        array("Q"). NumPy integer arrays take a vectorized path when NumPy is
+        installed. Raises IndexError for a position outside the BitArray
+        (growable BitArrays grow instead); positions before it have already
+        been written.
+        """
+        if value not in (0, 1):
+            raise ValueError("value must be 0 or 1")
+
+        if np is not None and isinstance(indices, np.ndarray):
+            self._set_many_numpy(indices, value)
+            return
+
+        arr = self._arr
+        size = self._size
+        if value:
+            for i in indices:
+                if not 0 <= i < size:
+                    size = self._grow_for(i)
+                arr[i >> 3] |= 1 << (i & 7)
+        else:
+            for i in indices:
+                if not 0 <= i < size:
+                    size = self._grow_for(i)
+                arr[i >> 3] &= ~(1 << (i & 7))
+
+    def get_many(self, indices: Iterable[int]) -> List[int]:
+        """
+        Return the bits at every position in indices, in order.
+
+        NumPy integer arrays take a vectorized path when NumPy is installed
+        and produce a NumPy array of 0s and 1s instead of a list.
+        """
+        if np is not None and isinstance(indices, np.ndarray):
+            idx = self._numpy_indices(indices)
+            return (self._numpy_bytes()[idx >> 3] >> (idx & 7)) & 1
+
+        arr = self._arr
+        size = self._size
+        bits = []
+        append = bits.append
+        for i in indices:
+            if not 0 <= i < size:
+                raise IndexError("BitArray index out of range")
+            append((arr[i >> 3] >> (i & 7)) & 1)
+        return bits
+
+    def test_all(self, indices: Iterable[int]) -> bool:
+        """
+        Return True if the bit at every position in indices is set.
+
+        Stops at the first unset bit.
+        """
+        if np is not None and isinstance(indices, np.ndarray):
+            return bool(self.get_many(indices).all())
+
+        arr = self._arr
+        size = self._size
+        for i in indices:
+            if not 0 <= i < size:
+                raise IndexError("BitArray index out of range")
+            if not (arr[i >> 3] >> (i & 7)) & 1:
+                return False
+        return True
+
+    def _set_many_numpy(self, indices, value: int) -> None:
+        if self._growable and indices.size:
+            highest = int(indices.max())
+            if highest >= self._size:
+                self._grow_for(highest)
+        idx = self._numpy_indices(indices)
+        masks = np.left_shift(np.uint8(1), (idx & 7).astype(np.uint8))
+        # ufunc.at applies repeated byte positions unbuffered, so several
+        # bits landing in the same byte are all kept
+        if value:
+            np.bitwise_or.at(self._numpy_bytes(), idx >> 3, masks)
+        else:
+            np.bitwise_and.at(self._numpy_bytes(), idx >> 3, ~masks)
+
+    def _numpy_indices(self, indices):
+        if indices.dtype.kind not in "iu":
+            raise TypeError("indices must be an integer array")
+
+        idx = indices.astype(np.int64, copy=False).ravel()
+        if idx.size and (idx.min() < 0 or idx.max() >= self._size):
+            raise IndexError("BitArray index out of range")
+        return idx
+
+    def _numpy_bytes(self):
+        return np.frombuffer(self._arr, dtype=np.uint8, count=self._nbytes())
+
+    def _check_compatible(self, other, verb: str) -> None:
         if not isinstance(other, BitArray):
-            raise TypeError("Must OR with another BitArray")
+            raise TypeError(f"Must {verb} with another BitArray")
 
         if self._size != other._size:
             raise ValueError("BitArrays must be of the same size")
 
-        for i in range(len(self._arr)):
-            self._arr[i] |= other._arr[i]
+    def _apply(self, other: "BitArray", op: Callable[[int, int], int]) -> None:
+        # Combine whole chunks as big integers rather than byte by byte
+        nbytes = self._nbytes()
+        with memoryview(self._arr) as dst, memoryview(other._arr) as src:
+            for start in range(0, nbytes, _CHUNK_BYTES):
+                stop = min(start + _CHUNK_BYTES, nbytes)
+                a = int.from_bytes(dst[start:stop], "little")
+                b = int.from_bytes(src[start:stop], "little")
+                dst[start:stop] = op(a, b).to_bytes(stop - start, "little")
+        # other's padding may not be clean, see from_bytes
+        self._clear_padding()
+
+    def _words(self):
+        # Yield the contents as chunk-sized ints, with padding bits masked off
+        nbytes = self._nbytes()
+        if not nbytes:
+            return
+
+        last = nbytes - 1
+        with memoryview(self._arr) as view:
+            for start in range(0, last, _CHUNK_BYTES):
+                stop = min(start + _CHUNK_BYTES, last)
+                yield int.from_bytes(view[start:stop], "little")
+        yield self._arr[last] & self._tail_mask()
 
-    def __getitem__(self, __key: int) -> int:
-        return (self._arr[__key // 8] >> (__key % 8)) & 1
+    def _nbytes(self) -> int:
+        return (self._size + 7) // 8
+
+    def _tail_mask(self) -> int:
+        return 0xFF >> (-self._size % 8)
+
+    def _clear_padding(self) -> None:
+        if self._size:
+            self._arr[self._nbytes() - 1] &= self._tail_mask()
+
+    def _as_int(self) -> int:
+        return _read_bits(self._arr, 0, self._size)
+
+    def _get_slice(self, key: slice) -> "BitArray":
+        start, stop, step = key.indices(self._size)
+        positions = range(start, stop, step)
+        size = len(positions)
+        result = BitArray._from_array(size, array("B", bytes((size + 7) // 8)))
+        if size and step == 1:
+            bits = _read_bits(self._arr, start, stop)
+            _write_bits(result._arr, 0, size, bits)
+        elif size:
+            bits = self.get_many(positions)
+            result.set_many(j for j, bit in enumerate(bits) if bit)
+        return result
+
+    def _set_slice(self, key: slice, value) -> None:
+        start, stop, step = key.indices(self._size)
+        positions = range(start, stop, step)
+
+        if isinstance(value, int):
+            if value not in (0, 1):
+                raise ValueError("value must be 0 or 1")
+            if step == 1:
+                _fill_bits(self._arr, start, stop, value)
+            else:
+                self.set_many(positions, value)
+            return
+
+        if len(value) != len(positions):
+            raise ValueError(
+                f"cannot assign {len(value)} bits to a slice of "
+                f"{len(positions)} bits"
+            )
+
+        if step == 1 and isinstance(value, (BitArray, BitArrayView)):
+            if positions:
+                _write_bits(self._arr, start, stop, value._as_int())
+            return
+
+        bits = list(value)
+        self.set_many(i for i, bit in zip(positions, bits) if bit)
+        self.set_many((i for i, bit in zip(positions, bits) if not bit), 0)
+
+    def __getitem__(self, __key: Union[int, slice]) -> Union[int, "BitArray"]:
+        if isinstance(__key, slice):
+            return self._get_slice(__key)
+
+        i = _normalize_index(__key, self._size)
+        return (self._arr[i >> 3] >> (i & 7)) & 1
+
+    def __setitem__(self, __key: Union[int, slice], __value) -> None:
+        if isinstance(__key, slice):
+            self._set_slice(__key, __value)
+            return
+
+        try:
+            i = _normalize_index(__key, self._size)
+        except IndexError:
+            i = index(__key)
+            self._grow_for(i)
 
-    def __setitem__(self, __key: int, __value: int) -> None:
         if __value == 1:
-            self._arr[__key // 8] |= 1 << (__key % 8)
+            self._arr[i >> 3] |= 1 << (i & 7)
         elif __value == 0:
-            self._arr[__key // 8] &= ~(1 << (__key % 8))
+            self._arr[i >> 3] &= ~(1 << (i & 7))
+
+    def __and__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_and(other)
+        return result
+
+    def __or__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_or(other)
+        return result
+
+    def __xor__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_xor(other)
+        return result
+
+    def __sub__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_andnot(other)
+        return result
+
+    def __iand__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        self.bitwise_and(other)
+        return self
+
+    def __ior__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        self.bitwise_or(other)
+        return self
+
+    def __ixor__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        self.bitwise_xor(other)
+        return self
+
+    def __isub__(self, other: "BitArray") -> "BitArray":
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        self.bitwise_andnot(other)
+        return self
+
+    def __invert__(self) -> "BitArray":
+        result = self.copy()
+        result.invert()
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BitArray):
+            return NotImplemented
+        if self._size != other._size:
+            return False
+        return all(a == b for a, b in zip(self._words(), other._words()))
+
+    __hash__ = None
+
+    def __buffer__(self, __flags: int) -> memoryview:
+        # Buffer protocol for Python 3.12+ (PEP 688): lets socket.sendall,
+        # file.write, hashlib, etc. read the bits without a copy
+        return self.memory
+
+    def __reduce_ex__(self, __protocol: int):
+        # Ship the raw bytes. Protocol 5 can pass them out-of-band without
+        # a copy. File-backed BitArrays unpickle as in-memory BitArrays.
+        if __protocol >= 5:
+            data = pickle.PickleBuffer(self.memory)
+        else:
+            data = self.to_bytes()
+        args = (_PICKLE_VERSION, self._size, data)
+        if self._growable:
+            args += (True,)
+        return (_unpickle_bit_array, args)
 
     def __len__(self) -> int:
         return self._size
 
     def __sizeof__(self) -> int:
         return sys.getsizeof(self._arr) + sys.getsizeof(self._size)
+
+
+class MappedBitArray(BitArray):
+    """
+    A BitArray whose bits live in a file and are accessed through mmap.
+
+    Modes:
+    "r"  - read-only, the file must already exist
+    "r+" - read-write, the file must already exist
+    "w+" - read-write, the file is created (or truncated) and zero-filled
+
+    The bits occupy (size + 7) // 8 bytes starting `offset` bytes into the
+    file. Writes reach the file when flush() or close() is called, or when
+    the OS decides to write the pages back.
+    """
+
+    _FILE_MODES = {"r": "rb", "r+": "r+b", "w+": "w+b"}
+
+    def __init__(self, path: str, size: int, mode: str = "r", *, offset=0):
+        if not isinstance(size, int):
+            raise TypeError("size must be an integer")
+
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        if mode not in MappedBitArray._FILE_MODES:
+            raise ValueError("mode must be one of 'r', 'r+' or 'w+'")
+
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+
+        nbytes = (size + 7) // 8
+        with open(path, MappedBitArray._FILE_MODES[mode]) as f:
+            if mode == "w+":
+                # Extending with truncate leaves a sparse, zero-filled file
+                f.truncate(offset + nbytes)
+            elif os.fstat(f.fileno()).st_size < offset + nbytes:
+                raise ValueError("file is too small for a BitArray this size")
+
+            access = mmap.ACCESS_READ if mode == "r" else mmap.ACCESS_WRITE
+            self._mmap = mmap.mmap(f.fileno(), 0, access=access)
+
+        self._mode = mode
+        self._size = size
+        self._arr = memoryview(self._mmap)[offset : offset + nbytes]
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap.closed
+
+    def flush(self) -> None:
+        """
+        Write any modified pages back to the file.
+        """
+        if self._mode != "r":
+            self._mmap.flush()
+
+    def close(self) -> None:
+        """
+        Flush and unmap the file. Raises BufferError while views are alive.
+        """
+        if self.closed:
+            return
+
+        self.flush()
+        self._arr.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedBitArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __sizeof__(self) -> int:
+        # The bits themselves live in the page cache, not on the heap
+        return object.__sizeof__(self) + sys.getsizeof(self._size)
+
+
+class BitArrayView:
+    """
+    A window onto bits [start, stop) of a BitArray that shares its memory.
+
+    Writes through the view show up in the BitArray and vice versa. The
+    bytes spanned by the view are available as `memory`, a memoryview that
+    can be handed to other consumers without copying. While a view exists
+    the underlying buffer cannot be resized; call release() (or use the
+    view as a context manager) when done with it.
+    """
+
+    def __init__(self, bit_array: BitArray, start: int, stop: int):
+        self._size = stop - start
+        self._offset = start & 7
+        with memoryview(bit_array._arr) as view:
+            self.memory = view[start >> 3 : (stop + 7) >> 3]
+
+    def copy(self) -> BitArray:
+        """
+        Return the bits of this view as a new, independent BitArray.
+        """
+        return self[:]
+
+    def count(self, value: int = 1) -> int:
+        """
+        Return the number of bits in the view equal to value.
+        """
+        ones = _popcount(self._as_int())
+        return ones if value else self._size - ones
+
+    def any(self) -> bool:
+        return self._as_int() != 0
+
+    def all(self) -> bool:
+        return self.count() == self._size
+
+    def fill(self, value: int) -> None:
+        """
+        Set every bit in the view to value (0 or 1).
+        """
+        self[:] = value
+
+    def release(self) -> None:
+        """
+        Release the underlying memoryview. The view is unusable afterwards.
+        """
+        self.memory.release()
+
+    def _as_int(self) -> int:
+        return _read_bits(self.memory, self._offset, self._offset + self._size)
+
+    def __getitem__(self, __key: Union[int, slice]) -> Union[int, BitArray]:
+        if isinstance(__key, slice):
+            start, stop, step = __key.indices(self._size)
+            positions = range(start, stop, step)
+            size = len(positions)
+            arr = array("B", bytes((size + 7) // 8))
+            result = BitArray._from_array(size, arr)
+            if size and step == 1:
+                offset = self._offset
+                bits = _read_bits(self.memory, offset + start, offset + stop)
+                _write_bits(arr, 0, size, bits)
+            elif size:
+                result.set_many(j for j, i in enumerate(positions) if self[i])
+            return result
+
+        i = _normalize_index(__key, self._size) + self._offset
+        return (self.memory[i >> 3] >> (i & 7)) & 1
+
+    def __setitem__(self, __key: Union[int, slice], __value) -> None:
+        if isinstance(__key, slice):
+            start, stop, step = __key.indices(self._size)
+            if step == 1 and isinstance(__value, int):
+                if __value not in (0, 1):
+                    raise ValueError("value must be 0 or 1")
+                offset = self._offset
+                _fill_bits(self.memory, offset + start, offset + stop, __value)
+                return
+
+            positions = range(start, stop, step)
+            if isinstance(__value, int):
+                __value = [__value] * len(positions)
+            if len(__value) != len(positions):
+                raise ValueError(
+                    f"cannot assign {len(__value)} bits to a slice of "
+                    f"{len(positions)} bits"
+                )
+            for i, bit in zip(positions, list(__value)):
+                self[i] = bit
+            return
+
+        i = _normalize_index(__key, self._size) + self._offset
+        if __value == 1:
+            self.memory[i >> 3] |= 1 << (i & 7)
+        elif __value == 0:
+            self.memory[i >> 3] &= ~(1 << (i & 7))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __enter__(self) -> "BitArrayView":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -0,0 +1,217 @@
+"""
+A read-through cache in front of a slow key-value store, with a BloomFilter
+of the keys in the store to skip lookups of keys that do not exist.
+
+Let c be the number of cached values
+
+   Operation         |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+get(key)             |   -->     O(k)        |  + one store lookup on a miss
+get_many(keys)       |   -->     O(k * len)  |  + one batched store lookup
+put(key, value)      |   -->     O(k)        |
+invalidate(key)      |   -->     O(1)        |
+------------------------------------------------------------------------------
+
+A lookup goes through, in order:
+1. The cache of recently used values: at most maxsize of them, least
+   recently used evicted first, each expiring ttl seconds after it was
+   cached (if ttl is set). A hit.
+2. The BloomFilter: a key it has definitely not seen is not in the store,
+   the store is not asked. Filtered.
+3. The store. A miss; if the store does not have the key after all, the
+   BloomFilter gave a false positive.
+
+cache_info() reports how many lookups ended at each step, so the number of
+store round trips saved by the BloomFilter is `filtered`, and the price of
+its false positives is `false_positives`.
+
+The BloomFilter must hold every key of the store: put keys in it when the
+store gains them, e.g. through put(). Not thread-safe.
+"""
+
+
+import time
+from collections import OrderedDict
+from collections import namedtuple
+from collections.abc import Mapping
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from bloom_filter import BloomFilter
+
+
+CacheInfo = namedtuple(
+    "CacheInfo",
+    ["hits", "filtered", "misses", "false_positives", "maxsize", "currsize"],
+)
+
+_MISSING = object()
+
+
+class BloomCache:
+    """
+    Cache lookups into `store`, a mapping or a callable that returns the
+    value of a key or raises KeyError, guarded by `bloom`, a BloomFilter of
+    the store's keys.
+
+    fetch_many, if given, looks up several keys in one round trip: it takes
+    a list of keys and returns a mapping of those found to their values.
+    """
+
+    def __init__(
+        self,
+        store,
+        bloom: BloomFilter,
+        *,
+        maxsize: int = 1024,
+        ttl: float = None,
+        fetch_many: Callable[[list], Mapping] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        if isinstance(store, Mapping):
+            store = store.__getitem__
+        elif not callable(store):
+            raise TypeError("store must be a mapping or a callable")
+
+        if maxsize < 0:
+            raise ValueError("maxsize must not be negative")
+
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+        self._store = store
+        self._bloom = bloom
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._fetch_many = fetch_many
+        self._timer = timer
+        # key -> (value, time it expires at, or None)
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._filtered = 0
+        self._misses = 0
+        self._false_positives = 0
+
+    def _cached(self, key: Hashable):
+        entry = self._cache.get(key)
+        if entry is None:
+            return _MISSING
+
+        value, expires = entry
+        if expires is not None and self._timer() >= expires:
+            del self._cache[key]
+            return _MISSING
+
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def _remember(self, key: Hashable, value) -> None:
+        if not self._maxsize:
+            return
+        expires = None if self._ttl is None else self._timer() + self._ttl
+        self._cache[key] = (value, expires)
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def get(self, key: Hashable, default=None):
+        """
+        Return the value of key, or default if the store does not have it.
+        """
+        value = self._cached(key)
+        if value is not _MISSING:
+            return value
+
+        if not self._bloom.may_contain(key):
+            self._filtered += 1
+            return default
+
+        self._misses += 1
+        try:
+            value = self._store(key)
+        except KeyError:
+            self._false_positives += 1
+            return default
+
+        self._remember(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, object]:
+        """
+        Return a dict of the keys found, with their values. Keys that are
+        neither cached nor filtered out are looked up together, with one
+        call to fetch_many if it was given.
+        """
+        found = {}
+        unknown = []
+        for key in dict.fromkeys(keys):
+            value = self._cached(key)
+            if value is _MISSING:
+                unknown.append(key)
+            else:
+                found[key] = value
+
+        if isinstance(self._bloom, BloomFilter):
+            maybe = self._bloom.may_contain_many(unknown)
+        else:
+            maybe = [self._bloom.may_contain(key) for key in unknown]
+        fetch = [key for key, ok in zip(unknown, maybe) if ok]
+        self._filtered += len(unknown) - len(fetch)
+        self._misses += len(fetch)
+
+        if self._fetch_many is not None:
+            fetched = self._fetch_many(fetch) if fetch else {}
+        else:
+            fetched = {}
+            for key in fetch:
+                try:
+                    fetched[key] = self._store(key)
+                except KeyError:
+                    pass
+
+        for key in fetch:
+            if key in fetched:
+                found[key] = fetched[key]
+                self._remember(key, fetched[key])
+            else:
+                self._false_positives += 1
+        return found
+
+    def put(self, key: Hashable, value) -> None:
+        """
+        Record that the store now holds value for key: adds key to the
+        BloomFilter and caches the value. Does not write to the store.
+        """
+        self._bloom.put(key)
+        self._remember(key, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Forget the cached value of key, if any, e.g. after the store changed
+        it. The key stays in the BloomFilter.
+        """
+        self._cache.pop(key, None)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self._hits,
+            self._filtered,
+            self._misses,
+            self._false_positives,
+            self._maxsize,
+            len(self._cache),
+        )
+
+    def __getitem__(self, key: Hashable):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __len__(self) -> int:
+        """
+        The number of values currently cached.
+        """
+        return len(self._cache)
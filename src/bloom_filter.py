@@ -8,9 +8,16 @@ Let k be the number of hash functions
    Operation         |     Time complexity   |      Notes
 ------------------------------------------------------------------------------
 expected_fpp()       |   -->     O(1)        |  Probability of false positive*
+current_fpp()        |   -->     O(m)        |  From the fill ratio**
+approximate_count()  |   -->     O(m)        |  Distinct items put**
 is_compatible(other) |   -->     O(1)        |
 might_contain(item)  |   -->     O(k)        |  Potentially false positive
 put(item)            |   -->     O(k)        |
+put_many(items)      |   -->     O(k * len)  |  Also may_contain_many
+aput_stream(items)   |   -->     O(k * len)  |  Async; also afilter_new
+save(path)           |   -->     O(m)        |
+load(path)           |   -->     O(m)        |  O(1) with mmap=True
+build_parallel(...)  |   -->     O(k n / w)  |  w worker processes, + O(w m)
 ------------------------------------------------------------------------------
 
 Optimal number for m:
@@ -20,6 +27,11 @@ where p is the desired false positive probability
 Optimal number for k:
 k = round((m / n) * log(2))
 
+Hashing: each item is hashed once, with a seeded 128 bit hash of a canonical
+byte encoding of the item, and the k bucket indexes are derived from that
+one hash by double hashing. See hashing.py. Any k is supported, and the
+buckets of an item are the same in every process.
+
 ------------------------------------------------------------------------------
     * Notes on the probability of false positives:
 ------------------------------------------------------------------------------
@@ -37,69 +49,194 @@ k = round((m / n) * log(2))
     - Fraction of 1's = 1 - 0.607 = 0.393
     - P(false positive) = 0.393 ** 5 = 0.00937
 
+------------------------------------------------------------------------------
+    File format (save / load), little-endian:
+------------------------------------------------------------------------------
+- Header: magic b"PYBF", format version (u8), layout (u8), hash strategy
+  name (16 bytes, NUL padded), seed (u64), m (u64), k (u32), insertion
+  count (u64), expected insertions (u64), fp rate (f64), CRC-32 of the
+  payload (u32), then a CRC-32 of all the header fields above (u32)
+- Payload: the bit array as produced by BitArray.to_bytes(), (m + 7) // 8
+  bytes, starting right after the header
+
+------------------------------------------------------------------------------
+    ** Estimates from the fill ratio (bulk popcount of the bit array):
+------------------------------------------------------------------------------
+- With X of the m bits set, the probability of a false positive is about
+  (X / m) ** k, whatever the number of items actually put
+- Swamidass & Baldi (2007): n ~= -(m / k) * ln(1 - X / m)
+- Applied to the OR of two compatible filters, the same estimator gives the
+  size of the union; the intersection is then |A| + |B| - |A u B|
+
 Side note:
 TDD with probabilistic data structures... how does it work? Monte Carlo?
 """
 
 
-import hashlib
+import asyncio
+import multiprocessing
+import os
+import queue
+import struct
+import sys
+import zlib
+from concurrent.futures import Executor
+from functools import partial
+from itertools import islice
 from math import ceil
 from math import exp
+from math import inf
 from math import log
 from numbers import Number
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
 from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from bit_array import BitArray
+from bit_array import MappedBitArray
+from hashing import DEFAULT_HASH_STRATEGY
+from hashing import HashStrategy
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+_MAGIC = b"PYBF"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBB16sQQIQQdI")
+_HEADER_CRC = struct.Struct("<I")
+_HEADER_SIZE = _HEADER.size + _HEADER_CRC.size
+# Items hashed at once by put_many and may_contain_many: the k indexes of
+# each are held in memory, about 20 MB for k = 7
+_BATCH_SIZE = 65_536
+
+
+def _chunks(items: Iterable[Hashable], size: int) -> Iterator:
+    # Lists (or NumPy array slices) of up to size items
+    if np is not None and isinstance(items, np.ndarray):
+        items = items.ravel()
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+        return
+
+    items = iter(items)
+    for chunk in iter(lambda: list(islice(items, size)), []):
+        yield chunk
+
+
+def _check_params(
+    expected_insertions: int, fp_rate: float, hash_strategy: HashStrategy
+) -> None:
+    # The arguments of every filter sized from a capacity and an fp rate
+    if not isinstance(expected_insertions, int):
+        raise TypeError("expected_insertions must be an integer")
+
+    if expected_insertions <= 0:
+        raise ValueError("expected_insertions must be positive")
+
+    if not isinstance(fp_rate, Number):
+        raise TypeError("fp_rate must be numeric & between 0 and 1")
+
+    if isinstance(fp_rate, complex):
+        raise TypeError("fp_rate must not be complex")
+
+    if fp_rate <= 0 or fp_rate >= 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+
+    if not isinstance(hash_strategy, HashStrategy):
+        raise TypeError("hash_strategy must be a HashStrategy")
+
+
+def _optimal_size(n: int, p: float) -> int:
+    # m, see "Optimal number for m" above
+    return ceil(-n * log(p) / log(2) ** 2)
+
+
+def _optimal_num_hashes(n: int, m: int) -> int:
+    # k, see "Optimal number for k" above
+    return max(1, round((m / n) * log(2)))
+
+
+def _classic_fpp(n: int, m: int, k: int) -> float:
+    # See "Notes on the probability of false positives" above
+    expected_zero_density = exp(-(k * n) / m)
+    return (1 - expected_zero_density) ** k
+
+
+async def _batches(
+    items: AsyncIterable[Hashable], batch_size: int
+) -> AsyncIterator[List[Hashable]]:
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _build_worker(
+    cls, args: tuple, kwargs: dict, files, chunk_size, tasks, results
+):
+    # Puts every task from the queue into one partial filter, then sends
+    # the filter (or what went wrong) back. Files are read chunk_size lines
+    # at a time, so a large file never has to fit in memory
+    try:
+        bloom = cls(*args, **kwargs)
+        for task in iter(tasks.get, None):
+            if files:
+                with open(task, encoding="utf-8") as f:
+                    for lines in iter(lambda: list(islice(f, chunk_size)), []):
+                        bloom.put_many(line.rstrip("\r\n") for line in lines)
+            else:
+                bloom.put_many(task)
+    except BaseException as e:
+        # Keep draining, so that the parent never blocks on a full queue
+        for _ in iter(tasks.get, None):
+            pass
+        results.put(e)
+    else:
+        results.put(bloom)
 
 
 class BloomFilter:
-    _hash_fn_pool = [
-        hashlib.blake2s,
-        hashlib.blake2b,
-        hashlib.sha1,
-        hashlib.md5,
-        hashlib.sha256,
-        hashlib.sha224,
-        hashlib.sha512,
-        hashlib.sha384,
-        hashlib.sha3_384,
-        hashlib.sha3_512,
-        hashlib.sha3_224,
-        hashlib.sha3_256,
-    ]
-
-    def __init__(self, expected_insertions: int, fp_rate: float = 0.03):
-        if not isinstance(expected_insertions, int):
-            raise TypeError("expected_insertions must be an integer")
-
-        if expected_insertions <= 0:
-            raise ValueError("expected_insertions must be positive")
-
-        if not isinstance(fp_rate, Number):
-            raise TypeError("fp_rate must be numeric & between 0 and 1")
-
-        if isinstance(fp_rate, complex):
-            raise TypeError("fp_rate must not be complex")
-
-        if fp_rate <= 0 or fp_rate >= 1:
-            raise ValueError("fp_rate must be between 0 and 1")
-
+    # How the buckets of an item are spread over the bit array, saved in the
+    # file header: 0 is anywhere, see BlockedBloomFilter for 1
+    _layout = 0
+
+    def __init__(
+        self,
+        expected_insertions: int,
+        fp_rate: float = 0.03,
+        *,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ):
+        _check_params(expected_insertions, fp_rate, hash_strategy)
         self._expected_insertions = expected_insertions
         self._fp_rate = fp_rate
+        self._hash_strategy = hash_strategy
         self._bit_array: BitArray = self._make_bit_array()
-        self._hash_functions = self._pick_hash_functions()
+        self._num_hashes = self._pick_num_hashes()
+        self._insertions = 0
 
     def _make_bit_array(self):
-        n = self._expected_insertions
-        p = self._fp_rate
-        length = ceil(-n * log(p) / log(2) ** 2)
-        return BitArray(length)
+        return BitArray(_optimal_size(self._expected_insertions, self._fp_rate))
 
-    def _pick_hash_functions(self):
-        n = self._expected_insertions
-        m = len(self._bit_array)
-        k = round((m / n) * log(2))
-        # Pick first k hash functions
-        return [fn for fn in BloomFilter._hash_fn_pool[:k]]
+    def _pick_num_hashes(self) -> int:
+        return _optimal_num_hashes(
+            self._expected_insertions, len(self._bit_array)
+        )
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        return self._hash_strategy.indexes(
+            item, self._num_hashes, len(self._bit_array)
+        )
 
     def expected_fpp(self) -> float:
         """
@@ -109,11 +246,52 @@ class BloomFilter:
 
         Assumes `expected_insertions` distinct insertions have been made.
         """
-        k = len(self._hash_functions)
-        n = self._expected_insertions
+        return _classic_fpp(
+            self._expected_insertions, len(self._bit_array), self._num_hashes
+        )
+
+    def current_fpp(self) -> float:
+        """
+        Returns the probability that might_contain(item) will erroneously
+        return True, given the bits set so far.
+        """
+        fill_ratio = self._bit_array.count() / len(self._bit_array)
+        return fill_ratio**self._num_hashes
+
+    def approximate_count(self) -> float:
+        """
+        Returns an estimate of the number of distinct items put in the
+        BloomFilter, or inf if every bit is set.
+        """
+        return self._estimate_count(self._bit_array.count())
+
+    def estimate_union_size(self, other: "BloomFilter") -> float:
+        """
+        Returns an estimate of the number of distinct items put in this
+        BloomFilter or in a compatible other one.
+        """
+        if not self._is_compatible(other):
+            raise ValueError("Bloom filters are not compatible")
+        union = self._bit_array | other._bit_array
+        return self._estimate_count(union.count())
+
+    def estimate_intersection_size(self, other: "BloomFilter") -> float:
+        """
+        Returns an estimate of the number of distinct items put in both
+        this BloomFilter and a compatible other one, or inf if their union
+        sets every bit.
+        """
+        union = self.estimate_union_size(other)
+        if union == inf:
+            return inf
+        both = self.approximate_count() + other.approximate_count() - union
+        return max(both, 0.0)
+
+    def _estimate_count(self, ones: int) -> float:
         m = len(self._bit_array)
-        expected_zero_density = exp(-(k * n) / m)
-        return (1 - expected_zero_density) ** k
+        if ones == m:
+            return inf
+        return -m / self._num_hashes * log(1 - ones / m)
 
     def _is_compatible(self, other) -> bool:
         # For two BloomFilters to be compatible, they...
@@ -126,10 +304,18 @@ class BloomFilter:
             # Must not be the same instance
             return False
 
-        if len(self._hash_functions) != len(other._hash_functions):
+        if self._num_hashes != other._num_hashes:
             # Must have the same number of hash functions
             return False
 
+        if self._layout != other._layout:
+            # Must spread the buckets of an item the same way
+            return False
+
+        if self._hash_strategy != other._hash_strategy:
+            # Must hash items to the same buckets
+            return False
+
         if len(self._bit_array) != len(other._bit_array):
             # Must have the same bit array size
             return False
@@ -141,29 +327,141 @@ class BloomFilter:
         Returns True if the item might have been put in this BloomFilter,
         False if this is definitely not the case.
         """
-        signature = hash(item).to_bytes(64, byteorder='big', signed=True)
-
-        for hasher in self._hash_functions:
-            digest = hasher(signature).digest()
-            hash_int = int.from_bytes(digest, byteorder="little")
-            bucket = hash_int % len(self._bit_array)
-
-            if self._bit_array[bucket] == 0:
-                return False
-
-        return True
+        return self._bit_array.test_all(self._indexes(item))
 
     def put(self, item: Hashable) -> None:
         """
         Put an element into the BloomFilter.
         """
-        signature = hash(item).to_bytes(64, byteorder='big', signed=True)
+        self._bit_array.set_many(self._indexes(item))
+        self._insertions += 1
+
+    def put_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Put every element of items into the BloomFilter.
+
+        Items are hashed in batches of 65536, and the bucket indexes of
+        each batch are written to the bit array at once, so memory stays
+        bounded however many items there are. A NumPy integer array of keys
+        writes its buckets through NumPy (the keys themselves are hashed one
+        by one, so they land in the same buckets as with put()).
+        """
+        for chunk in _chunks(items, _BATCH_SIZE):
+            self._put_indexes(self._indexes_many(chunk))
+
+    def _put_indexes(self, indexes) -> None:
+        self._bit_array.set_many(indexes)
+        self._insertions += len(indexes) // self._num_hashes
 
-        for hasher in self._hash_functions:
-            digest = hasher(signature).digest()
-            hash_int = int.from_bytes(digest, byteorder="little")
-            bucket = hash_int % len(self._bit_array)
-            self._bit_array[bucket] = 1
+    def may_contain_many(self, items: Iterable[Hashable]) -> List[bool]:
+        """
+        Return may_contain(item) for every element of items, in order.
+        Items are hashed in batches, like in put_many.
+        """
+        found = []
+        for chunk in _chunks(items, _BATCH_SIZE):
+            found += self._contain_indexes(self._indexes_many(chunk))
+        return found
+
+    def _contain_indexes(self, indexes) -> List[bool]:
+        k = self._num_hashes
+        bits = self._bit_array.get_many(indexes)
+        if np is not None and isinstance(bits, np.ndarray):
+            return bits.reshape(-1, k).all(axis=1).tolist()
+        return [all(bits[i : i + k]) for i in range(0, len(bits), k)]
+
+    def _indexes_many(self, items: Iterable[Hashable]):
+        numpy_keys = np is not None and isinstance(items, np.ndarray)
+        if numpy_keys:
+            if items.dtype.kind not in "iu":
+                raise TypeError("NumPy keys must be an integer array")
+            items = items.ravel().tolist()
+
+        if type(self)._indexes is BloomFilter._indexes:
+            indexes = self._hash_strategy.indexes_many(
+                items, self._num_hashes, len(self._bit_array)
+            )
+        else:
+            # A subclass with its own layout, one item at a time
+            indexes = []
+            extend = indexes.extend
+            per_item = self._indexes
+            for item in items:
+                extend(per_item(item))
+        return np.array(indexes, dtype=np.int64) if numpy_keys else indexes
+
+    def _hasher(self) -> Callable[[List[Hashable]], List[int]]:
+        # _indexes_many as a function that pickles cheaply, without the
+        # bit array, for process pools. Subclasses with their own layout
+        # are sent whole
+        if type(self)._indexes is BloomFilter._indexes:
+            return partial(
+                self._hash_strategy.indexes_many,
+                k=self._num_hashes,
+                m=len(self._bit_array),
+            )
+        return self._indexes_many
+
+    async def aput_stream(
+        self,
+        items: AsyncIterable[Hashable],
+        *,
+        batch_size: int = 1024,
+        executor: Executor = None,
+    ) -> None:
+        """
+        Put every element of an async iterable into the BloomFilter, in
+        batches of batch_size (see put_many).
+
+        With an executor, thread or process pool, batches are hashed in it
+        rather than on the event loop; the bits are always read and written
+        by the event loop's thread. Only one batch is in flight at a time,
+        but other threads writing to this BloomFilter meanwhile need a
+        ConcurrentBloomFilter.
+        """
+        async for batch in _batches(items, batch_size):
+            self._put_indexes(await self._aindexes(batch, executor))
+
+    async def afilter_new(
+        self,
+        items: AsyncIterable[Hashable],
+        *,
+        batch_size: int = 1024,
+        executor: Executor = None,
+    ) -> AsyncIterator[Hashable]:
+        """
+        Yield the elements of an async iterable that are not yet in the
+        BloomFilter, putting them in as they go by. Duplicates within the
+        stream are yielded once.
+
+        Items are checked and put in batches of batch_size, so an item is
+        yielded only once its whole batch has arrived. A false positive
+        makes a new item look old and skips it. See aput_stream for
+        executor.
+        """
+        k = self._num_hashes
+        async for batch in _batches(items, batch_size):
+            indexes = await self._aindexes(batch, executor)
+            seen = self._contain_indexes(indexes)
+            # Position of the first occurrence of every new item, in order
+            new = {}
+            for j, (item, old) in enumerate(zip(batch, seen)):
+                if not old and item not in new:
+                    new[item] = j
+            self._put_indexes(
+                [i for j in new.values() for i in indexes[j * k : j * k + k]]
+            )
+            for item in new:
+                yield item
+
+    async def _aindexes(
+        self, batch: List[Hashable], executor: Executor
+    ) -> List[int]:
+        if executor is None:
+            return self._indexes_many(batch)
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self._hasher(), batch
+        )
 
     def put_all(self, other: "BloomFilter") -> None:
         """
@@ -172,11 +470,211 @@ class BloomFilter:
         """
         if self._is_compatible(other):
             self._bit_array.bitwise_or(other._bit_array)
+            self._insertions += other._insertions
         else:
             raise ValueError("Bloom filters are not compatible")
 
+    @classmethod
+    def build_parallel(
+        cls,
+        source: Iterable,
+        expected_insertions: int,
+        fp_rate: float = 0.03,
+        *,
+        workers: int = None,
+        files: bool = False,
+        chunk_size: int = 100_000,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ) -> "BloomFilter":
+        """
+        Build a BloomFilter from source using several worker processes.
+
+        source is an iterable of items, sent to the workers in chunks of
+        chunk_size, or with files=True an iterable of paths to text files
+        holding one item per line (read by the workers themselves, so
+        only the paths are sent, chunk_size lines at a time). Each of the `workers` processes
+        (default: one per CPU) fills its own filter built with the same
+        parameters, and the partial filters are OR-ed together at the end.
+        Items must be picklable, and every item is hashed by a worker, so
+        the result is the same as putting them all in one filter.
+        """
+        args = (expected_insertions, fp_rate)
+        kwargs = {"hash_strategy": hash_strategy}
+        # Fail here rather than in every worker
+        cls(*args, **kwargs)
+
+        workers = workers or os.cpu_count() or 1
+        # Bounded, so a huge source is not read faster than it is hashed
+        tasks = multiprocessing.Queue(2 * workers)
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_build_worker,
+                args=(cls, args, kwargs, files, chunk_size, tasks, results),
+                daemon=True,
+            )
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        def wait(operation, *args):
+            # Retry until done, but give up once a worker has died
+            while True:
+                try:
+                    return operation(*args, timeout=1)
+                except (queue.Empty, queue.Full):
+                    if any(process.exitcode for process in processes):
+                        raise RuntimeError("a build_parallel worker died")
+
+        try:
+            source = iter(source)
+            if files:
+                for path in source:
+                    wait(tasks.put, os.fspath(path))
+            else:
+                for chunk in iter(lambda: list(islice(source, chunk_size)), []):
+                    wait(tasks.put, chunk)
+            for _ in processes:
+                wait(tasks.put, None)
+            # Collect before joining: a worker exits only once its result
+            # has been read from the queue
+            partials = [wait(results.get) for _ in processes]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        for partial in partials:
+            if isinstance(partial, BaseException):
+                raise partial
+
+        bloom = partials[0]
+        for partial in partials[1:]:
+            bloom.put_all(partial)
+        return bloom
+
+    def save(self, path: str) -> None:
+        """
+        Write the BloomFilter to the file at path, see load().
+        """
+        name = self._hash_strategy.name
+        if name is None or len(name.encode("ascii")) > 16:
+            raise ValueError("hash strategy name must be set, 16 chars max")
+
+        payload = self._bit_array.to_bytes()
+        header = _HEADER.pack(
+            _MAGIC,
+            _FORMAT_VERSION,
+            self._layout,
+            name.encode("ascii"),
+            self._hash_strategy.seed,
+            len(self._bit_array),
+            self._num_hashes,
+            self._insertions,
+            self._expected_insertions,
+            self._fp_rate,
+            zlib.crc32(payload),
+        )
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(_HEADER_CRC.pack(zlib.crc32(header)))
+            f.write(payload)
+
+    @classmethod
+    def load(
+        cls, path: str, *, mmap: bool = False, verify: bool = None
+    ) -> "BloomFilter":
+        """
+        Read a BloomFilter written by save().
+
+        With mmap=True the bit array is memory-mapped read-only instead of
+        read: loading takes constant time, processes that load the same
+        file share one copy of it in the page cache, and put() fails. Call
+        close() (or use a with block) to unmap it.
+
+        verify checks the payload checksum, which reads the whole file. It
+        defaults to True, or False with mmap=True. The header is always
+        checked.
+        """
+        if verify is None:
+            verify = not mmap
+
+        with open(path, "rb") as f:
+            raw = f.read(_HEADER_SIZE)
+            if len(raw) < _HEADER_SIZE or raw[:4] != _MAGIC:
+                raise ValueError(f"{path} is not a saved BloomFilter")
+
+            header = raw[: _HEADER.size]
+            (crc,) = _HEADER_CRC.unpack(raw[_HEADER.size :])
+            if zlib.crc32(header) != crc:
+                raise ValueError("BloomFilter header is corrupt")
+
+            (
+                _,
+                version,
+                layout,
+                name,
+                seed,
+                m,
+                k,
+                insertions,
+                expected_insertions,
+                fp_rate,
+                payload_crc,
+            ) = _HEADER.unpack(header)
+            if version != _FORMAT_VERSION:
+                raise ValueError(f"unsupported BloomFilter format {version}")
+
+            if layout != cls._layout:
+                raise ValueError(f"{path} holds another kind of BloomFilter")
+
+            if mmap:
+                bits = BitArray.open(path, m, "r", offset=_HEADER_SIZE)
+            else:
+                bits = BitArray.from_bytes(f.read((m + 7) // 8), m)
+
+        if verify:
+            with bits.memory as payload:
+                ok = zlib.crc32(payload) == payload_crc
+            if not ok:
+                if mmap:
+                    bits.close()
+                raise ValueError("BloomFilter payload is corrupt")
+
+        bloom = cls.__new__(cls)
+        bloom._expected_insertions = expected_insertions
+        bloom._fp_rate = fp_rate
+        bloom._hash_strategy = HashStrategy.from_name(
+            name.rstrip(b"\0").decode("ascii"), seed
+        )
+        bloom._bit_array = bits
+        bloom._num_hashes = k
+        bloom._insertions = insertions
+        return bloom
+
+    def close(self) -> None:
+        """
+        Unmap the file of a BloomFilter loaded with mmap=True. Does
+        nothing for other BloomFilters.
+        """
+        if isinstance(self._bit_array, MappedBitArray):
+            self._bit_array.close()
+
+    def __enter__(self) -> "BloomFilter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def __contains__(self, item) -> bool:
         """
         Included for uniformity with other container types.
         """
         return self.may_contain(item)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._bit_array)
@@ -0,0 +1,59 @@
+"""
+A BloomFilter that several threads can put into and query at once.
+
+The bit array is a LockedBitArray (see locked_bit_array.py): put takes the
+lock of each 512 bit stripe its k buckets fall in, one at a time, so two
+threads only wait for each other when their items share a stripe. No bit
+is ever lost to a concurrent write.
+
+may_contain takes no lock at all. Bits only ever go from 0 to 1, so a query
+racing with put(item) either sees the item or not, and once put(item) has
+returned every later query sees it. put_all, and other bulk writes, lock
+every stripe.
+
+The insertion count kept for save() is not locked and may miss concurrent
+puts; approximate_count() does not depend on it.
+
+On interpreters with a GIL, hashing still runs one thread at a time; the
+locks make ingestion correct, free-threaded builds make it scale.
+"""
+
+
+from bit_array import BitArray
+from bloom_filter import BloomFilter
+from hashing import DEFAULT_HASH_STRATEGY
+from hashing import HashStrategy
+from locked_bit_array import DEFAULT_STRIPES
+from locked_bit_array import LockedBitArray
+
+
+class ConcurrentBloomFilter(BloomFilter):
+    def __init__(
+        self,
+        expected_insertions: int,
+        fp_rate: float = 0.03,
+        *,
+        stripes: int = DEFAULT_STRIPES,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ):
+        self._stripes = stripes
+        super().__init__(
+            expected_insertions, fp_rate, hash_strategy=hash_strategy
+        )
+
+    def _make_bit_array(self) -> BitArray:
+        length = len(super()._make_bit_array())
+        return LockedBitArray(length, stripes=self._stripes)
+
+    @classmethod
+    def load(
+        cls, path: str, *, mmap: bool = False, verify: bool = None
+    ) -> "ConcurrentBloomFilter":
+        bloom = super().load(path, mmap=mmap, verify=verify)
+        bloom._stripes = DEFAULT_STRIPES
+        # A memory-mapped filter is read-only and needs no locks
+        if not mmap:
+            bloom._bit_array = LockedBitArray._wrap(
+                bloom._bit_array, DEFAULT_STRIPES
+            )
+        return bloom
@@ -0,0 +1,192 @@
+"""
+Time constraints on key permitted operations:
+
+Let m be the number of counters
+Let n be the number of inserted elements (sometimes called expected insertions)
+Let k be the number of hash functions
+
+   Operation         |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+build(n, p)          |   -->     O(m)        |  Same m and k as BloomFilter
+might_contain(item)  |   -->     O(k)        |  Potentially false positive
+put(item)            |   -->     O(k)        |
+remove(item)         |   -->     O(k)        |  Only items that were put*
+count_estimate(item) |   -->     O(k)        |  Never an underestimate**
+put_all(other)       |   -->     O(m)        |  Adds the counters
+------------------------------------------------------------------------------
+
+A counting Bloom filter replaces each bit of a BloomFilter with a small
+counter: put increments the k counters of an item, remove decrements them
+and an item may be present while all its counters are non-zero.
+
+Counters are 4 bits, packed two per byte in an array("B"): counter i is
+the low nibble of byte i // 2 if i is even, the high nibble otherwise. That
+is 4 times the memory of the bits of a BloomFilter. With the optimal k, the
+chance of any counter reaching 16 stays negligible (about 1.37e-15 * m, Fan
+et al., 2000), but counters saturate at 15 rather than wrap: a saturated
+counter is never changed again, so it can not cause false negatives.
+
+    * Removing an item that was never put can turn other items into false
+      negatives. remove raises ValueError when the item is definitely
+      absent, but can not catch false positives
+    ** The smallest of the item's counters: the number of times it was put,
+       plus collisions with other items, capped at 15
+"""
+
+
+import sys
+from array import array
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from bloom_filter import _check_params
+from bloom_filter import _classic_fpp
+from bloom_filter import _optimal_num_hashes
+from bloom_filter import _optimal_size
+from hashing import DEFAULT_HASH_STRATEGY
+from hashing import HashStrategy
+
+
+_COUNTER_MAX = 15
+
+# _SATURATING_ADD[a << 8 | b] is bytes a and b added nibble by nibble, with
+# each nibble capped at 15. Built on first use, it is 64 KB.
+_SATURATING_ADD = None
+
+
+def _saturating_add_table() -> bytes:
+    global _SATURATING_ADD
+    if _SATURATING_ADD is None:
+        _SATURATING_ADD = bytes(
+            min((a & 15) + (b & 15), 15) | min((a >> 4) + (b >> 4), 15) << 4
+            for a in range(256)
+            for b in range(256)
+        )
+    return _SATURATING_ADD
+
+
+class CountingBloomFilter:
+    def __init__(
+        self,
+        expected_insertions: int,
+        fp_rate: float = 0.03,
+        *,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ):
+        # Sized like a BloomFilter, with a counter in place of each bit
+        _check_params(expected_insertions, fp_rate, hash_strategy)
+        self._expected_insertions = expected_insertions
+        self._fp_rate = fp_rate
+        self._hash_strategy = hash_strategy
+        self._size = _optimal_size(expected_insertions, fp_rate)
+        self._counters = array("B", bytes((self._size + 1) // 2))
+        self._num_hashes = _optimal_num_hashes(expected_insertions, self._size)
+        self._insertions = 0
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        return self._hash_strategy.indexes(item, self._num_hashes, self._size)
+
+    def _counts(self, indexes: Iterable[int]) -> List[int]:
+        counters = self._counters
+        return [counters[i >> 1] >> ((i & 1) << 2) & 15 for i in indexes]
+
+    def expected_fpp(self) -> float:
+        """
+        Returns the probability that might_contain(item) will erroneously
+        return True for an item that has not actually been put in the
+        CountingBloomFilter.
+
+        Assumes `expected_insertions` distinct insertions have been made.
+        """
+        return _classic_fpp(
+            self._expected_insertions, self._size, self._num_hashes
+        )
+
+    def _is_compatible(self, other) -> bool:
+        return (
+            isinstance(other, CountingBloomFilter)
+            and other is not self
+            and self._num_hashes == other._num_hashes
+            and self._hash_strategy == other._hash_strategy
+            and self._size == other._size
+        )
+
+    def may_contain(self, item: Hashable) -> bool:
+        """
+        Returns True if the item might have been put in this filter,
+        False if this is definitely not the case.
+        """
+        return all(self._counts(self._indexes(item)))
+
+    def count_estimate(self, item: Hashable) -> int:
+        """
+        Returns an upper bound on the number of times item was put (and not
+        removed), or 15 if that bound is 15 or more.
+        """
+        return min(self._counts(self._indexes(item)))
+
+    def put(self, item: Hashable) -> None:
+        """
+        Put an element into the CountingBloomFilter.
+        """
+        counters = self._counters
+        for i in self._indexes(item):
+            shift = (i & 1) << 2
+            byte = counters[i >> 1]
+            if (byte >> shift) & 15 != _COUNTER_MAX:
+                counters[i >> 1] = byte + (1 << shift)
+        self._insertions += 1
+
+    def put_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Put every element of items into the CountingBloomFilter.
+        """
+        put = self.put
+        for item in items:
+            put(item)
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Remove one occurrence of an element that was put before.
+
+        Raises ValueError if the item is definitely not in the filter.
+        """
+        indexes = self._indexes(item)
+        if not all(self._counts(indexes)):
+            raise ValueError("item is not in the CountingBloomFilter")
+
+        counters = self._counters
+        for i in indexes:
+            shift = (i & 1) << 2
+            byte = counters[i >> 1]
+            # Saturated counters have lost count, leave them be
+            if (byte >> shift) & 15 != _COUNTER_MAX:
+                counters[i >> 1] = byte - (1 << shift)
+        self._insertions -= 1
+
+    def put_all(self, other: "CountingBloomFilter") -> None:
+        """
+        Combines this CountingBloomFilter with another one by adding their
+        counters, so that items of either can be removed afterwards.
+        """
+        if not self._is_compatible(other):
+            raise ValueError("Bloom filters are not compatible")
+
+        table = _saturating_add_table()
+        self._counters = array(
+            "B",
+            bytes(
+                table[a << 8 | b]
+                for a, b in zip(self._counters, other._counters)
+            ),
+        )
+        self._insertions += other._insertions
+
+    def __contains__(self, item) -> bool:
+        """
+        Included for uniformity with other container types.
+        """
+        return self.may_contain(item)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._counters)
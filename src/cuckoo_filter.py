@@ -0,0 +1,212 @@
+"""
+Time constraints on key permitted operations:
+
+Let n be the capacity, b = 4 the number of slots per bucket
+Let f be the number of fingerprint bits (8 or 16)
+
+   Operation         |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+build(n)             |   -->     O(n)        |
+might_contain(item)  |   -->     O(b)        |  2 buckets, false positive*
+put(item)            |   -->     O(1)        |  Amortized, may relocate**
+remove(item)         |   -->     O(b)        |  Only items that were put
+------------------------------------------------------------------------------
+
+Cuckoo filters (Fan, Andersen, Kaminsky & Mitzenmacher, 2014):
+- Buckets of 4 slots, each slot holding an f bit fingerprint of an item (0
+  marks an empty slot), packed in one array("B") (f = 8) or array("H")
+  (f = 16). The number of buckets is a power of 2
+- An item can live in two buckets: i1 from its hash, and
+      i2 = i1 ^ hash(fingerprint)
+  so either bucket can be computed from the other and the fingerprint
+  alone, without the item: partial-key cuckoo hashing
+- A lookup reads the 2 buckets. Unlike a BloomFilter, items can be removed,
+  by clearing one copy of their fingerprint
+- Memory: f / 0.95 bits per item at the usual 95% load
+
+    * With probability about 2 * b / 2 ** f: 3.1% for f = 8, 0.012% for
+      f = 16
+    ** When both buckets are full, a random fingerprint is kicked out to
+       its other bucket, up to 500 times. If that is not enough the last
+       fingerprint kicked out is kept aside (the "victim"), and the next
+       put fails: the filter is full
+"""
+
+
+import random
+import sys
+from array import array
+from typing import Hashable
+from typing import Tuple
+from hashing import DEFAULT_HASH_STRATEGY
+from hashing import HashStrategy
+from hashing import _mix64
+
+
+BUCKET_SIZE = 4
+MAX_KICKS = 500
+
+_ARRAY_TYPES = {8: "B", 16: "H"}
+
+
+class CuckooFilter:
+    """
+    A filter for up to `capacity` items that supports removing them.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        *,
+        fingerprint_bits: int = 16,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ):
+        if not isinstance(capacity, int):
+            raise TypeError("capacity must be an integer")
+
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        if fingerprint_bits not in _ARRAY_TYPES:
+            raise ValueError("fingerprint_bits must be 8 or 16")
+
+        if not isinstance(hash_strategy, HashStrategy):
+            raise TypeError("hash_strategy must be a HashStrategy")
+
+        self._hash_strategy = hash_strategy
+        self._fingerprint_mask = (1 << fingerprint_bits) - 1
+        # A power of 2 above capacity / 4, unless that is over 95% full
+        num_buckets = 1 << max(0, (capacity - 1) // BUCKET_SIZE).bit_length()
+        if capacity / (num_buckets * BUCKET_SIZE) > 0.95:
+            num_buckets *= 2
+        self._bucket_mask = num_buckets - 1
+        zero = array(_ARRAY_TYPES[fingerprint_bits], [0])
+        self._slots = zero * (num_buckets * BUCKET_SIZE)
+        self._size = 0
+        # (bucket, fingerprint) that found no slot, see put
+        self._victim = None
+
+    def _locate(self, item: Hashable) -> Tuple[int, int, int]:
+        # Returns the item's fingerprint and its two buckets
+        h = self._hash_strategy.hash128(item)
+        fingerprint = (h >> 64) & self._fingerprint_mask or 1
+        i1 = h & self._bucket_mask
+        return fingerprint, i1, self._other_bucket(i1, fingerprint)
+
+    def _other_bucket(self, bucket: int, fingerprint: int) -> int:
+        return bucket ^ (_mix64(fingerprint) & self._bucket_mask)
+
+    def _insert(self, bucket: int, fingerprint: int) -> bool:
+        # Puts the fingerprint in a free slot of the bucket, if there is one
+        slots = self._slots
+        lo = bucket * BUCKET_SIZE
+        for i in range(lo, lo + BUCKET_SIZE):
+            if not slots[i]:
+                slots[i] = fingerprint
+                return True
+        return False
+
+    def _delete(self, bucket: int, fingerprint: int) -> bool:
+        # Clears one slot of the bucket holding the fingerprint, if any
+        slots = self._slots
+        lo = bucket * BUCKET_SIZE
+        for i in range(lo, lo + BUCKET_SIZE):
+            if slots[i] == fingerprint:
+                slots[i] = 0
+                return True
+        return False
+
+    def expected_fpp(self) -> float:
+        """
+        Returns the probability that might_contain(item) will erroneously
+        return True for an item that has not been put, once the filter is
+        at capacity.
+        """
+        return 2 * BUCKET_SIZE / (self._fingerprint_mask + 1)
+
+    def may_contain(self, item: Hashable) -> bool:
+        """
+        Returns True if the item might have been put in this filter,
+        False if this is definitely not the case.
+        """
+        fingerprint, i1, i2 = self._locate(item)
+        slots = self._slots
+        lo1, lo2 = i1 * BUCKET_SIZE, i2 * BUCKET_SIZE
+        if (
+            fingerprint in slots[lo1 : lo1 + BUCKET_SIZE]
+            or fingerprint in slots[lo2 : lo2 + BUCKET_SIZE]
+        ):
+            return True
+        return self._victim in ((i1, fingerprint), (i2, fingerprint))
+
+    def put(self, item: Hashable) -> bool:
+        """
+        Put an element into the CuckooFilter. Returns False, and changes
+        nothing, if the filter is full.
+        """
+        if self._victim is not None:
+            return False
+
+        fingerprint, i1, i2 = self._locate(item)
+        self._size += 1
+        if self._insert(i1, fingerprint) or self._insert(i2, fingerprint):
+            return True
+
+        slots = self._slots
+        bucket = random.choice((i1, i2))
+        for _ in range(MAX_KICKS):
+            # Swap with a random fingerprint of the bucket, and move that
+            # one to its other bucket
+            i = bucket * BUCKET_SIZE + random.randrange(BUCKET_SIZE)
+            fingerprint, slots[i] = slots[i], fingerprint
+            bucket = self._other_bucket(bucket, fingerprint)
+            if self._insert(bucket, fingerprint):
+                return True
+
+        # The item itself is in, but another fingerprint is now homeless
+        self._victim = (bucket, fingerprint)
+        return True
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Remove one occurrence of an element that was put before.
+
+        Raises ValueError if the item is definitely not in the filter.
+        Removing an item that was never put may remove another item.
+        """
+        fingerprint, i1, i2 = self._locate(item)
+        victim = self._victim
+        if victim in ((i1, fingerprint), (i2, fingerprint)):
+            self._victim = None
+        elif self._delete(i1, fingerprint) or self._delete(i2, fingerprint):
+            if victim is not None:
+                # A slot is free now, try to give it to the victim
+                self._victim = None
+                bucket, kept = victim
+                if not (
+                    self._insert(bucket, kept)
+                    or self._insert(self._other_bucket(bucket, kept), kept)
+                ):
+                    self._victim = victim
+        else:
+            raise ValueError("item is not in the CuckooFilter")
+        self._size -= 1
+
+    @property
+    def capacity(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, item) -> bool:
+        """
+        Included for uniformity with other container types.
+        """
+        return self.may_contain(item)
+
+    def __len__(self) -> int:
+        """
+        The number of items put and not removed.
+        """
+        return self._size
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._slots)
@@ -0,0 +1,213 @@
+"""
+Hash strategies for BloomFilter and friends.
+
+A strategy turns an item into one seeded 128 bit hash of the item's
+canonical bytes, then derives as many bucket indexes as needed from it
+with double hashing (Kirsch & Mitzenmacher):
+
+    index_i = (h1 + i * h2) mod m,   h1 / h2 = low / high 64 bits
+
+One hash per item regardless of k, and unlike hash(), the result is the same
+in every process and every run, so filters can be shared and persisted.
+
+Canonical bytes:
+- str, bytes-like, int, float, bool, None, and tuples / frozensets of these
+  are encoded with a type tag, so 1 and "1" hash differently. Other
+  numbers.Integral and numbers.Real types (e.g. NumPy scalars, Fraction)
+  are encoded as the int or float they are equal to
+- Values that compare equal hash equally, like with hash(): True, 1 and 1.0
+  all have the same encoding
+- Any other hashable object falls back to hash(item), which is only stable
+  within one process
+"""
+
+
+import hashlib
+import numbers
+import struct
+from abc import ABC
+from abc import abstractmethod
+from typing import Hashable
+from typing import Iterable
+from typing import List
+
+try:
+    import mmh3
+except ImportError:  # mmh3 is optional
+    mmh3 = None
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(h: int) -> int:
+    # MurmurHash3's 64 bit finalizer: every input bit affects every output
+    h = (h ^ (h >> 33)) * 0xFF51AFD7ED558CCD & _MASK64
+    h = (h ^ (h >> 33)) * 0xC4CEB9FE1A85EC53 & _MASK64
+    return h ^ (h >> 33)
+
+
+def canonical_bytes(item: Hashable) -> bytes:
+    """
+    Return a byte encoding of item that is the same in every process.
+    """
+    if isinstance(item, str):
+        return b"s" + item.encode("utf-8", "surrogatepass")
+
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return b"b" + bytes(item)
+
+    if isinstance(item, float) and item.is_integer():
+        item = int(item)
+
+    if isinstance(item, int):
+        length = (item.bit_length() + 8) // 8
+        return b"i" + item.to_bytes(length, "little", signed=True)
+
+    if isinstance(item, float):
+        return b"f" + struct.pack("<d", item)
+
+    if item is None:
+        return b"n"
+
+    if isinstance(item, tuple):
+        return b"t" + b"".join(_length_prefixed(x) for x in item)
+
+    if isinstance(item, frozenset):
+        return b"z" + b"".join(sorted(_length_prefixed(x) for x in item))
+
+    # After the builtins, as ABC checks are slower
+    if isinstance(item, numbers.Integral):
+        return canonical_bytes(int(item))
+
+    if isinstance(item, numbers.Real):
+        return canonical_bytes(float(item))
+
+    return b"h" + hash(item).to_bytes(8, "little", signed=True)
+
+
+def _length_prefixed(item: Hashable) -> bytes:
+    data = canonical_bytes(item)
+    return len(data).to_bytes(4, "little") + data
+
+
+class HashStrategy(ABC):
+    """
+    Base class for hash strategies.
+
+    Subclasses set `name` and implement hash128. Two strategies are
+    compatible (produce the same indexes) when their names and seeds match.
+    Named subclasses are registered, so that a strategy can be rebuilt from
+    its name and seed with from_name(), e.g. when loading a saved filter.
+    """
+
+    name = None
+    _registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.name is not None:
+            HashStrategy._registry[cls.name] = cls
+
+    def __init__(self, seed: int = 0):
+        if not isinstance(seed, int):
+            raise TypeError("seed must be an integer")
+
+        if seed < 0:
+            raise ValueError("seed must not be negative")
+
+        self.seed = seed
+
+    @staticmethod
+    def from_name(name: str, seed: int = 0) -> "HashStrategy":
+        """
+        Return the registered strategy called name, with the given seed.
+        """
+        if name not in HashStrategy._registry:
+            raise ValueError(f"unknown hash strategy {name!r}")
+        return HashStrategy._registry[name](seed)
+
+    @abstractmethod
+    def hash128(self, item: Hashable) -> int:
+        """
+        Return a 128 bit hash of item.
+        """
+
+    def indexes(self, item: Hashable, k: int, m: int) -> List[int]:
+        """
+        Return k bucket indexes in range(m) for item.
+        """
+        h = self.hash128(item)
+        # An odd step visits k distinct buckets whenever m is a power of 2
+        h1, h2 = (h & _MASK64) % m, ((h >> 64) | 1) % m or 1
+        # range() produces h1 + i * h2 in C, only the modulo is left
+        return [x % m for x in range(h1, h1 + k * h2, h2)]
+
+    def indexes_many(
+        self, items: Iterable[Hashable], k: int, m: int
+    ) -> List[int]:
+        """
+        Return the k bucket indexes of every item, concatenated in order.
+        """
+        hash128 = self.hash128
+        indexes = []
+        extend = indexes.extend
+        for item in items:
+            h = hash128(item)
+            h1, h2 = (h & _MASK64) % m, ((h >> 64) | 1) % m or 1
+            extend([x % m for x in range(h1, h1 + k * h2, h2)])
+        return indexes
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HashStrategy):
+            return NotImplemented
+        return self.name == other.name and self.seed == other.seed
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.seed))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(seed={self.seed})"
+
+
+class Blake2bHashStrategy(HashStrategy):
+    """
+    Keyed BLAKE2b with a 16 byte digest. Standard library only.
+    """
+
+    name = "blake2b"
+
+    def __init__(self, seed: int = 0):
+        super().__init__(seed)
+        if seed >= 1 << 64:
+            raise ValueError("seed must fit in 64 bits")
+        # Seed 0 is the empty key, i.e. plain unkeyed BLAKE2b
+        self._key = seed.to_bytes((seed.bit_length() + 7) // 8, "little")
+
+    def hash128(self, item: Hashable) -> int:
+        digest = hashlib.blake2b(
+            canonical_bytes(item), digest_size=16, key=self._key
+        ).digest()
+        return int.from_bytes(digest, "little")
+
+
+class Murmur3HashStrategy(HashStrategy):
+    """
+    MurmurHash3 x64 128 bit. Faster than BLAKE2b, but needs mmh3 installed.
+    """
+
+    name = "murmur3"
+
+    def __init__(self, seed: int = 0):
+        if mmh3 is None:
+            raise ImportError("Murmur3HashStrategy needs the mmh3 package")
+
+        super().__init__(seed)
+        if seed >= 1 << 32:
+            raise ValueError("seed must fit in 32 bits")
+
+    def hash128(self, item: Hashable) -> int:
+        return mmh3.hash128(canonical_bytes(item), self.seed)
+
+
+DEFAULT_HASH_STRATEGY = Blake2bHashStrategy()
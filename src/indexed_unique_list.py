@@ -0,0 +1,469 @@
+"""
+Time constraints on key permitted operations:
+
+Let n be the number of elements in the IndexedUniqueList
+Let i be the index, and L = 512 the target block length
+
+   Operation    |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+append(item)    |   -->     O(log n)    |   Amortized
+contains(item)  |   -->     O(1)        |   Underlying dict
+delete_at(i)    |   -->     O(log n + L)|   Amortized
+extend(k)       |   -->     O(k)        |   Amortized, k items
+get_at(i)       |   -->     O(log n)    |
+get_at(slice)   |   -->     O(log n + k)|   k = span of the slice, a copy
+index(item)     |   -->     O(log n + L)|
+insert(i, item) |   -->     O(log n + L)|   Amortized
+set_at(i)       |   -->     O(log n)    |
+remove(item)    |   -->     O(log n + L)|   Amortized
+remove_many(k)  |   -->     O(k L)      |   At most O(n), see below
+------------------------------------------------------------------------------
+
+The same interface as UniqueList, for long lists that are edited in the
+middle (work queues and the like), where UniqueList's O(n) insert, delete
+and remove add up. One difference: slicing returns a list, a copy, not a
+view (positions shift whenever a block is edited).
+
+Deleting or assigning a slice of k items, and remove_many, go item by item
+while k * L < n, and rebuild every block at once, in O(n), beyond that.
+
+Layout:
+- The items are split in blocks, plain lists of L / 2 to 2 L items (in C,
+  shifting a few hundred pointers costs less than a Python-level step)
+- A dict maps every item to its block, and each block knows its position
+- A Fenwick tree over the block lengths turns a block position into the
+  index of its first item and back, in O(log n)
+- Blocks are split when they reach 2 L items and merged with a neighbour
+  below L / 2. Both renumber the blocks and rebuild the tree, O(n / L),
+  which is amortized over the O(L) operations between two of them
+"""
+
+
+from collections.abc import MutableSequence
+from itertools import chain
+from operator import index as as_index
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import SupportsIndex
+from typing import Tuple
+from typing import Union
+
+
+_LOAD = 512
+
+
+class _Block:
+    __slots__ = ("items", "pos")
+
+    def __init__(self, items: list, pos: int):
+        self.items = items
+        self.pos = pos
+
+
+class IndexedUniqueList(MutableSequence):
+    """
+    A UniqueList with O(log n) index, remove, and insertion or deletion
+    anywhere.
+    """
+
+    def __init__(self, iterable: Iterable = None):
+        self._blocks: List[_Block] = []
+        self._where = {}
+        self._tree = [0]
+        self._len = 0
+
+        if iterable:
+            self.extend(iterable)
+
+    def _rebuild(self) -> None:
+        # Renumber the blocks and rebuild the Fenwick tree, in O(n / L)
+        tree = [0] * (len(self._blocks) + 1)
+        for pos, block in enumerate(self._blocks):
+            block.pos = pos
+            tree[pos + 1] += len(block.items)
+            parent = (pos + 1) + ((pos + 1) & -(pos + 1))
+            if parent < len(tree):
+                tree[parent] += tree[pos + 1]
+        self._tree = tree
+
+    def _add(self, pos: int, delta: int) -> None:
+        tree = self._tree
+        pos += 1
+        while pos < len(tree):
+            tree[pos] += delta
+            pos += pos & -pos
+        self._len += delta
+
+    def _offset(self, pos: int) -> int:
+        # Index of the first item of the block at pos
+        tree = self._tree
+        total = 0
+        while pos:
+            total += tree[pos]
+            pos &= pos - 1
+        return total
+
+    def _locate(self, i: int) -> Tuple[_Block, int]:
+        # Block holding index i (0 <= i < len), and i's offset in it
+        tree = self._tree
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= i:
+                pos = nxt
+                i -= tree[nxt]
+            step >>= 1
+        return self._blocks[pos], i
+
+    def _span(self, lo: int, hi: int) -> list:
+        # The items at indexes lo to hi - 1 (0 <= lo <= hi <= len)
+        if lo >= hi:
+            return []
+        block, offset = self._locate(lo)
+        span = block.items[offset : offset + hi - lo]
+        pos = block.pos
+        while len(span) < hi - lo:
+            pos += 1
+            span += self._blocks[pos].items[: hi - lo - len(span)]
+        return span
+
+    def _reset(self, items: list) -> None:
+        # Cut (unique) items into fresh blocks, in O(n)
+        self._blocks = [
+            _Block(items[i : i + _LOAD], 0) for i in range(0, len(items), _LOAD)
+        ]
+        self._where = {
+            item: block for block in self._blocks for item in block.items
+        }
+        self._len = len(items)
+        self._rebuild()
+
+    def _normalize(self, i: SupportsIndex) -> int:
+        i = as_index(i)
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("IndexedUniqueList index out of range")
+        return i
+
+    def _grown(self, block: _Block) -> None:
+        # Split a block that has become too long
+        if len(block.items) < 2 * _LOAD:
+            return
+        half = block.items[_LOAD:]
+        del block.items[_LOAD:]
+        new = _Block(half, block.pos + 1)
+        where = self._where
+        for item in half:
+            where[item] = new
+        self._blocks.insert(block.pos + 1, new)
+        self._rebuild()
+
+    def _shrunk(self, block: _Block) -> None:
+        # Merge a block that has become too short into a neighbour
+        if len(block.items) >= _LOAD // 2 or len(self._blocks) == 1:
+            if not block.items:
+                self._blocks.clear()
+                self._rebuild()
+            return
+
+        pos = block.pos
+        if pos + 1 < len(self._blocks):
+            first, second = block, self._blocks[pos + 1]
+        else:
+            first, second = self._blocks[pos - 1], block
+        where = self._where
+        for item in second.items:
+            where[item] = first
+        first.items.extend(second.items)
+        del self._blocks[second.pos]
+        self._rebuild()
+        self._grown(first)
+
+    def append(self, item: Hashable, *, strict: bool = False) -> None:
+        """
+        Add item to the end of IndexedUniqueList.
+
+        If `strict` is enabled, will throw a ValueError
+        when duplicate entries are added. Does nothing otherwise.
+        """
+        if item in self._where:
+            if strict:
+                raise ValueError("Cannot insert duplicate entry")
+            return
+
+        if not self._blocks:
+            self._blocks.append(_Block([], 0))
+            self._rebuild()
+        block = self._blocks[-1]
+        block.items.append(item)
+        self._where[item] = block
+        self._add(block.pos, 1)
+        self._grown(block)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._where.clear()
+        self._tree = [0]
+        self._len = 0
+
+    def extend(self, iterable: Iterable, *, strict: bool = False) -> None:
+        """
+        Extend IndexedUniqueList by appending elements from the iterable.
+
+        If `strict` is enabled, will throw a ValueError, and add nothing,
+        if any of the elements is a duplicate. Skips duplicates otherwise.
+        """
+        where = self._where
+        if strict:
+            items = list(iterable)
+            new = list(dict.fromkeys(items))
+            if len(new) != len(items) or not where.keys().isdisjoint(new):
+                raise ValueError("Cannot insert duplicate entry")
+        else:
+            new = [
+                item for item in dict.fromkeys(iterable) if item not in where
+            ]
+
+        if len(new) < _LOAD:
+            for item in new:
+                self.append(item)
+            return
+
+        # Whole new blocks after the last one
+        for i in range(0, len(new), _LOAD):
+            block = _Block(new[i : i + _LOAD], 0)
+            self._blocks.append(block)
+            for item in block.items:
+                where[item] = block
+        self._len += len(new)
+        self._rebuild()
+
+    def index(
+        self,
+        item: Hashable,
+        start: SupportsIndex = 0,
+        stop: SupportsIndex = None,
+    ) -> int:
+        """
+        Return the index of item.
+
+        Raises ValueError if item is not present, or not in [start, stop).
+        """
+        block = self._where.get(item)
+        if block is None:
+            raise ValueError(f"{item!r} is not in IndexedUniqueList")
+
+        i = self._offset(block.pos) + block.items.index(item)
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if not start <= i < stop:
+            raise ValueError(f"{item!r} is not in IndexedUniqueList")
+        return i
+
+    def copy(self) -> "IndexedUniqueList":
+        """
+        Return a shallow copy of IndexedUniqueList.
+        """
+        unique = type(self)()
+        unique._reset(list(self))
+        return unique
+
+    def count(self, item: Hashable) -> int:
+        return int(item in self._where)
+
+    def insert(
+        self, __index: SupportsIndex, item: Hashable, *, strict: bool = False
+    ) -> None:
+        """
+        Insert item before index.
+
+        If `strict` is enabled, will throw a ValueError
+        when duplicate entries are added. Does nothing otherwise.
+        """
+        if item in self._where:
+            if strict:
+                raise ValueError("Cannot insert duplicate entry")
+            return
+
+        # Clamp like list.insert
+        i = as_index(__index)
+        if i < 0:
+            i = max(i + self._len, 0)
+        if i >= self._len:
+            self.append(item)
+            return
+
+        block, offset = self._locate(i)
+        block.items.insert(offset, item)
+        self._where[item] = block
+        self._add(block.pos, 1)
+        self._grown(block)
+
+    def pop(self, __index: SupportsIndex = -1) -> Any:
+        """
+        Remove and return item at index (default last).
+
+        Raises IndexError if IndexedUniqueList is empty or index is out of
+        range.
+        """
+        if not self._len:
+            raise IndexError("pop from empty IndexedUniqueList")
+
+        block, offset = self._locate(self._normalize(__index))
+        item = block.items.pop(offset)
+        del self._where[item]
+        self._add(block.pos, -1)
+        self._shrunk(block)
+        return item
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Remove specified item from IndexedUniqueList.
+
+        Raises ValueError if item is not present.
+        """
+        block = self._where.pop(item, None)
+        if block is None:
+            raise ValueError(f"{item!r} is not in IndexedUniqueList")
+
+        block.items.remove(item)
+        self._add(block.pos, -1)
+        self._shrunk(block)
+
+    def remove_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Remove all specified items from IndexedUniqueList.
+
+        Raises ValueError, and removes nothing, if any item is not present.
+        """
+        doomed = set(items)
+        missing = doomed - self._where.keys()
+        if missing:
+            missing = next(iter(missing))
+            raise ValueError(f"{missing!r} is not in IndexedUniqueList")
+
+        if len(doomed) * _LOAD < self._len:
+            for item in doomed:
+                self.remove(item)
+        else:
+            self._reset([item for item in self if item not in doomed])
+
+    def reverse(self) -> None:
+        self._blocks.reverse()
+        for block in self._blocks:
+            block.items.reverse()
+        self._rebuild()
+
+    def __bool__(self) -> bool:
+        return bool(self._len)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._where
+
+    def __delitem__(self, __key: Union[SupportsIndex, slice]) -> None:
+        """
+        Delete self[key].
+        """
+        if not isinstance(__key, slice):
+            self.pop(__key)
+            return
+
+        positions = range(self._len)[__key]
+        if len(positions) * _LOAD < self._len:
+            for i in sorted(positions, reverse=True):
+                self.pop(i)
+        else:
+            items = list(self)
+            del items[__key]
+            self._reset(items)
+
+    def __getitem__(self, __index: Union[SupportsIndex, slice]):
+        """
+        x.__getitem__(y) <==> x[y]
+
+        A slice is returned as a list.
+        """
+        if isinstance(__index, slice):
+            r = range(self._len)[__index]
+            if not r:
+                return []
+            if r.step > 0:
+                return self._span(r[0], r[-1] + 1)[:: r.step]
+            return self._span(r[-1], r[0] + 1)[:: r.step]
+
+        block, offset = self._locate(self._normalize(__index))
+        return block.items[offset]
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(block.items for block in self._blocks)
+
+    def __reversed__(self) -> Iterator:
+        return chain.from_iterable(
+            reversed(block.items) for block in reversed(self._blocks)
+        )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"IndexedUniqueList({list(self)})"
+
+    def __setitem__(
+        self, __index: Union[SupportsIndex, slice], item: Hashable
+    ) -> None:
+        """
+        Set self[index] to item, or self[slice] to the items of an iterable.
+
+        Throws ValueError if this would make an entry appear twice.
+        """
+        if isinstance(__index, slice):
+            self._setslice(__index, item)
+            return
+
+        if item in self._where:
+            raise ValueError("Cannot insert duplicate entry")
+
+        block, offset = self._locate(self._normalize(__index))
+        del self._where[block.items[offset]]
+        block.items[offset] = item
+        self._where[item] = block
+
+    def _setslice(self, __slice: slice, iterable: Iterable) -> None:
+        items = list(iterable)
+        positions = range(self._len)[__slice]
+        if positions.step != 1 and len(items) != len(positions):
+            raise ValueError(
+                f"attempt to assign sequence of size {len(items)} "
+                f"to extended slice of size {len(positions)}"
+            )
+
+        where = self._where
+        old = set(self[__slice])
+        new = dict.fromkeys(items)
+        if len(new) != len(items) or any(
+            item in where and item not in old for item in new
+        ):
+            raise ValueError("Cannot insert duplicate entry")
+
+        if len(items) == len(positions):
+            # Same positions, new items
+            for item in old:
+                del where[item]
+            for i, item in zip(positions, items):
+                block, offset = self._locate(i)
+                block.items[offset] = item
+                where[item] = block
+        elif (len(positions) + len(items)) * _LOAD < self._len:
+            start = positions.start
+            for _ in positions:
+                self.pop(start)
+            for j, item in enumerate(items):
+                self.insert(start + j, item)
+        else:
+            everything = list(self)
+            everything[__slice] = items
+            self._reset(everything)
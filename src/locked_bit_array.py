@@ -0,0 +1,125 @@
+"""
+A BitArray that threads can write to concurrently without losing bits.
+
+Setting a bit is a read-modify-write of the whole byte holding it, so two
+threads setting different bits of the same byte at the same moment can lose
+one of them. With the GIL this needs an unlucky switch between the read and
+the write; on free-threaded builds it happens readily.
+
+Concurrency model:
+- Reads never lock. A reader sees each byte either before or after a
+  concurrent write to it, never a torn value.
+- Writes lock one of `stripes` locks, picked by the 512 bit block (one 64
+  byte cache line) the bit falls in, so writers only contend when they
+  touch the same stripe. set_many groups its indices by stripe and takes
+  each lock once. Bulk operations (bitwise_or, setrange, ...) take every
+  stripe lock.
+
+Because bits are only ever OR-ed in by set-only workloads, lock-free reads
+are safe to mix with locked writes: a bit that has been seen as set stays
+set.
+"""
+
+
+import threading
+from contextlib import contextmanager
+from typing import Iterable
+from bit_array import BitArray
+from bit_array import _normalize_index
+from bit_array import _unpickle_bit_array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+DEFAULT_STRIPES = 64
+
+# Bits per stripe block: 512 bits = one 64 byte cache line
+_STRIPE_SHIFT = 9
+
+
+def _unpickle_locked_bit_array(stripes: int, *args) -> "LockedBitArray":
+    return LockedBitArray._wrap(_unpickle_bit_array(*args), stripes)
+
+
+class LockedBitArray(BitArray):
+    """
+    A BitArray whose writes are guarded by striped threading locks.
+    """
+
+    def __init__(self, size: int, *, stripes: int = DEFAULT_STRIPES):
+        if stripes < 0:
+            raise ValueError("stripes must not be negative")
+
+        super().__init__(size)
+        # Reentrant, as some bulk operations are built on others
+        self._locks = tuple(threading.RLock() for _ in range(stripes))
+
+    @classmethod
+    def _wrap(cls, bit_array: BitArray, stripes: int) -> "LockedBitArray":
+        # A LockedBitArray sharing the memory of bit_array
+        locked = cls.__new__(cls)
+        locked._size = bit_array._size
+        locked._arr = bit_array._arr
+        locked._locks = tuple(threading.RLock() for _ in range(stripes))
+        return locked
+
+    def set_many(self, indices: Iterable[int], value: int = 1) -> None:
+        locks = self._locks
+        if not locks:
+            super().set_many(indices, value)
+            return
+
+        if np is not None and isinstance(indices, np.ndarray):
+            indices = indices.tolist()
+
+        groups = {}
+        for i in indices:
+            stripe = (i >> _STRIPE_SHIFT) % len(locks)
+            groups.setdefault(stripe, []).append(i)
+
+        for stripe, group in groups.items():
+            with locks[stripe]:
+                super().set_many(group, value)
+
+    def setrange(self, start: int, stop: int, value: int = 1) -> None:
+        with self._all_locked():
+            super().setrange(start, stop, value)
+
+    def invert(self) -> None:
+        with self._all_locked():
+            super().invert()
+
+    def _apply(self, other: BitArray, op) -> None:
+        with self._all_locked():
+            super()._apply(other, op)
+
+    @contextmanager
+    def _all_locked(self):
+        # Always in stripe order, so two bulk writers cannot deadlock
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def __setitem__(self, __key, __value) -> None:
+        locks = self._locks
+        if not locks:
+            super().__setitem__(__key, __value)
+        elif isinstance(__key, slice):
+            with self._all_locked():
+                super().__setitem__(__key, __value)
+        else:
+            i = _normalize_index(__key, self._size)
+            with locks[(i >> _STRIPE_SHIFT) % len(locks)]:
+                super().__setitem__(i, __value)
+
+    def __reduce_ex__(self, __protocol: int):
+        # Locks cannot be pickled, the copy gets fresh ones
+        _, args = super().__reduce_ex__(__protocol)
+        return (_unpickle_locked_bit_array, (len(self._locks),) + args)
@@ -0,0 +1,181 @@
+"""
+Time constraints on key permitted operations:
+
+Let n be the size of the BitArray
+Let i be a position, j the number of a set bit (0 = first)
+
+   Operation    |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+build(n)        |   -->     O(n)        |   Lazy, on first query
+rank(i)         |   -->     O(1)        |   Set bits in [0, i)
+select(j)       |   -->     O(log n)    |   Position of j-th set bit*
+set_at(i)       |   -->     O(1)        |   Marks the directory dirty
+------------------------------------------------------------------------------
+
+Layout of the directory:
+- Superblocks of 2^16 bits store the number of set bits before them (64 bit)
+- Blocks of 512 bits store the number of set bits before them, counted from
+  the start of their superblock (16 bit)
+- rank(i) = superblock count + block count + popcount within the block
+- Extra space: ~0.4% of the BitArray
+
+After a write through RankSelect, only the blocks from the first dirty one
+onwards are recounted, the next time rank or select is called. Writes made
+directly to the underlying BitArray must be followed by invalidate(i).
+A growable BitArray may change length: the directory follows.
+
+    * select does two binary searches (over superblocks, then over the at
+      most 128 blocks of one superblock) and a scan of one 64 byte block
+"""
+
+
+from array import array
+from bisect import bisect_right
+from bit_array import BitArray
+from bit_array import _popcount
+
+
+BLOCK_BITS = 512
+BLOCKS_PER_SUPERBLOCK = 128
+
+_BLOCK_BYTES = BLOCK_BITS // 8
+
+
+class RankSelect:
+    """
+    A rank/select directory over a BitArray.
+    """
+
+    def __init__(self, bit_array: BitArray):
+        self._bit_array = bit_array
+        self._size = 0
+        self._blocks = array("H")
+        self._supers = array("Q")
+        self._total = 0
+        self._dirty_from = 0
+        self._resize()
+
+    def _resize(self) -> None:
+        # Fit the directory to the BitArray, which may be growable
+        size = len(self._bit_array)
+        # One extra block so that rank(len(bit_array)) has a block to read
+        n_blocks = size // BLOCK_BITS + 1
+        n_supers = (n_blocks - 1) // BLOCKS_PER_SUPERBLOCK + 1
+        for table, n in ((self._blocks, n_blocks), (self._supers, n_supers)):
+            if n > len(table):
+                table.frombytes(bytes(table.itemsize * (n - len(table))))
+            else:
+                del table[n:]
+        self.invalidate(min(size, self._size))
+        self._size = size
+
+    @property
+    def bit_array(self) -> BitArray:
+        return self._bit_array
+
+    def invalidate(self, i: int = 0) -> None:
+        """
+        Declare that bits at positions >= i may have changed.
+        """
+        self._dirty_from = min(self._dirty_from, max(i, 0) // BLOCK_BITS)
+
+    def count(self) -> int:
+        """
+        Return the total number of set bits.
+        """
+        self._refresh()
+        return self._total
+
+    def rank(self, i: int) -> int:
+        """
+        Return the number of set bits before position i.
+
+        i may range from 0 to len(bit_array) inclusive.
+        """
+        if not 0 <= i <= len(self._bit_array):
+            raise IndexError("rank position out of range")
+
+        self._refresh()
+        block = i // BLOCK_BITS
+        rank = self._supers[block // BLOCKS_PER_SUPERBLOCK]
+        rank += self._blocks[block]
+        rem = i % BLOCK_BITS
+        if rem:
+            lo = block * _BLOCK_BYTES
+            with self._bit_array.memory as mem:
+                word = int.from_bytes(mem[lo : lo + (rem + 7) // 8], "little")
+            rank += _popcount(word & ((1 << rem) - 1))
+        return rank
+
+    def select(self, j: int) -> int:
+        """
+        Return the position of the j-th set bit, counting from 0.
+
+        Raises IndexError if fewer than j + 1 bits are set.
+        """
+        self._refresh()
+        if not 0 <= j < self._total:
+            raise IndexError("select index out of range")
+
+        supers = self._supers
+        blocks = self._blocks
+        sb = bisect_right(supers, j) - 1
+        j -= supers[sb]
+
+        lo = sb * BLOCKS_PER_SUPERBLOCK
+        hi = min(lo + BLOCKS_PER_SUPERBLOCK, len(blocks))
+        block = bisect_right(blocks, j, lo, hi) - 1
+        j -= blocks[block]
+
+        start = block * _BLOCK_BYTES
+        with self._bit_array.memory as mem:
+            for pos, byte in enumerate(mem[start : start + _BLOCK_BYTES]):
+                ones = _popcount(byte)
+                if j < ones:
+                    break
+                j -= ones
+
+        # Drop the lowest set bit j times, the next one is the answer
+        for _ in range(j):
+            byte &= byte - 1
+        return (start + pos) * 8 + (byte & -byte).bit_length() - 1
+
+    def _refresh(self) -> None:
+        if len(self._bit_array) != self._size:
+            self._resize()
+
+        first = self._dirty_from
+        blocks = self._blocks
+        if first >= len(blocks):
+            return
+
+        supers = self._supers
+        total = supers[first // BLOCKS_PER_SUPERBLOCK] + blocks[first]
+        end = len(self._bit_array)
+        with self._bit_array.memory as mem:
+            for block in range(first, len(blocks)):
+                sb, offset = divmod(block, BLOCKS_PER_SUPERBLOCK)
+                if not offset:
+                    supers[sb] = total
+                blocks[block] = total - supers[sb]
+                lo = block * _BLOCK_BYTES
+                word = int.from_bytes(mem[lo : lo + _BLOCK_BYTES], "little")
+                if (block + 1) * BLOCK_BITS > end:
+                    # Bits past the end of the BitArray are not its bits
+                    word &= (1 << max(end - block * BLOCK_BITS, 0)) - 1
+                total += _popcount(word)
+
+        self._total = total
+        self._dirty_from = len(blocks)
+
+    def __getitem__(self, __key: int) -> int:
+        return self._bit_array[__key]
+
+    def __setitem__(self, __key: int, __value: int) -> None:
+        self._bit_array[__key] = __value
+        if __key < 0:
+            __key += len(self._bit_array)
+        self.invalidate(__key)
+
+    def __len__(self) -> int:
+        return len(self._bit_array)
@@ -0,0 +1,436 @@
+"""
+Time constraints on key permitted operations:
+
+Let n be the size of the RoaringBitmap
+Let c be the number of set bits (the cardinality)
+and let i be the index an operation is performed on
+
+   Operation    |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+build(n)        |   -->     O(1)        |   No memory until bits are set
+get_at(i)       |   -->     O(log 4096) |   Binary search at worst*
+set_at(i)       |   -->     O(4096)     |   Sorted insert at worst*
+or(other)       |   -->     O(c)        |   Also and, xor
+count()         |   -->     O(n / 2^16) |   One cardinality per chunk
+run_optimize()  |   -->     O(c)        |
+------------------------------------------------------------------------------
+
+The index space is split into chunks of 2^16 bits. Each chunk that holds at
+least one set bit gets a container, picked by whichever is smallest:
+
+   Container    |   Holds                              |   Memory
+------------------------------------------------------------------------------
+array           |   sorted 16 bit values (<= 4096)     |   2 bytes per bit
+bitmap          |   a BitArray of 2^16 bits            |   8 KB
+run             |   (start, length) pairs              |   4 bytes per run
+------------------------------------------------------------------------------
+
+Array and bitmap containers convert into each other as the cardinality of a
+chunk crosses 4096. Run containers are only made by run_optimize(), and turn
+back into array or bitmap containers when written to.
+
+    * Per chunk, so independent of n. Bitmap containers are O(1).
+
+A 2^32 bit RoaringBitmap with a few thousand bits set uses kilobytes, where
+an equivalent BitArray would use 512 MB.
+"""
+
+
+import sys
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from operator import and_
+from operator import or_
+from operator import xor
+from typing import Iterator
+from typing import Union
+from bit_array import BitArray
+from bit_array import _normalize_index
+
+
+CHUNK_BITS = 1 << 16
+ARRAY_MAX = 4096
+
+
+class _ArrayContainer:
+    __slots__ = ("values",)
+
+    def __init__(self, values=()):
+        self.values = array("H", values)
+
+    def add(self, low: int):
+        values = self.values
+        k = bisect_left(values, low)
+        if k < len(values) and values[k] == low:
+            return self
+
+        if len(values) >= ARRAY_MAX:
+            return _BitmapContainer(self.to_bits(), len(values)).add(low)
+
+        values.insert(k, low)
+        return self
+
+    def discard(self, low: int):
+        values = self.values
+        k = bisect_left(values, low)
+        if k < len(values) and values[k] == low:
+            del values[k]
+        return self
+
+    def cardinality(self) -> int:
+        return len(self.values)
+
+    def copy(self) -> "_ArrayContainer":
+        return _ArrayContainer(self.values)
+
+    def to_bits(self) -> BitArray:
+        bits = BitArray(CHUNK_BITS)
+        bits.set_many(self.values)
+        return bits
+
+    def __contains__(self, low: int) -> bool:
+        values = self.values
+        k = bisect_left(values, low)
+        return k < len(values) and values[k] == low
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.values)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self.values)
+
+
+class _BitmapContainer:
+    __slots__ = ("bits", "card")
+
+    def __init__(self, bits: BitArray, card: int):
+        self.bits = bits
+        self.card = card
+
+    def add(self, low: int):
+        if not self.bits[low]:
+            self.bits[low] = 1
+            self.card += 1
+        return self
+
+    def discard(self, low: int):
+        if self.bits[low]:
+            self.bits[low] = 0
+            self.card -= 1
+            if self.card <= ARRAY_MAX:
+                return _ArrayContainer(self.bits.iter_ones())
+        return self
+
+    def cardinality(self) -> int:
+        return self.card
+
+    def copy(self) -> "_BitmapContainer":
+        return _BitmapContainer(self.bits.copy(), self.card)
+
+    def to_bits(self) -> BitArray:
+        return self.bits.copy()
+
+    def __contains__(self, low: int) -> bool:
+        return self.bits[low] == 1
+
+    def __iter__(self) -> Iterator[int]:
+        return self.bits.iter_ones()
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + self.bits.__sizeof__()
+
+
+class _RunContainer:
+    __slots__ = ("starts", "lengths")
+
+    def __init__(self, starts: array, lengths: array):
+        self.starts = starts
+        # Run k covers starts[k] to starts[k] + lengths[k], inclusive
+        self.lengths = lengths
+
+    def add(self, low: int):
+        if low in self:
+            return self
+        return _from_values(list(self)).add(low)
+
+    def discard(self, low: int):
+        if low not in self:
+            return self
+        return _from_values(list(self)).discard(low)
+
+    def cardinality(self) -> int:
+        return sum(self.lengths) + len(self.lengths)
+
+    def copy(self) -> "_RunContainer":
+        return _RunContainer(array("H", self.starts), array("H", self.lengths))
+
+    def to_bits(self) -> BitArray:
+        bits = BitArray(CHUNK_BITS)
+        for start, length in zip(self.starts, self.lengths):
+            bits.setrange(start, start + length + 1)
+        return bits
+
+    def __contains__(self, low: int) -> bool:
+        k = bisect_right(self.starts, low) - 1
+        return k >= 0 and low <= self.starts[k] + self.lengths[k]
+
+    def __iter__(self) -> Iterator[int]:
+        for start, length in zip(self.starts, self.lengths):
+            yield from range(start, start + length + 1)
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self.starts)
+            + sys.getsizeof(self.lengths)
+        )
+
+
+def _from_values(values) -> Union[_ArrayContainer, _BitmapContainer]:
+    # values must be sorted and unique
+    if len(values) <= ARRAY_MAX:
+        return _ArrayContainer(values)
+    bits = BitArray(CHUNK_BITS)
+    bits.set_many(values)
+    return _BitmapContainer(bits, len(values))
+
+
+def _from_bits(bits: BitArray) -> Union[_ArrayContainer, _BitmapContainer]:
+    card = bits.count()
+    if card <= ARRAY_MAX:
+        return _ArrayContainer(bits.iter_ones())
+    return _BitmapContainer(bits, card)
+
+
+def _runs_of(container) -> _RunContainer:
+    starts = array("H")
+    lengths = array("H")
+    if isinstance(container, _BitmapContainer):
+        bits = container.bits
+        start = bits.find_first(1)
+        while start != -1:
+            stop = bits.find_first(0, start)
+            stop = CHUNK_BITS if stop == -1 else stop
+            starts.append(start)
+            lengths.append(stop - start - 1)
+            start = bits.find_first(1, stop)
+    else:
+        for low in container:
+            if starts and low == starts[-1] + lengths[-1] + 1:
+                lengths[-1] += 1
+            else:
+                starts.append(low)
+                lengths.append(0)
+    return _RunContainer(starts, lengths)
+
+
+def _combine(a, b, op):
+    # Returns a new container, or None if the result is empty
+    if isinstance(a, _ArrayContainer) and isinstance(b, _ArrayContainer):
+        values = sorted(op(set(a.values), set(b.values)))
+        return _from_values(values) if values else None
+
+    if op is and_ and isinstance(a, _ArrayContainer):
+        a, b = b, a
+    if op is and_ and isinstance(b, _ArrayContainer):
+        # Probe the array's values against the other container
+        values = [low for low in b.values if low in a]
+        return _ArrayContainer(values) if values else None
+
+    bits = op(a.to_bits(), b.to_bits())
+    return _from_bits(bits) if bits.any() else None
+
+
+class RoaringBitmap:
+    """
+    A compressed bitmap with the same interface as a BitArray, for bitmaps
+    where most bits are unset (or set in long runs).
+    """
+
+    def __init__(self, size: int):
+        if not isinstance(size, int):
+            raise TypeError("size must be an integer")
+
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        self._size = size
+        # Chunk number -> container, for chunks holding at least one set bit
+        self._containers = {}
+
+    def copy(self) -> "RoaringBitmap":
+        """
+        Return an independent copy of this RoaringBitmap.
+        """
+        clone = RoaringBitmap(self._size)
+        clone._containers = {
+            key: container.copy() for key, container in self._containers.items()
+        }
+        return clone
+
+    def bitwise_and(self, other: "RoaringBitmap") -> None:
+        """
+        AND the bits of self with other, mutating self.
+
+        RoaringBitmaps must be of equal length.
+        """
+        self._check_compatible(other, "AND")
+        containers = self._containers
+        for key in list(containers):
+            if key in other._containers:
+                self._store(
+                    key, _combine(containers[key], other._containers[key], and_)
+                )
+            else:
+                del containers[key]
+
+    def bitwise_or(self, other: "RoaringBitmap") -> None:
+        """
+        OR the bits of self with other, mutating self.
+
+        RoaringBitmaps must be of equal length.
+        """
+        self._check_compatible(other, "OR")
+        self._merge(other, or_)
+
+    def bitwise_xor(self, other: "RoaringBitmap") -> None:
+        """
+        XOR the bits of self with other, mutating self.
+
+        RoaringBitmaps must be of equal length.
+        """
+        self._check_compatible(other, "XOR")
+        self._merge(other, xor)
+
+    def count(self, value: int = 1) -> int:
+        """
+        Return the number of bits equal to value.
+        """
+        ones = sum(c.cardinality() for c in self._containers.values())
+        return ones if value else self._size - ones
+
+    def any(self) -> bool:
+        """
+        Return True if at least one bit is set.
+        """
+        return bool(self._containers)
+
+    def iter_ones(self) -> Iterator[int]:
+        """
+        Yield the positions of the set bits, in order.
+        """
+        for key in sorted(self._containers):
+            base = key * CHUNK_BITS
+            for low in self._containers[key]:
+                yield base + low
+
+    def run_optimize(self) -> None:
+        """
+        Convert containers to run containers wherever that saves memory.
+        """
+        for key, container in self._containers.items():
+            runs = _runs_of(container)
+            if runs.__sizeof__() < container.__sizeof__():
+                self._containers[key] = runs
+
+    def _check_compatible(self, other, verb: str) -> None:
+        if not isinstance(other, RoaringBitmap):
+            raise TypeError(f"Must {verb} with another RoaringBitmap")
+
+        if self._size != other._size:
+            raise ValueError("RoaringBitmaps must be of the same size")
+
+    def _merge(self, other: "RoaringBitmap", op) -> None:
+        containers = self._containers
+        for key, container in other._containers.items():
+            if key in containers:
+                self._store(key, _combine(containers[key], container, op))
+            else:
+                containers[key] = container.copy()
+
+    def _store(self, key: int, container) -> None:
+        if container is None or not container.cardinality():
+            self._containers.pop(key, None)
+        else:
+            self._containers[key] = container
+
+    def __getitem__(self, __key: int) -> int:
+        i = _normalize_index(__key, self._size)
+        container = self._containers.get(i >> 16)
+        return int(container is not None and (i & 0xFFFF) in container)
+
+    def __setitem__(self, __key: int, __value: int) -> None:
+        i = _normalize_index(__key, self._size)
+        key = i >> 16
+        container = self._containers.get(key)
+        if __value == 1:
+            if container is None:
+                self._containers[key] = _ArrayContainer([i & 0xFFFF])
+            else:
+                self._containers[key] = container.add(i & 0xFFFF)
+        elif __value == 0 and container is not None:
+            self._store(key, container.discard(i & 0xFFFF))
+
+    def __and__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_and(other)
+        return result
+
+    def __or__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_or(other)
+        return result
+
+    def __xor__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        result = self.copy()
+        result.bitwise_xor(other)
+        return result
+
+    def __iand__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        self.bitwise_and(other)
+        return self
+
+    def __ior__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        self.bitwise_or(other)
+        return self
+
+    def __ixor__(self, other: "RoaringBitmap") -> "RoaringBitmap":
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        self.bitwise_xor(other)
+        return self
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RoaringBitmap):
+            return NotImplemented
+        if self._size != other._size:
+            return False
+        if self._containers.keys() != other._containers.keys():
+            return False
+        return all(
+            list(container) == list(other._containers[key])
+            for key, container in self._containers.items()
+        )
+
+    __hash__ = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._containers)
+            + sum(c.__sizeof__() for c in self._containers.values())
+        )
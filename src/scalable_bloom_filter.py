@@ -0,0 +1,154 @@
+"""
+Time constraints on key permitted operations:
+
+Let n be the number of distinct inserted elements
+Let n0 be the initial capacity and s the growth factor
+Let f be the number of sub-filters, about log_s(n / n0)
+Let k be the number of hash functions of the largest sub-filter
+
+   Operation         |     Time complexity   |      Notes
+------------------------------------------------------------------------------
+build(n0, p)         |   -->     O(n0)       |
+might_contain(item)  |   -->     O(f * k)    |  Newest sub-filter first
+put(item)            |   -->     O(f * k)    |  Checks membership first*
+expected_fpp()       |   -->     O(f)        |  Compounded over sub-filters
+------------------------------------------------------------------------------
+
+Scalable Bloom filters (Almeida, Baquero, Preguiça & Hutchison, 2007):
+- Items go into the newest sub-filter until it holds its capacity, then a new
+  sub-filter is added, s times larger than the previous one
+- Sub-filter i is built for an error rate of p * (1 - r) * r ** i, where r is
+  the tightening ratio. The rates sum to at most p, so the overall false
+  positive probability stays below p however many items are put
+- Memory grows with n: about n * log2(1 / p) / ln(2) bits overall, plus a
+  constant factor that depends on r
+
+    * An item that is already (possibly) present is not put again, so that
+      duplicates do not use up capacity
+"""
+
+
+import sys
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from bloom_filter import BloomFilter
+from bloom_filter import _classic_fpp
+from hashing import DEFAULT_HASH_STRATEGY
+from hashing import HashStrategy
+
+
+class ScalableBloomFilter:
+    """
+    A Bloom filter that grows as items are put, keeping its false positive
+    probability below fp_rate.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int,
+        fp_rate: float = 0.03,
+        *,
+        growth: int = 2,
+        tightening: float = 0.5,
+        hash_strategy: HashStrategy = DEFAULT_HASH_STRATEGY,
+    ):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+
+        if not isinstance(growth, int):
+            raise TypeError("growth must be an integer")
+
+        if growth < 1:
+            raise ValueError("growth must be at least 1")
+
+        if not 0 < tightening < 1:
+            raise ValueError("tightening must be between 0 and 1")
+
+        self._fp_rate = fp_rate
+        self._growth = growth
+        self._tightening = tightening
+        self._hash_strategy = hash_strategy
+        self._filters: List[BloomFilter] = []
+        # The first sub-filter validates the remaining arguments
+        self._add_filter(initial_capacity)
+
+    def _add_filter(self, capacity: int) -> BloomFilter:
+        r = self._tightening
+        fp_rate = self._fp_rate * (1 - r) * r ** len(self._filters)
+        bloom = BloomFilter(
+            capacity, fp_rate, hash_strategy=self._hash_strategy
+        )
+        self._filters.append(bloom)
+        return bloom
+
+    def may_contain(self, item: Hashable) -> bool:
+        """
+        Returns True if the item might have been put in this filter,
+        False if this is definitely not the case.
+        """
+        # The newest sub-filter is the largest and holds the most items
+        for bloom in reversed(self._filters):
+            if bloom.may_contain(item):
+                return True
+        return False
+
+    def put(self, item: Hashable) -> bool:
+        """
+        Put an element into the filter. Returns False if it might already
+        have been there, in which case nothing is changed.
+        """
+        if self.may_contain(item):
+            return False
+
+        bloom = self._filters[-1]
+        if bloom._insertions >= bloom._expected_insertions:
+            bloom = self._add_filter(bloom._expected_insertions * self._growth)
+        bloom.put(item)
+        return True
+
+    def put_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Put every element of items into the filter.
+        """
+        put = self.put
+        for item in items:
+            put(item)
+
+    def expected_fpp(self) -> float:
+        """
+        Returns the probability that might_contain(item) will erroneously
+        return True, given the items put so far.
+
+        An item is a false positive if any sub-filter reports it, so this is
+        1 - the product of (1 - the false positive probability of each
+        sub-filter at its current fill).
+        """
+        p_none = 1.0
+        for bloom in self._filters:
+            m = len(bloom._bit_array)
+            p_none *= 1 - _classic_fpp(bloom._insertions, m, bloom._num_hashes)
+        return 1 - p_none
+
+    @property
+    def num_filters(self) -> int:
+        return len(self._filters)
+
+    def __contains__(self, item) -> bool:
+        """
+        Included for uniformity with other container types.
+        """
+        return self.may_contain(item)
+
+    def __len__(self) -> int:
+        """
+        The number of items put, not counting ones found already present.
+        """
+        return sum(bloom._insertions for bloom in self._filters)
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._filters)
+            + sum(sys.getsizeof(bloom) for bloom in self._filters)
+        )
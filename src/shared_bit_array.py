@@ -0,0 +1,147 @@
+"""
+A BitArray living in shared memory, so that several processes can read and
+write the same bits without merging copies at the end.
+
+Writes are guarded by striped locks exactly like LockedBitArray's (see
+locked_bit_array.py), except that the locks are multiprocessing locks,
+shared with every process the SharedBitArray is passed to.
+
+stripes=0 disables locking. Setting a bit is a read-modify-write of the
+whole byte, which Python cannot do atomically on shared memory, so two
+processes setting different bits of the same byte at the same moment can
+lose one of them. Only use stripes=0 when each byte has a single writer,
+e.g. when every worker owns a byte-aligned range of the BitArray.
+
+The creating process owns the shared memory block and should unlink() it
+once every process is done with it.
+"""
+
+
+import os
+import sys
+from multiprocessing import RLock
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from locked_bit_array import DEFAULT_STRIPES
+from locked_bit_array import LockedBitArray
+
+
+# Names of the blocks created by this process, and not unlinked yet
+_created = set()
+
+
+def _open_shared_memory(name: str, track: bool) -> shared_memory.SharedMemory:
+    # The resource tracker unlinks the blocks registered with it when its
+    # processes exit. Processes that merely attach must not register, or
+    # their exit would free the block under the creator's feet
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=track)
+
+    shm = shared_memory.SharedMemory(name=name)
+    if not track and os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unpickle_shared_bit_array(
+    name: str, size: int, locks: tuple
+) -> "SharedBitArray":
+    # Child processes share their parent's resource tracker, where the
+    # creator has registered the block already
+    shm = _open_shared_memory(name, track=True)
+    shared = SharedBitArray.__new__(SharedBitArray)
+    shared._attach(shm, size, locks)
+    return shared
+
+
+class SharedBitArray(LockedBitArray):
+    """
+    A BitArray backed by multiprocessing.shared_memory.
+
+    Pass it to child processes as an argument of multiprocessing.Process or
+    of a Pool initializer: it is pickled by name (with its locks) and the
+    child attaches to the same memory. Unrelated processes can attach
+    with SharedBitArray.attach(name, size), without the locks.
+    """
+
+    def __init__(
+        self, size: int, *, name: str = None, stripes: int = DEFAULT_STRIPES
+    ):
+        if not isinstance(size, int):
+            raise TypeError("size must be an integer")
+
+        if size <= 0:
+            raise ValueError("size must be positive")
+
+        if stripes < 0:
+            raise ValueError("stripes must not be negative")
+
+        # New shared memory is zero-filled
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=(size + 7) // 8
+        )
+        locks = tuple(RLock() for _ in range(stripes))
+        _created.add(shm.name)
+        self._attach(shm, size, locks)
+
+    @classmethod
+    def attach(
+        cls, name: str, size: int, locks: tuple = ()
+    ) -> "SharedBitArray":
+        """
+        Attach to the SharedBitArray called name, created elsewhere.
+
+        Without the creator's locks, writes from this process do not lock.
+        The memory stays allocated when this process exits: only its
+        creator frees it, with unlink().
+        """
+        shm = _open_shared_memory(name, track=name in _created)
+        if shm.size < (size + 7) // 8:
+            shm.close()
+            raise ValueError("shared memory is too small for this size")
+
+        shared = cls.__new__(cls)
+        shared._attach(shm, size, locks)
+        return shared
+
+    def _attach(self, shm, size: int, locks: tuple) -> None:
+        self._shm = shm
+        self._size = size
+        self._locks = locks
+        # The block may be rounded up to a whole page
+        self._arr = shm.buf[: (size + 7) // 8]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        """
+        Detach this process from the shared memory.
+        """
+        self._arr.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory once every process has closed it.
+        Call from the creating process only.
+        """
+        self._shm.unlink()
+        _created.discard(self._shm.name)
+
+    def __reduce_ex__(self, __protocol: int):
+        return (
+            _unpickle_shared_bit_array,
+            (self.name, self._size, self._locks),
+        )
+
+    def __enter__(self) -> "SharedBitArray":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __sizeof__(self) -> int:
+        # The bits themselves live in shared memory, not on the heap
+        return object.__sizeof__(self) + self._size.__sizeof__()
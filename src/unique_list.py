@@ -9,14 +9,31 @@ and let i be the index
 append(item)    |   -->     O(1)        |   Amortized O(1)
 contains(item)  |   -->     O(1)        |   Use underlying set
 delete_at(i)    |   -->     O(n)        |   Worst case (i=0), O(1) at i = n-1
+extend(k)       |   -->     O(k)        |   k items, deduplicated in bulk
 get_at(i)       |   -->     O(1)        |
+get_at(slice)   |   -->     O(1)        |   Returns a view, see below
+index(item)     |   -->     O(n)        |   O(1) if absent, scan in C otherwise
 insert(i, item) |   -->     O(n)        |   Worst case (i=0), O(1) at i = n
 set_at(i)       |   -->     O(1)        |
 remove(item)    |   -->     O(n)        |   Find i of item + delete_at(i)
+remove_many(k)  |   -->     O(n + k)    |   k items, a single pass
 ------------------------------------------------------------------------------
 
 Overall, requires O(n) space
 
+Slicing a UniqueList does not copy it: unique_list[start:stop:step] is a
+UniqueListView, a read-only window on those positions of the UniqueList,
+with O(1) len and indexing. Membership checks the UniqueList's set first,
+then where the item is, within the window only. view.copy() materializes
+the view as a new UniqueList. A view sees later changes to the items at its
+positions, but its positions are fixed when it is made: do not keep a view
+across changes to the length of the UniqueList. In particular, to remove
+items while looping over a UniqueList, loop over unique_list.copy(), not
+unique_list[:].
+
+For long lists edited in the middle, see IndexedUniqueList, which makes
+index, remove, insert and delete_at O(log n)
+
 Open question for now:
 Is it possible to extend the data structure to allow non-hashable
 entries while preserving the time complexity of these operations?
@@ -27,10 +44,13 @@ Is it better to call this structure a "UniqueList" or an "OrderedSet"?
 
 
 from collections.abc import MutableSequence
+from collections.abc import Sequence
 from typing import Any
 from typing import Hashable
 from typing import Iterable
+from typing import Iterator
 from typing import SupportsIndex
+from typing import Union
 
 
 class UniqueList(MutableSequence):
@@ -63,12 +83,51 @@ class UniqueList(MutableSequence):
         self._lst.clear()
         self._hsh.clear()
 
+    def copy(self) -> "UniqueList":
+        """
+        Return a shallow copy of UniqueList.
+        """
+        unique = type(self)()
+        unique._lst = self._lst.copy()
+        unique._hsh = self._hsh.copy()
+        return unique
+
     def extend(self, iterable: Iterable, *, strict: bool = False) -> None:
         """
         Extend UniqueList by appending elements from the iterable.
+
+        If `strict` is enabled, will throw a ValueError, and add nothing,
+        if any of the elements is a duplicate. Skips duplicates otherwise.
         """
-        for item in iterable:
-            self.append(item, strict=strict)
+        if strict:
+            items = list(iterable)
+            new = dict.fromkeys(items)
+            if len(new) != len(items) or not self._hsh.isdisjoint(new):
+                raise ValueError("Cannot insert duplicate entry")
+        else:
+            # dict.fromkeys dedupes in C and keeps the first occurrence
+            new = dict.fromkeys(iterable)
+            if self._hsh:
+                new = [item for item in new if item not in self._hsh]
+        self._lst.extend(new)
+        self._hsh.update(new)
+
+    def index(
+        self,
+        item: Hashable,
+        start: SupportsIndex = 0,
+        stop: SupportsIndex = None,
+    ) -> int:
+        """
+        Return the index of item.
+
+        Raises ValueError if item is not present, or not in [start, stop).
+        """
+        if item not in self._hsh:
+            raise ValueError(f"{item!r} is not in UniqueList")
+        if stop is None:
+            return self._lst.index(item, start)
+        return self._lst.index(item, start, stop)
 
     def insert(
         self, __index: SupportsIndex, item: Hashable, *, strict: bool = False
@@ -105,6 +164,20 @@ class UniqueList(MutableSequence):
         self._lst.remove(item)
         self._hsh.remove(item)
 
+    def remove_many(self, items: Iterable[Hashable]) -> None:
+        """
+        Remove all specified items from UniqueList, in a single pass.
+
+        Raises ValueError, and removes nothing, if any item is not present.
+        """
+        doomed = set(items)
+        if not doomed <= self._hsh:
+            missing = next(iter(doomed - self._hsh))
+            raise ValueError(f"{missing!r} is not in UniqueList")
+        if doomed:
+            self._lst[:] = [item for item in self._lst if item not in doomed]
+            self._hsh -= doomed
+
     def reverse(self) -> None:
         self._lst.reverse()
 
@@ -114,20 +187,28 @@ class UniqueList(MutableSequence):
     def __contains__(self, item: Hashable) -> bool:
         return item in self._hsh
 
-    def __delitem__(self, __key: SupportsIndex) -> None:
+    def __delitem__(self, __key: Union[SupportsIndex, slice]) -> None:
         """
         Delete self[key].
         """
+        if isinstance(__key, slice):
+            self._hsh.difference_update(self._lst[__key])
+            del self._lst[__key]
+            return
+
         val = self._lst[__key]
         self._hsh.remove(val)
         del self._lst[__key]
 
-    def __getitem__(self, __index: SupportsIndex):
+    def __getitem__(self, __index: Union[SupportsIndex, slice]):
         """
         x.__getitem__(y) <==> x[y]
+
+        A slice is returned as a UniqueListView, without copying. Use
+        copy() for a copy.
         """
-        # TODO: slice of UniqueList should return UniqueList, not list
-        # But if I do that, I need to worry about whether or not to deep copy
+        if isinstance(__index, slice):
+            return UniqueListView(self, range(len(self._lst))[__index])
         return self._lst[__index]
 
     def __len__(self) -> int:
@@ -136,10 +217,128 @@ class UniqueList(MutableSequence):
     def __repr__(self) -> str:
         return f"UniqueList({str(self._lst)})"
 
-    def __setitem__(self, __index: SupportsIndex, item: Hashable) -> None:
+    def __setitem__(
+        self, __index: Union[SupportsIndex, slice], item: Hashable
+    ) -> None:
+        """
+        Set self[index] to item, or self[slice] to the items of an iterable.
+
+        Throws ValueError if this would make an entry appear twice.
+        """
+        if isinstance(__index, slice):
+            self._setslice(__index, item)
+            return
+
         if item in self._hsh:
             raise ValueError("Cannot insert duplicate entry")
 
         old_item = self._lst[__index]
         self._hsh.remove(old_item)
         self._lst[__index] = item
+        self._hsh.add(item)
+
+    def _setslice(self, __slice: slice, iterable: Iterable) -> None:
+        items = list(iterable)
+        old = set(self._lst[__slice])
+        new = dict.fromkeys(items)
+        if len(new) != len(items) or any(
+            item in self._hsh and item not in old for item in new
+        ):
+            raise ValueError("Cannot insert duplicate entry")
+
+        # Raises ValueError on a length mismatch for extended slices
+        self._lst[__slice] = items
+        self._hsh -= old
+        self._hsh.update(new)
+
+
+class UniqueListView(Sequence):
+    """
+    A read-only view of some positions of a UniqueList, as returned by
+    slicing it.
+
+    Not a snapshot: use UniqueList.copy() to loop over a UniqueList that
+    the loop changes.
+    """
+
+    def __init__(self, parent: UniqueList, positions: range):
+        self._parent = parent
+        self._range = positions
+
+    def _position(self, item: Hashable) -> int:
+        # Position of item in the parent, if it is in the view, else -1
+        r = self._range
+        if not r or item not in self._parent._hsh:
+            return -1
+        lo, hi = (r[0], r[-1]) if r.step > 0 else (r[-1], r[0])
+        try:
+            pos = self._parent._lst.index(item, lo, hi + 1)
+        except ValueError:
+            return -1
+        return pos if pos in r else -1
+
+    def copy(self) -> UniqueList:
+        """
+        Return the items of the view as a new UniqueList.
+        """
+        unique = UniqueList()
+        unique._lst = list(self)
+        unique._hsh = set(unique._lst)
+        return unique
+
+    def count(self, item: Hashable) -> int:
+        return int(self._position(item) >= 0)
+
+    def index(
+        self,
+        item: Hashable,
+        start: SupportsIndex = 0,
+        stop: SupportsIndex = None,
+    ) -> int:
+        """
+        Return the index of item in the view.
+
+        Raises ValueError if item is not present, or not in [start, stop).
+        """
+        pos = self._position(item)
+        if pos < 0:
+            raise ValueError(f"{item!r} is not in UniqueListView")
+
+        i = self._range.index(pos)
+        start, stop, _ = slice(start, stop).indices(len(self._range))
+        if not start <= i < stop:
+            raise ValueError(f"{item!r} is not in UniqueListView")
+        return i
+
+    def __contains__(self, item: Hashable) -> bool:
+        return self._position(item) >= 0
+
+    def __eq__(self, other) -> bool:
+        # Compares equal to lists, as slices of a UniqueList used to be
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def __getitem__(self, __index: Union[SupportsIndex, slice]):
+        """
+        x.__getitem__(y) <==> x[y]
+
+        A slice is returned as another view of the same UniqueList.
+        """
+        if isinstance(__index, slice):
+            return UniqueListView(self._parent, self._range[__index])
+        return self._parent._lst[self._range[__index]]
+
+    def __iter__(self) -> Iterator:
+        return map(self._parent._lst.__getitem__, self._range)
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __repr__(self) -> str:
+        return f"UniqueListView({list(self)})"
+
+    def __reversed__(self) -> Iterator:
+        return map(self._parent._lst.__getitem__, reversed(self._range))
@@ -1,5 +1,11 @@
+import copy
+import hashlib
+import pickle
+import sys
 import pytest
+from array import array
 from src import BitArray
+from src import MappedBitArray
 
 
 @pytest.fixture
@@ -94,3 +100,581 @@ def test_memory():
         lst = [0] * i
         b = BitArray(i)
         assert pytest.approx(b.__sizeof__(), rel=0.01) == lst.__sizeof__() / 60
+
+
+@pytest.fixture
+def evens_and_thirds():
+    SIZE = 1_003
+    evens = BitArray(SIZE)
+    thirds = BitArray(SIZE)
+    for i in range(0, SIZE, 2):
+        evens[i] = 1
+    for i in range(0, SIZE, 3):
+        thirds[i] = 1
+    return evens, thirds
+
+
+def test_bulk_operators(evens_and_thirds):
+    evens, thirds = evens_and_thirds
+    both = evens & thirds
+    either = evens | thirds
+    one = evens ^ thirds
+    only_evens = evens - thirds
+
+    for i in range(len(evens)):
+        assert both[i] == int(i % 6 == 0)
+        assert either[i] == int(i % 2 == 0 or i % 3 == 0)
+        assert one[i] == int((i % 2 == 0) != (i % 3 == 0))
+        assert only_evens[i] == int(i % 2 == 0 and i % 3 != 0)
+
+    # Out-of-place operators leave their operands untouched
+    assert evens.count() == 502
+    assert thirds.count() == 335
+
+
+def test_in_place_operators(evens_and_thirds):
+    evens, thirds = evens_and_thirds
+    original = evens
+    evens &= thirds
+    assert evens is original
+    assert evens.count() == 168
+
+    evens |= thirds
+    assert evens == thirds
+
+    evens ^= thirds
+    assert not evens.any()
+
+    thirds -= thirds.copy()
+    assert thirds.count() == 0
+
+
+def test_invert():
+    bit_array = BitArray(13)
+    bit_array[3] = 1
+    inverted = ~bit_array
+    assert inverted.count() == 12
+    assert inverted[3] == 0
+    assert bit_array.count() == 1
+
+    bit_array.invert()
+    assert bit_array == inverted
+
+
+def test_count_any_all():
+    bit_array = BitArray(20)
+    assert bit_array.count() == 0
+    assert bit_array.count(0) == 20
+    assert not bit_array.any()
+    assert not bit_array.all()
+
+    bit_array.invert()
+    assert bit_array.count() == 20
+    assert bit_array.any()
+    assert bit_array.all()
+
+
+def test_equality():
+    a = BitArray(10)
+    b = BitArray(10)
+    assert a == b
+    a[9] = 1
+    assert a != b
+    assert BitArray(10) != BitArray(11)
+    assert (BitArray(10) == [0] * 10) is False
+
+
+def test_copy_is_independent(filled_bit_array: BitArray):
+    clone = filled_bit_array.copy()
+    assert clone == filled_bit_array
+    clone[0] = 1
+    assert filled_bit_array[0] == 0
+
+
+def test_bulk_ops_across_chunks():
+    # Spans several internal chunks, including a partial final one
+    SIZE = 8 * (1 << 20) * 2 + 11
+    a = BitArray(SIZE)
+    b = BitArray(SIZE)
+    a[SIZE - 1] = 1
+    b[0] = 1
+    b[SIZE // 2] = 1
+    a |= b
+    assert a.count() == 3
+    assert (~a).count() == SIZE - 3
+
+
+def test_prohibited_bulk_ops():
+    arr = BitArray(3)
+
+    with pytest.raises(ValueError):
+        arr & BitArray(5)
+
+    with pytest.raises(TypeError):
+        arr ^ [0, 1, 0]
+
+    with pytest.raises(TypeError):
+        arr.bitwise_andnot([0, 1, 0])
+
+
+def test_set_many():
+    bit_array = BitArray(100)
+    bit_array.set_many([1, 5, 5, 99])
+    bit_array.set_many(range(10, 20))
+    bit_array.set_many(array("Q", [50, 51]))
+    bit_array.set_many(i for i in (70, 71))
+    assert bit_array.count() == 17
+    assert bit_array[99] == 1
+
+    bit_array.set_many(range(10, 20), 0)
+    assert bit_array.count() == 7
+    assert bit_array[15] == 0
+
+
+def test_get_many(filled_bit_array: BitArray):
+    assert filled_bit_array.get_many([0, 2, 5, 9]) == [0, 1, 1, 0]
+    assert filled_bit_array.get_many(array("Q", [5])) == [1]
+    assert filled_bit_array.get_many([]) == []
+
+
+def test_test_all(filled_bit_array: BitArray):
+    assert filled_bit_array.test_all([2, 5]) is True
+    assert filled_bit_array.test_all([2, 3, 5]) is False
+    assert filled_bit_array.test_all([]) is True
+
+
+def test_many_bad_input(filled_bit_array: BitArray):
+    with pytest.raises(IndexError):
+        filled_bit_array.set_many([10])
+
+    with pytest.raises(IndexError):
+        filled_bit_array.get_many([-1])
+
+    with pytest.raises(IndexError):
+        filled_bit_array.test_all([2, 5, 100])
+
+    with pytest.raises(ValueError):
+        filled_bit_array.set_many([1], 2)
+
+
+def test_many_numpy():
+    np = pytest.importorskip("numpy")
+    bit_array = BitArray(100)
+    # Repeated and same-byte positions must all be kept
+    bit_array.set_many(np.array([0, 1, 1, 7, 99], dtype=np.uint64))
+    assert bit_array.count() == 4
+    assert bit_array.get_many(np.array([0, 2, 99])).tolist() == [1, 0, 1]
+    assert bit_array.test_all(np.array([0, 1, 7]))
+    assert not bit_array.test_all(np.array([0, 2]))
+
+    bit_array.set_many(np.array([0, 1]), 0)
+    assert bit_array.count() == 2
+
+    with pytest.raises(IndexError):
+        bit_array.set_many(np.array([100]))
+
+    with pytest.raises(TypeError):
+        bit_array.get_many(np.array([1.5]))
+
+
+def test_index_bounds(filled_bit_array: BitArray):
+    assert filled_bit_array[-5] == 1
+    filled_bit_array[-1] = 1
+    assert filled_bit_array[9] == 1
+
+    with pytest.raises(IndexError):
+        filled_bit_array[10]
+
+    with pytest.raises(IndexError):
+        filled_bit_array[-11] = 1
+
+
+def test_get_slice(filled_bit_array: BitArray):
+    part = filled_bit_array[1:6]
+    assert isinstance(part, BitArray)
+    assert len(part) == 5
+    assert part.get_many(range(5)) == [0, 1, 0, 0, 1]
+
+    assert filled_bit_array[::-1].get_many([4, 7]) == [1, 1]
+    assert filled_bit_array[::3].count() == 0
+    assert len(filled_bit_array[5:2]) == 0
+
+
+def test_set_slice():
+    bit_array = BitArray(30)
+    bit_array[3:27] = 1
+    assert bit_array.count() == 24
+    assert bit_array[2] == 0 and bit_array[27] == 0
+
+    bit_array[::2] = 0
+    assert bit_array.count() == 12
+
+    bit_array[0:4] = [1, 1, 0, 1]
+    assert bit_array.get_many(range(4)) == [1, 1, 0, 1]
+
+    source = BitArray(10)
+    source[0] = 1
+    source[9] = 1
+    bit_array[17:27] = source
+    assert bit_array[17:27] == source
+
+    with pytest.raises(ValueError):
+        bit_array[0:4] = [1, 1]
+
+    with pytest.raises(ValueError):
+        bit_array[0:4] = 2
+
+
+def test_setrange_and_fill():
+    bit_array = BitArray(1_000_003)
+    bit_array.setrange(5, 1_000_000)
+    assert bit_array.count() == 999_995
+    assert bit_array.get_many([4, 5, 999_999, 1_000_000]) == [0, 1, 1, 0]
+
+    bit_array.setrange(6, 7, 0)
+    assert bit_array.count() == 999_994
+
+    bit_array.fill(1)
+    assert bit_array.all()
+    bit_array.fill(0)
+    assert not bit_array.any()
+
+    # Stays within one byte
+    bit_array.setrange(2, 5)
+    assert bit_array.count() == 3
+
+
+def test_view():
+    bit_array = BitArray(100)
+    view = bit_array.view(13, 50)
+    assert len(view) == 37
+
+    view[0] = 1
+    assert bit_array[13] == 1
+    bit_array[49] = 1
+    assert view[-1] == 1
+    assert view.count() == 2
+
+    view[10:20] = 1
+    assert bit_array.count() == 12
+    assert view[10:20].all()
+
+    clone = view.copy()
+    clone.fill(0)
+    assert view.count() == 12
+
+    view.fill(0)
+    assert not bit_array.any()
+
+    with pytest.raises(IndexError):
+        view[37]
+
+
+def test_view_shares_memory():
+    bit_array = BitArray(64)
+    with bit_array.view(16, 32) as view:
+        assert view.memory.nbytes == 2
+        view.memory[0] = 0xFF
+        assert bit_array[16:24].all()
+
+
+def test_mapped_round_trip(tmp_path):
+    path = tmp_path / "bits.bin"
+    with BitArray.open(path, 1_000, mode="w+") as bit_array:
+        assert isinstance(bit_array, MappedBitArray)
+        assert len(bit_array) == 1_000
+        assert not bit_array.any()
+        bit_array[3] = 1
+        bit_array.setrange(500, 600)
+
+    assert path.stat().st_size == 125
+
+    with BitArray.open(path, 1_000) as bit_array:
+        assert bit_array[3] == 1
+        assert bit_array.count() == 101
+
+        with pytest.raises(TypeError):
+            bit_array[0] = 1
+
+    with BitArray.open(path, 1_000, mode="r+") as bit_array:
+        bit_array.bitwise_or(~bit_array)
+        bit_array.flush()
+        with BitArray.open(path, 1_000) as reader:
+            assert reader.all()
+
+
+def test_mapped_offset(tmp_path):
+    path = tmp_path / "bits.bin"
+    path.write_bytes(b"header" + bytes([0b101]))
+    with BitArray.open(path, 8, offset=6) as bit_array:
+        assert bit_array.get_many(range(3)) == [1, 0, 1]
+
+
+def test_mapped_copy_is_in_memory(tmp_path):
+    with BitArray.open(tmp_path / "bits.bin", 64, mode="w+") as bit_array:
+        bit_array[1] = 1
+        clone = bit_array.copy()
+
+    assert type(clone) is BitArray
+    assert clone[1] == 1
+    assert bit_array.closed
+
+
+def test_mapped_bad_open(tmp_path):
+    path = tmp_path / "bits.bin"
+    path.write_bytes(bytes(4))
+
+    with pytest.raises(ValueError):
+        BitArray.open(path, 33)
+
+    with pytest.raises(ValueError):
+        BitArray.open(path, 8, mode="a")
+
+    with pytest.raises(ValueError):
+        BitArray.open(path, 0)
+
+    with pytest.raises(FileNotFoundError):
+        BitArray.open(tmp_path / "missing.bin", 8)
+
+
+def test_to_bytes(filled_bit_array: BitArray):
+    assert filled_bit_array.to_bytes() == bytes([0b100100, 0])
+    assert BitArray.from_bytes(filled_bit_array.to_bytes(), 10) == (
+        filled_bit_array
+    )
+
+
+def test_from_bytes():
+    bit_array = BitArray.from_bytes(b"\x01\xff")
+    assert len(bit_array) == 16
+    assert bit_array.count() == 9
+
+    # Padding bits beyond size are dropped
+    bit_array = BitArray.from_bytes(b"\x01\xff", 10)
+    assert bit_array.count() == 3
+    assert bit_array.to_bytes() == b"\x01\x03"
+
+    with pytest.raises(ValueError):
+        BitArray.from_bytes(b"\x01\xff", 20)
+
+    with pytest.raises(ValueError):
+        BitArray.from_bytes(b"")
+
+
+def test_from_bytes_without_copy():
+    data = bytearray(2)
+    bit_array = BitArray.from_bytes(data, copy=False)
+    bit_array[15] = 1
+    assert data == b"\x00\x80"
+
+    read_only = BitArray.from_bytes(b"\x00", copy=False)
+    with pytest.raises(TypeError):
+        read_only[0] = 1
+
+
+def test_from_bytes_without_copy_padding():
+    data = bytearray(b"\xff\xff")
+    dirty = BitArray.from_bytes(data, 10, copy=False)
+    assert data == b"\xff\x03"
+    assert bytes(dirty.memory) == dirty.to_bytes()
+
+    with pytest.raises(ValueError):
+        BitArray.from_bytes(b"\xff\xff", 10, copy=False)
+    clean = BitArray.from_bytes(b"\xff\x03", 10, copy=False)
+    assert clean.count() == 10
+
+
+def test_operators_clear_padding(tmp_path):
+    # A file written elsewhere may have set bits past the BitArray's size:
+    # they must not leak into the result
+    path = tmp_path / "dirty.bits"
+    path.write_bytes(b"\xff\xff")
+    with BitArray.open(path, 10) as dirty:
+        for op in ("__ior__", "__ixor__"):
+            result = getattr(BitArray(10), op)(dirty)
+            assert bytes(result.memory) == b"\xff\x03"
+            assert result == BitArray.from_bytes(b"\xff\x03", 10)
+
+
+def test_memory(filled_bit_array: BitArray):
+    digest = hashlib.sha256(filled_bit_array.memory).hexdigest()
+    assert digest == hashlib.sha256(filled_bit_array.to_bytes()).hexdigest()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="needs PEP 688")
+def test_buffer_protocol(filled_bit_array: BitArray):
+    assert bytes(memoryview(filled_bit_array)) == filled_bit_array.to_bytes()
+
+
+@pytest.mark.parametrize("protocol", [2, 4, 5])
+def test_pickle(protocol: int):
+    bit_array = BitArray(100_000)
+    bit_array.setrange(10, 20)
+    data = pickle.dumps(bit_array, protocol=protocol)
+    assert len(data) < 100_000 // 8 + 200
+
+    clone = pickle.loads(data)
+    assert type(clone) is BitArray
+    assert clone == bit_array
+
+
+def test_pickle_mapped(tmp_path):
+    with BitArray.open(tmp_path / "bits.bin", 64, mode="w+") as bit_array:
+        bit_array[7] = 1
+        clone = pickle.loads(pickle.dumps(bit_array))
+
+    assert type(clone) is BitArray
+    assert clone[7] == 1
+
+
+def test_pickle_bad_version(filled_bit_array: BitArray):
+    func, (_, size, data) = filled_bit_array.__reduce_ex__(4)
+    with pytest.raises(ValueError):
+        func(99, size, data)
+
+
+@pytest.fixture
+def sparse_bit_array():
+    bit_array = BitArray(100_005)
+    bit_array.set_many([0, 7, 8, 4_000, 4_001, 99_999, 100_004])
+    return bit_array
+
+
+def test_iter_ones(sparse_bit_array: BitArray):
+    assert list(sparse_bit_array.iter_ones()) == [
+        0,
+        7,
+        8,
+        4_000,
+        4_001,
+        99_999,
+        100_004,
+    ]
+    assert list(sparse_bit_array.iter_ones(7, 4_001)) == [7, 8, 4_000]
+    assert list(sparse_bit_array.iter_ones(1, 7)) == []
+
+
+def test_iter_zeros():
+    bit_array = BitArray(20)
+    bit_array.fill(1)
+    bit_array.set_many([3, 19], 0)
+    assert list(bit_array.iter_zeros()) == [3, 19]
+    assert list(bit_array.iter_zeros(4, 19)) == []
+    assert len(list(BitArray(21).iter_zeros())) == 21
+
+
+def test_find_first(sparse_bit_array: BitArray):
+    assert sparse_bit_array.find_first() == 0
+    assert sparse_bit_array.find_first(1, 9) == 4_000
+    assert sparse_bit_array.find_first(1, 4_002, 99_999) == -1
+    assert sparse_bit_array.find_first(0) == 1
+    assert sparse_bit_array.next_set_bit(4_001) == 4_001
+    assert sparse_bit_array.next_set_bit(4_002) == 99_999
+
+
+def test_find_last(sparse_bit_array: BitArray):
+    assert sparse_bit_array.find_last() == 100_004
+    assert sparse_bit_array.find_last(1, 0, 100_004) == 99_999
+    assert sparse_bit_array.find_last(1, 9, 4_001) == 4_000
+    assert sparse_bit_array.find_last(1, 1, 7) == -1
+    assert sparse_bit_array.find_last(0) == 100_003
+    assert BitArray(9).find_last() == -1
+
+    full = BitArray(17)
+    full.fill(1)
+    assert full.find_last(0) == -1
+    full[2] = 0
+    assert full.find_last(0, 0, 16) == 2
+
+
+def test_growable_append():
+    bit_array = BitArray(0, growable=True)
+    assert len(bit_array) == 0
+    for i in range(1_000):
+        bit_array.append(i % 3 == 0)
+    assert len(bit_array) == 1_000
+    assert bit_array.count() == 334
+    assert bit_array[999] == 1
+    # Capacity is over-allocated, but only the bits in use are counted
+    assert len(bit_array.to_bytes()) == 125
+
+
+def test_growable_extend():
+    bit_array = BitArray(3, growable=True)
+    bit_array.extend([1, 0, 1])
+    other = BitArray(10)
+    other.fill(1)
+    bit_array.extend(other)
+    assert len(bit_array) == 16
+    assert bit_array.get_many(range(6)) == [0, 0, 0, 1, 0, 1]
+    assert bit_array[6:].all()
+
+
+def test_growable_auto_grow():
+    bit_array = BitArray(10, growable=True)
+    bit_array[100] = 1
+    assert len(bit_array) == 101
+    bit_array.set_many([5, 300])
+    assert len(bit_array) == 301
+    assert list(bit_array.iter_ones()) == [5, 100, 300]
+
+    with pytest.raises(IndexError):
+        bit_array[-302] = 1
+
+    with pytest.raises(IndexError):
+        bit_array[301]
+
+
+def test_resize():
+    bit_array = BitArray(20, growable=True)
+    bit_array.fill(1)
+    bit_array.resize(5)
+    assert len(bit_array) == 5
+    assert bit_array.count() == 5
+
+    # Bits that were cut off come back as 0
+    bit_array.resize(20)
+    assert bit_array.count() == 5
+    assert bit_array.copy().count() == 5
+
+    with pytest.raises(ValueError):
+        bit_array.resize(-1)
+
+
+def test_resize_with_live_view():
+    bit_array = BitArray(8, growable=True)
+    with bit_array.view(0, 8):
+        with pytest.raises(BufferError):
+            bit_array.resize(10_000)
+    bit_array.resize(10_000)
+    assert len(bit_array) == 10_000
+
+
+def test_not_growable(filled_bit_array: BitArray):
+    with pytest.raises(ValueError):
+        filled_bit_array.append(1)
+
+    with pytest.raises(ValueError):
+        filled_bit_array.resize(20)
+
+    with pytest.raises(IndexError):
+        filled_bit_array.set_many([10])
+
+
+def test_pickle_growable():
+    bit_array = BitArray(0, growable=True)
+    bit_array.extend([1, 1, 0])
+    clone = pickle.loads(pickle.dumps(bit_array))
+    assert clone == bit_array
+    clone.append(1)
+    assert len(clone) == 4
+
+
+@pytest.mark.parametrize("protocol", [2, pickle.HIGHEST_PROTOCOL])
+def test_pickle_growable_empty(protocol):
+    bit_array = BitArray(0, growable=True)
+    clone = pickle.loads(pickle.dumps(bit_array, protocol=protocol))
+    assert len(clone) == 0
+    clone.append(1)
+    assert list(clone) == [1]
+    assert len(copy.deepcopy(bit_array)) == 0
@@ -0,0 +1,102 @@
+import pickle
+import pytest
+from src import BitArray
+from src import BlockedBloomFilter
+from src import BloomFilter
+
+
+@pytest.fixture
+def blocked():
+    return BlockedBloomFilter(10_000, fp_rate=0.01)
+
+
+def test_size_is_whole_blocks(blocked: BlockedBloomFilter):
+    classic = BloomFilter(10_000, fp_rate=0.01)
+    assert len(blocked._bit_array) % 512 == 0
+    assert 0 <= len(blocked._bit_array) - len(classic._bit_array) < 512
+
+
+def test_put_contains(blocked: BlockedBloomFilter):
+    blocked.put("hello")
+    assert "hello" in blocked
+    assert "world" not in blocked
+
+
+def test_one_block_per_item(blocked: BlockedBloomFilter):
+    for item in ("hello", 42, (1, 2)):
+        indexes = blocked._indexes(item)
+        assert len(indexes) == blocked._num_hashes
+        assert len({i // 512 for i in indexes}) == 1
+
+
+def test_hasher_pickles_without_bits(blocked: BlockedBloomFilter):
+    hasher = blocked._hasher()
+    assert len(pickle.dumps(hasher)) < 1000
+    clone = pickle.loads(pickle.dumps(hasher))
+    items = ["hello", 42, (1, 2)]
+    assert clone(items) == blocked._indexes_many(items)
+
+
+def test_many_matches_single(blocked: BlockedBloomFilter):
+    blocked.put_many(range(500))
+    single = BlockedBloomFilter(10_000, fp_rate=0.01)
+    for i in range(500):
+        single.put(i)
+    assert blocked._bit_array == single._bit_array
+    assert blocked.may_contain_many(range(1000)) == [
+        blocked.may_contain(i) for i in range(1000)
+    ]
+
+
+def test_many_numpy(blocked: BlockedBloomFilter):
+    np = pytest.importorskip("numpy")
+    blocked.put_many(np.arange(100))
+    assert all(blocked.may_contain(i) for i in range(100))
+    assert blocked.may_contain_many(np.arange(100)) == [True] * 100
+
+    with pytest.raises(TypeError):
+        blocked.put_many(np.array([1.5]))
+
+
+def test_fpp(blocked: BlockedBloomFilter):
+    blocked.put_many(f"key-{i}" for i in range(10_000))
+    measured = sum(f"miss-{i}" in blocked for i in range(20_000)) / 20_000
+    expected = blocked.expected_fpp()
+    assert 0.01 < expected < 0.015
+    assert measured < 2 * expected
+
+
+@pytest.mark.parametrize("fp_rate", [0.5, 0.75, 0.9])
+def test_expected_fpp_high_rates(fp_rate):
+    # Hundreds of items per block, where exp(-mean) underflows
+    blocked = BlockedBloomFilter(10_000, fp_rate)
+    blocked.put_many(range(10_000))
+    found = blocked.may_contain_many(str(i) for i in range(10_000))
+    measured = sum(found) / len(found)
+    assert blocked.expected_fpp() == pytest.approx(measured, abs=0.05)
+
+
+def test_not_compatible_with_classic(blocked: BlockedBloomFilter):
+    classic = BloomFilter(10_000, fp_rate=0.01)
+    classic._bit_array = BitArray(len(blocked._bit_array))
+    with pytest.raises(ValueError):
+        blocked.put_all(classic)
+
+    other = BlockedBloomFilter(10_000, fp_rate=0.01)
+    other.put("hello")
+    blocked.put_all(other)
+    assert "hello" in blocked
+
+
+def test_save_load(blocked: BlockedBloomFilter, tmp_path):
+    path = tmp_path / "blocked.bf"
+    blocked.put_many(range(100))
+    blocked.save(path)
+
+    loaded = BlockedBloomFilter.load(path)
+    assert all(loaded.may_contain_many(range(100)))
+    with BlockedBloomFilter.load(path, mmap=True) as mapped:
+        assert all(i in mapped for i in range(100))
+
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
@@ -0,0 +1,142 @@
+import pytest
+from src import BloomCache
+from src import BloomFilter
+from src import CacheInfo
+
+
+class Store:
+    def __init__(self, data):
+        self.data = data
+        self.lookups = 0
+        self.batches = 0
+
+    def get(self, key):
+        self.lookups += 1
+        return self.data[key]
+
+    def get_many(self, keys):
+        self.batches += 1
+        return {key: self.data[key] for key in keys if key in self.data}
+
+
+@pytest.fixture
+def store():
+    return Store({f"key-{i}": i for i in range(1000)})
+
+
+@pytest.fixture
+def bloom(store: Store):
+    bloom = BloomFilter(1000, fp_rate=0.01)
+    bloom.put_many(store.data)
+    return bloom
+
+
+def test_bad_init(bloom: BloomFilter):
+    with pytest.raises(TypeError):
+        BloomCache(42, bloom)
+
+    with pytest.raises(ValueError):
+        BloomCache({}, bloom, maxsize=-1)
+
+    with pytest.raises(ValueError):
+        BloomCache({}, bloom, ttl=0)
+
+
+def test_get(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom)
+    assert cache.get("key-1") == 1
+    assert cache["key-1"] == 1
+    assert store.lookups == 1
+
+    assert cache.get("absent", "default") == "default"
+    with pytest.raises(KeyError):
+        cache["absent"]
+
+    info = cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.filtered + info.false_positives == 2
+    assert info.currsize == 1
+
+
+def test_mapping_store(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.data, bloom)
+    assert cache.get("key-5") == 5
+    assert cache.get("key-5000") is None
+
+
+def test_filter_saves_lookups(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom)
+    for i in range(10_000):
+        cache.get(f"absent-{i}")
+
+    info = cache.cache_info()
+    assert info.filtered + info.false_positives == 10_000
+    assert info.false_positives == store.lookups
+    assert info.false_positives < 10_000 * 0.03
+
+
+def test_lru_eviction(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom, maxsize=2)
+    cache.get("key-1")
+    cache.get("key-2")
+    cache.get("key-1")
+    cache.get("key-3")
+    assert len(cache) == 2
+    # key-2 was least recently used
+    cache.get("key-2")
+    assert store.lookups == 4
+    cache.get("key-3")
+    assert store.lookups == 4
+
+
+def test_ttl(store: Store, bloom: BloomFilter):
+    now = [0.0]
+    cache = BloomCache(store.get, bloom, ttl=10, timer=lambda: now[0])
+    cache.get("key-1")
+    now[0] = 9.9
+    cache.get("key-1")
+    assert store.lookups == 1
+
+    now[0] = 10
+    cache.get("key-1")
+    assert store.lookups == 2
+
+
+def test_get_many(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom, fetch_many=store.get_many)
+    cache.get("key-1")
+    keys = ["key-1", "key-2", "key-3", "key-2", "absent-1", "absent-2"]
+    assert cache.get_many(keys) == {"key-1": 1, "key-2": 2, "key-3": 3}
+    assert store.batches == 1
+    assert store.lookups == 1
+
+    assert cache.get_many(["key-2", "key-3"]) == {"key-2": 2, "key-3": 3}
+    assert store.batches == 1
+
+    info = cache.cache_info()
+    assert info == CacheInfo(
+        hits=3,
+        filtered=info.filtered,
+        misses=3 + info.false_positives,
+        false_positives=info.false_positives,
+        maxsize=1024,
+        currsize=3,
+    )
+
+
+def test_get_many_without_batch(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom)
+    assert cache.get_many(["key-1", "absent"]) == {"key-1": 1}
+
+
+def test_put_invalidate(store: Store, bloom: BloomFilter):
+    cache = BloomCache(store.get, bloom)
+    store.data["new"] = "value"
+    cache.put("new", "value")
+    assert cache.get("new") == "value"
+    assert store.lookups == 0
+
+    store.data["new"] = "changed"
+    cache.invalidate("new")
+    assert cache.get("new") == "changed"
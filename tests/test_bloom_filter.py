@@ -1,6 +1,17 @@
+import asyncio
+import os
+import queue
 import random
+import subprocess
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+from src import Blake2bHashStrategy
+from src import BlockedBloomFilter
 from src import BloomFilter
+import bloom_filter
 
 
 @pytest.fixture
@@ -88,6 +99,55 @@ def test_bad_put_all(inserted_filter: BloomFilter):
         inserted_filter.put_all(inserted_filter)
 
 
+def test_bad_hash_strategy():
+    with pytest.raises(TypeError):
+        BloomFilter(1_000, hash_strategy=hash)
+
+
+def test_many_hash_functions():
+    # Needs more than the 12 hash functions the filter used to be limited to
+    bloom = BloomFilter(1_000, fp_rate=1e-6)
+    assert bloom._num_hashes == 20
+    bloom.put("hello")
+    assert "hello" in bloom
+    assert pytest.approx(bloom.expected_fpp(), rel=0.1) == 1e-6
+
+
+def test_seeded_filters_are_incompatible():
+    a = BloomFilter(1_000, hash_strategy=Blake2bHashStrategy(seed=1))
+    b = BloomFilter(1_000, hash_strategy=Blake2bHashStrategy(seed=2))
+    c = BloomFilter(1_000, hash_strategy=Blake2bHashStrategy(seed=1))
+    a.put("hello")
+    c.put_all(a)
+    assert "hello" in c
+
+    with pytest.raises(ValueError):
+        b.put_all(a)
+
+
+def test_buckets_stable_across_processes():
+    script = (
+        "from src import BloomFilter; "
+        "print(BloomFilter(1_000)._indexes(('hello', 1, b'x')))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.pathsep.join([root, os.path.join(root, "src")])
+    outputs = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=path)
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=root,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        outputs.add(result.stdout)
+    assert len(outputs) == 1
+    assert outputs == {f"{BloomFilter(1_000)._indexes(('hello', 1, b'x'))}\n"}
+
+
 def test_in(inserted_filter: BloomFilter):
     assert "world" in inserted_filter
 
@@ -127,3 +187,265 @@ def test_false_positive_estimation_accuracy():
         pytest.approx(measured_fp_rate, abs=(error_rate / 10))
         == bloom.expected_fpp()
     )
+
+
+def test_put_many(empty_filter: BloomFilter):
+    empty_filter.put_many(f"key-{i}" for i in range(100))
+    for i in range(100):
+        assert f"key-{i}" in empty_filter
+
+    one_by_one = BloomFilter(10_000, fp_rate=0.01)
+    for i in range(100):
+        one_by_one.put(f"key-{i}")
+    assert one_by_one._bit_array == empty_filter._bit_array
+
+
+def test_may_contain_many(inserted_filter: BloomFilter):
+    items = ["hello", "nope", "world", 42]
+    assert inserted_filter.may_contain_many(items) == [
+        inserted_filter.may_contain(item) for item in items
+    ]
+    assert inserted_filter.may_contain_many(["hello", "world"]) == [True, True]
+    assert inserted_filter.may_contain_many([]) == []
+
+
+def test_many_numpy(empty_filter: BloomFilter):
+    np = pytest.importorskip("numpy")
+    keys = np.arange(500, dtype=np.int64)
+    empty_filter.put_many(keys)
+    # Same buckets as plain ints
+    assert all(i in empty_filter for i in range(500))
+    assert empty_filter.may_contain_many(keys) == [True] * 500
+    assert empty_filter.may_contain_many(np.array([10**9])) == [
+        empty_filter.may_contain(10**9)
+    ]
+
+    with pytest.raises(TypeError):
+        empty_filter.put_many(np.array([1.5]))
+
+
+def test_many_bounded_memory(empty_filter: BloomFilter, monkeypatch):
+    monkeypatch.setattr(bloom_filter, "_BATCH_SIZE", 1000)
+    tracemalloc.start()
+    try:
+        # 20000 items, 140000 indexes: about 5 MB if hashed all at once
+        empty_filter.put_many(str(i) for i in range(20_000))
+        _, put_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        found = empty_filter.may_contain_many(str(i) for i in range(20_000))
+        _, query_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert all(found)
+    assert put_peak < 1_000_000
+    # Only the list of results grows with the input
+    assert query_peak < 1_500_000
+
+
+def test_numpy_scalars(empty_filter: BloomFilter):
+    np = pytest.importorskip("numpy")
+    empty_filter.put(np.int64(5))
+    empty_filter.put(7)
+    assert empty_filter.may_contain(5)
+    assert empty_filter.may_contain(np.int32(7))
+
+
+def test_save_load(inserted_filter: BloomFilter, tmp_path):
+    path = tmp_path / "filter.bf"
+    inserted_filter.save(path)
+    loaded = BloomFilter.load(path)
+
+    assert "hello" in loaded and "world" in loaded
+    assert loaded._bit_array == inserted_filter._bit_array
+    assert loaded._num_hashes == inserted_filter._num_hashes
+    assert loaded._insertions == 2
+    assert loaded.expected_fpp() == inserted_filter.expected_fpp()
+    assert loaded._is_compatible(inserted_filter)
+
+    loaded.put("again")
+    assert "again" in loaded
+
+
+def test_save_load_seeded(tmp_path):
+    path = tmp_path / "filter.bf"
+    f = BloomFilter(1000, hash_strategy=Blake2bHashStrategy(seed=7))
+    f.put_many(range(100))
+    f.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert loaded._hash_strategy == Blake2bHashStrategy(seed=7)
+    assert loaded._insertions == 100
+    assert all(loaded.may_contain_many(range(100)))
+
+
+def test_load_mmap(inserted_filter: BloomFilter, tmp_path):
+    path = tmp_path / "filter.bf"
+    inserted_filter.save(path)
+
+    with BloomFilter.load(path, mmap=True) as loaded:
+        assert "hello" in loaded and "world" in loaded
+        assert loaded._bit_array == inserted_filter._bit_array
+        with pytest.raises(TypeError):
+            loaded.put("read-only")
+    assert loaded._bit_array.closed
+
+
+def test_load_corrupt(inserted_filter: BloomFilter, tmp_path):
+    path = tmp_path / "filter.bf"
+    inserted_filter.save(path)
+    data = bytearray(path.read_bytes())
+
+    data[-1] ^= 0xFF
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
+    # Not checked by default when memory-mapping
+    BloomFilter.load(path, mmap=True).close()
+    with pytest.raises(ValueError):
+        BloomFilter.load(path, mmap=True, verify=True)
+
+    data[-1] ^= 0xFF
+    data[10] ^= 0xFF
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        BloomFilter.load(path, mmap=True)
+
+    path.write_bytes(b"not a bloom filter")
+    with pytest.raises(ValueError):
+        BloomFilter.load(path)
+
+
+def test_build_parallel():
+    bloom = BloomFilter.build_parallel(
+        range(10_000), 10_000, 0.01, workers=3, chunk_size=1000
+    )
+    sequential = BloomFilter(10_000, 0.01)
+    sequential.put_many(range(10_000))
+    assert bloom._bit_array == sequential._bit_array
+    assert bloom._insertions == 10_000
+
+
+def test_build_parallel_files(tmp_path):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"keys-{i}.txt"
+        path.write_text("".join(f"key-{j}\n" for j in range(i, 1000, 4)))
+        paths.append(path)
+
+    bloom = BloomFilter.build_parallel(paths, 1000, 0.01, workers=2, files=True)
+    assert all(f"key-{j}" in bloom for j in range(1000))
+    assert bloom._insertions == 1000
+
+
+def test_build_worker_reads_files_in_chunks(tmp_path):
+    class Recording(BloomFilter):
+        batches = []
+
+        def put_many(self, items):
+            items = list(items)
+            self.batches.append(len(items))
+            super().put_many(items)
+
+    path = tmp_path / "keys.txt"
+    path.write_text("".join(f"key-{j}\n" for j in range(250)))
+    tasks = queue.Queue()
+    tasks.put(str(path))
+    tasks.put(None)
+    results = queue.Queue()
+    bloom_filter._build_worker(
+        Recording, (1000, 0.01), {}, True, 100, tasks, results
+    )
+
+    bloom = results.get_nowait()
+    assert Recording.batches == [100, 100, 50]
+    assert "key-249" in bloom and bloom._insertions == 250
+
+
+def test_build_parallel_errors():
+    with pytest.raises(ValueError):
+        BloomFilter.build_parallel(range(10), -1)
+
+    # Lists are not hashable, the worker's TypeError is raised here
+    with pytest.raises(TypeError):
+        BloomFilter.build_parallel([[1, 2]], 100, workers=2)
+
+
+def test_approximate_count(empty_filter: BloomFilter):
+    assert empty_filter.approximate_count() == 0
+    assert empty_filter.current_fpp() == 0
+
+    empty_filter.put_many(range(5000))
+    # Duplicates do not count
+    empty_filter.put_many(range(1000))
+    assert empty_filter.approximate_count() == pytest.approx(5000, rel=0.05)
+    assert empty_filter.current_fpp() < empty_filter.expected_fpp()
+
+    empty_filter.put_many(range(5000, 10_000))
+    assert empty_filter.approximate_count() == pytest.approx(10_000, rel=0.05)
+    assert empty_filter.current_fpp() == pytest.approx(0.01, rel=0.2)
+
+    empty_filter._bit_array.fill(1)
+    assert empty_filter.approximate_count() == float("inf")
+    assert empty_filter.current_fpp() == 1
+
+
+def test_estimate_union_intersection(empty_filter: BloomFilter):
+    other = BloomFilter(10_000, fp_rate=0.01)
+    empty_filter.put_many(range(4000))
+    other.put_many(range(3000, 6000))
+
+    assert empty_filter.estimate_union_size(other) == pytest.approx(
+        6000, rel=0.05
+    )
+    assert empty_filter.estimate_intersection_size(other) == pytest.approx(
+        1000, rel=0.2
+    )
+
+    with pytest.raises(ValueError):
+        empty_filter.estimate_union_size(BloomFilter(100))
+
+
+async def agen(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+def test_aput_stream(empty_filter: BloomFilter):
+    asyncio.run(empty_filter.aput_stream(agen(range(1000)), batch_size=64))
+    assert all(empty_filter.may_contain_many(range(1000)))
+    assert empty_filter._insertions == 1000
+
+
+def test_afilter_new(empty_filter: BloomFilter):
+    empty_filter.put_many(range(0, 100, 2))
+
+    async def collect():
+        stream = agen([1, 2, 3, 3, 4, 5, 1, 101, 101])
+        return [x async for x in empty_filter.afilter_new(stream, batch_size=4)]
+
+    assert asyncio.run(collect()) == [1, 3, 5, 101]
+    assert 101 in empty_filter
+
+
+@pytest.mark.parametrize("cls", [BloomFilter, BlockedBloomFilter])
+@pytest.mark.parametrize("pool", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_async_executor(cls, pool):
+    # Process pools hash copies: the bits must still land in this filter
+    empty_filter = cls(10_000, fp_rate=0.01)
+
+    async def run(executor):
+        await empty_filter.aput_stream(agen(range(500)), executor=executor)
+        new = empty_filter.afilter_new(agen(range(1000)), executor=executor)
+        return [x async for x in new]
+
+    with pool(1) as executor:
+        new = asyncio.run(run(executor))
+    assert all(i in empty_filter for i in range(1000))
+    assert len(new) > 450
+    assert all(x >= 500 for x in new)
+
+
+def test_sizeof(empty_filter: BloomFilter):
+    bits = len(empty_filter._bit_array)
+    assert bits / 8 < sys.getsizeof(empty_filter) < bits / 8 + 2000
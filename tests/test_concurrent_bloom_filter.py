@@ -0,0 +1,69 @@
+import threading
+import pytest
+from src import BloomFilter
+from src import ConcurrentBloomFilter
+from src import LockedBitArray
+
+
+THREADS = 4
+
+
+@pytest.fixture
+def concurrent():
+    return ConcurrentBloomFilter(20_000, fp_rate=0.01)
+
+
+def test_same_as_bloom_filter(concurrent: ConcurrentBloomFilter):
+    assert isinstance(concurrent._bit_array, LockedBitArray)
+    bloom = BloomFilter(20_000, fp_rate=0.01)
+    concurrent.put_many(range(1000))
+    bloom.put_many(range(1000))
+    assert concurrent._bit_array == bloom._bit_array
+    assert concurrent._is_compatible(bloom)
+
+
+def test_concurrent_put_and_query(concurrent: ConcurrentBloomFilter):
+    errors = []
+
+    def put(thread: int):
+        for i in range(thread, 20_000, THREADS):
+            concurrent.put(i)
+            if i not in concurrent:
+                errors.append(i)
+
+    def query():
+        # Runs alongside the writers, without locks
+        while any(t.is_alive() for t in writers):
+            concurrent.may_contain_many(range(0, 20_000, 97))
+
+    writers = [threading.Thread(target=put, args=(t,)) for t in range(THREADS)]
+    reader = threading.Thread(target=query)
+    for thread in writers:
+        thread.start()
+    reader.start()
+    for thread in writers:
+        thread.join()
+    reader.join()
+
+    assert not errors
+    assert all(concurrent.may_contain_many(range(20_000)))
+
+
+def test_load(concurrent: ConcurrentBloomFilter, tmp_path):
+    path = tmp_path / "concurrent.bf"
+    concurrent.put("hello")
+    concurrent.save(path)
+
+    loaded = ConcurrentBloomFilter.load(path)
+    assert isinstance(loaded._bit_array, LockedBitArray)
+    assert "hello" in loaded
+
+    with ConcurrentBloomFilter.load(path, mmap=True) as mapped:
+        assert "hello" in mapped
+
+
+def test_build_parallel():
+    bloom = ConcurrentBloomFilter.build_parallel(range(1000), 1000, workers=2)
+    assert isinstance(bloom, ConcurrentBloomFilter)
+    assert isinstance(bloom._bit_array, LockedBitArray)
+    assert all(bloom.may_contain_many(range(1000)))
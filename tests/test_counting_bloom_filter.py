@@ -0,0 +1,108 @@
+import sys
+import pytest
+from src import BloomFilter
+from src import CountingBloomFilter
+
+
+@pytest.fixture
+def counting():
+    return CountingBloomFilter(1000, fp_rate=0.01)
+
+
+def test_bad_init():
+    with pytest.raises(TypeError):
+        CountingBloomFilter("hello")
+
+    with pytest.raises(ValueError):
+        CountingBloomFilter(0)
+
+    with pytest.raises(ValueError):
+        CountingBloomFilter(1000, fp_rate=1)
+
+    with pytest.raises(TypeError):
+        CountingBloomFilter(1000, hash_strategy="md5")
+
+
+@pytest.mark.parametrize("n, p", [(1, 0.5), (1000, 0.01), (12_345, 0.001)])
+def test_sized_like_bloom_filter(n, p):
+    counting = CountingBloomFilter(n, p)
+    bloom = BloomFilter(n, p)
+    assert counting._size == len(bloom._bit_array)
+    assert counting._num_hashes == bloom._num_hashes
+    assert counting.expected_fpp() == bloom.expected_fpp()
+
+
+def test_put_remove(counting: CountingBloomFilter):
+    counting.put("hello")
+    counting.put("world")
+    assert "hello" in counting and "world" in counting
+
+    counting.remove("hello")
+    assert "hello" not in counting
+    assert "world" in counting
+
+    with pytest.raises(ValueError):
+        counting.remove("hello")
+
+
+def test_rolling_window(counting: CountingBloomFilter):
+    for i in range(10_000):
+        counting.put(i)
+        if i >= 500:
+            counting.remove(i - 500)
+
+    assert all(i in counting for i in range(9500, 10_000))
+    false_positives = sum(i in counting for i in range(9000))
+    assert false_positives < 9000 * 0.03
+
+
+def test_count_estimate(counting: CountingBloomFilter):
+    assert counting.count_estimate("hello") == 0
+    for _ in range(3):
+        counting.put("hello")
+    assert counting.count_estimate("hello") >= 3
+
+    counting.remove("hello")
+    assert counting.count_estimate("hello") >= 2
+
+
+def test_saturates(counting: CountingBloomFilter):
+    for _ in range(20):
+        counting.put("hello")
+    assert counting.count_estimate("hello") == 15
+
+    # Saturated counters stick, so the item is never lost
+    for _ in range(20):
+        counting.remove("hello")
+    assert "hello" in counting
+
+
+def test_put_all(counting: CountingBloomFilter):
+    other = CountingBloomFilter(1000, fp_rate=0.01)
+    counting.put_many(range(100))
+    other.put_many(range(50, 150))
+    for _ in range(15):
+        other.put("many")
+
+    counting.put_all(other)
+    assert all(i in counting for i in range(150))
+    assert counting.count_estimate(75) >= 2
+    assert counting.count_estimate("many") == 15
+
+    for i in range(150):
+        counting.remove(i)
+    assert 25 not in counting
+    assert 75 in counting
+
+    with pytest.raises(ValueError):
+        counting.put_all(CountingBloomFilter(10, fp_rate=0.01))
+
+    with pytest.raises(ValueError):
+        counting.put_all(counting)
+
+
+def test_memory():
+    counting = CountingBloomFilter(100_000, fp_rate=0.01)
+    bloom = BloomFilter(100_000, fp_rate=0.01)
+    ratio = sys.getsizeof(counting) / sys.getsizeof(bloom._bit_array)
+    assert 3.9 < ratio < 4.1
@@ -0,0 +1,75 @@
+import sys
+import pytest
+from src import CuckooFilter
+
+
+@pytest.fixture
+def cuckoo():
+    return CuckooFilter(10_000)
+
+
+def test_bad_init():
+    with pytest.raises(TypeError):
+        CuckooFilter("hello")
+
+    with pytest.raises(ValueError):
+        CuckooFilter(0)
+
+    with pytest.raises(ValueError):
+        CuckooFilter(100, fingerprint_bits=12)
+
+    with pytest.raises(TypeError):
+        CuckooFilter(100, hash_strategy="md5")
+
+
+def test_put_remove(cuckoo: CuckooFilter):
+    assert cuckoo.put("hello")
+    assert cuckoo.put("world")
+    assert "hello" in cuckoo and len(cuckoo) == 2
+
+    cuckoo.remove("hello")
+    assert "hello" not in cuckoo
+    assert "world" in cuckoo
+    assert len(cuckoo) == 1
+
+    with pytest.raises(ValueError):
+        cuckoo.remove("hello")
+
+
+def test_duplicates(cuckoo: CuckooFilter):
+    cuckoo.put("hello")
+    cuckoo.put("hello")
+    cuckoo.remove("hello")
+    assert "hello" in cuckoo
+    cuckoo.remove("hello")
+    assert "hello" not in cuckoo
+
+
+def test_fills_up():
+    cuckoo = CuckooFilter(1000, fingerprint_bits=8)
+    i = 0
+    while cuckoo.put(i):
+        i += 1
+    # Full only at a high load factor, and nothing was lost
+    assert i > 0.9 * cuckoo.capacity
+    assert all(j in cuckoo for j in range(i))
+    assert not cuckoo.put("more")
+
+    for j in range(i):
+        cuckoo.remove(j)
+    assert len(cuckoo) == 0
+    assert not any(cuckoo._slots)
+    assert cuckoo.put("more")
+
+
+def test_fpp(cuckoo: CuckooFilter):
+    for i in range(10_000):
+        cuckoo.put(i)
+    false_positives = sum(f"miss-{i}" in cuckoo for i in range(100_000))
+    assert false_positives / 100_000 < cuckoo.expected_fpp()
+
+
+def test_size(cuckoo: CuckooFilter):
+    # A power of 2 number of buckets, 16 bits per slot
+    assert cuckoo.capacity == 16_384
+    assert sys.getsizeof(cuckoo) < 16_384 * 2 + 200
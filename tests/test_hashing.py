@@ -0,0 +1,89 @@
+from fractions import Fraction
+import pytest
+from src import Blake2bHashStrategy
+from src import BloomFilter
+from src import HashStrategy
+from src import Murmur3HashStrategy
+from src import canonical_bytes
+
+
+def test_canonical_bytes_distinguishes_types():
+    encodings = [
+        canonical_bytes(x) for x in (1, "1", b"1", 1.5, None, (1,), frozenset())
+    ]
+    assert len(set(encodings)) == len(encodings)
+
+
+def test_canonical_bytes_follows_equality():
+    assert canonical_bytes(1) == canonical_bytes(True) == canonical_bytes(1.0)
+    assert canonical_bytes(b"ab") == canonical_bytes(bytearray(b"ab"))
+    assert canonical_bytes(frozenset([1, "a"])) == canonical_bytes(
+        frozenset(["a", 1])
+    )
+    assert canonical_bytes(("a", "bc")) != canonical_bytes(("ab", "c"))
+
+
+def test_canonical_bytes_other_numbers():
+    assert canonical_bytes(Fraction(1, 2)) == canonical_bytes(0.5)
+    assert canonical_bytes(Fraction(4, 2)) == canonical_bytes(2)
+    np = pytest.importorskip("numpy")
+    assert canonical_bytes(np.int64(5)) == canonical_bytes(5)
+    assert canonical_bytes(np.uint8(3)) == canonical_bytes(3.0)
+    assert canonical_bytes(np.float32(0.5)) == canonical_bytes(0.5)
+
+
+def test_canonical_bytes_large_and_negative_ints():
+    assert canonical_bytes(-1) != canonical_bytes(255)
+    assert canonical_bytes(1 << 200) != canonical_bytes(1 << 201)
+
+
+def test_indexes():
+    strategy = Blake2bHashStrategy()
+    indexes = strategy.indexes("hello", 30, 1_000)
+    assert len(indexes) == 30
+    assert all(0 <= i < 1_000 for i in indexes)
+    assert indexes == Blake2bHashStrategy().indexes("hello", 30, 1_000)
+
+
+def test_seeds():
+    assert Blake2bHashStrategy(1) != Blake2bHashStrategy(2)
+    assert Blake2bHashStrategy(1) == Blake2bHashStrategy(1)
+    assert Blake2bHashStrategy(1).hash128("x") != (
+        Blake2bHashStrategy(2).hash128("x")
+    )
+
+    with pytest.raises(ValueError):
+        Blake2bHashStrategy(-1)
+
+    with pytest.raises(TypeError):
+        Blake2bHashStrategy("seed")
+
+
+def test_known_value():
+    # Changing this value breaks every filter saved or shared so far
+    assert Blake2bHashStrategy().hash128("hello") == int.from_bytes(
+        bytes.fromhex("8119150e858d7482d891bba7d3f36f4b"), "little"
+    )
+
+
+def test_murmur3():
+    pytest.importorskip("mmh3")
+    strategy = Murmur3HashStrategy(7)
+    assert strategy != Blake2bHashStrategy(7)
+    assert strategy.indexes("a", 5, 100) == Murmur3HashStrategy(7).indexes(
+        "a", 5, 100
+    )
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        HashStrategy()
+    with pytest.raises(TypeError):
+        BloomFilter(100, hash_strategy=HashStrategy())
+
+
+def test_from_name():
+    assert HashStrategy.from_name("blake2b", 3) == Blake2bHashStrategy(3)
+
+    with pytest.raises(ValueError):
+        HashStrategy.from_name("md5")
@@ -0,0 +1,198 @@
+import random
+import pytest
+from src import IndexedUniqueList
+import indexed_unique_list
+
+
+@pytest.fixture
+def unique():
+    u = IndexedUniqueList()
+    u.append("hello")
+    u.append("world")
+    return u
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Splits and merges after a handful of items instead of hundreds
+    monkeypatch.setattr(indexed_unique_list, "_LOAD", 4)
+
+
+def test_get_at(unique: IndexedUniqueList):
+    assert unique[0] == "hello"
+    assert unique[-1] == "world"
+    with pytest.raises(IndexError):
+        unique[2]
+
+
+def test_set_at(unique: IndexedUniqueList):
+    unique[0] = "yes"
+    assert list(unique) == ["yes", "world"]
+    assert "hello" not in unique
+    with pytest.raises(ValueError):
+        unique[0] = "world"
+
+
+def test_strict(unique: IndexedUniqueList):
+    unique.append("hello")
+    unique.insert(0, "world")
+    assert len(unique) == 2
+    with pytest.raises(ValueError):
+        unique.append("hello", strict=True)
+    with pytest.raises(ValueError):
+        unique.insert(0, "world", strict=True)
+
+
+def test_index(unique: IndexedUniqueList):
+    assert unique.index("world") == 1
+    with pytest.raises(ValueError):
+        unique.index("blasphemy")
+    with pytest.raises(ValueError):
+        unique.index("world", 0, 1)
+
+
+def test_remove(unique: IndexedUniqueList):
+    unique.remove("hello")
+    assert list(unique) == ["world"]
+    with pytest.raises(ValueError):
+        unique.remove("hello")
+
+
+def test_pop(unique: IndexedUniqueList):
+    assert unique.pop(0) == "hello"
+    assert unique.pop() == "world"
+    assert not unique
+    with pytest.raises(IndexError):
+        unique.pop()
+
+
+def test_slice_and_repr(unique: IndexedUniqueList):
+    assert unique[::-1] == ["world", "hello"]
+    assert repr(unique) == "IndexedUniqueList(['hello', 'world'])"
+
+
+def test_reverse(small_blocks):
+    unique = IndexedUniqueList(range(20))
+    unique.reverse()
+    assert list(unique) == list(range(19, -1, -1))
+    assert list(reversed(unique)) == list(range(20))
+    assert unique.index(0) == 19
+
+
+def test_matches_list(small_blocks):
+    rng = random.Random(7)
+    unique = IndexedUniqueList()
+    expected = []
+    for n in range(3000):
+        op = rng.random()
+        if op < 0.4 or not expected:
+            i = rng.randint(-len(expected) - 2, len(expected) + 2)
+            unique.insert(i, n)
+            expected.insert(i, n)
+        elif op < 0.6:
+            item = rng.choice(expected)
+            unique.remove(item)
+            expected.remove(item)
+        elif op < 0.8:
+            i = rng.randrange(-len(expected), len(expected))
+            del unique[i]
+            del expected[i]
+        else:
+            item = rng.choice(expected)
+            assert unique.index(item) == expected.index(item)
+            i = rng.randrange(len(expected))
+            assert unique[i] == expected[i]
+        assert len(unique) == len(expected)
+    assert list(unique) == expected
+    assert all(unique.index(item) == i for i, item in enumerate(expected))
+
+
+def test_clear(unique: IndexedUniqueList):
+    unique.clear()
+    assert len(unique) == 0
+    unique.append("again")
+    assert list(unique) == ["again"]
+
+
+def test_extend(small_blocks):
+    unique = IndexedUniqueList([3, 1])
+    unique.extend(range(20))
+    unique.extend([5, 20, 20, 21])
+    assert list(unique) == [3, 1, 0, 2] + list(range(4, 22))
+    assert unique.index(21) == 21
+    with pytest.raises(ValueError):
+        unique.extend([30, 31, 1], strict=True)
+    with pytest.raises(ValueError):
+        unique.extend([30, 30], strict=True)
+    assert 30 not in unique
+
+
+@pytest.mark.parametrize(
+    "key", [slice(3, 9), slice(None, None, -3), slice(-2, 50)]
+)
+def test_get_slice(small_blocks, key):
+    unique = IndexedUniqueList(range(30))
+    assert unique[key] == list(range(30))[key]
+    assert IndexedUniqueList()[key] == []
+
+
+def test_delete_slice(small_blocks):
+    rng = random.Random(11)
+    unique = IndexedUniqueList(range(200))
+    expected = list(range(200))
+    for _ in range(30):
+        a, b = sorted(rng.randrange(len(expected) + 1) for _ in range(2))
+        key = slice(a, b, rng.choice([1, 1, 2, -3]))
+        del unique[key]
+        del expected[key]
+        assert list(unique) == expected
+        assert all(unique.index(x) == i for i, x in enumerate(expected))
+
+
+def test_set_slice(small_blocks):
+    unique = IndexedUniqueList(range(40))
+    expected = list(range(40))
+    for key, items in [
+        (slice(1, 3), ["a", "b", "c"]),
+        (slice(5, 30), ["d"]),
+        (slice(0, 2), ["a", 0]),
+        (slice(None, None, -4), list(range(100, 105))),
+        (slice(2, 2), list(range(200, 240))),
+    ]:
+        unique[key] = items
+        expected[key] = items
+        assert list(unique) == expected
+        assert all(unique.index(x) == i for i, x in enumerate(expected))
+
+
+def test_set_slice_invalid():
+    unique = IndexedUniqueList(range(5))
+    with pytest.raises(ValueError):
+        unique[:2] = [7, 7]
+    with pytest.raises(ValueError):
+        unique[:2] = [4]
+    with pytest.raises(ValueError):
+        unique[::2] = [7]
+    assert list(unique) == [0, 1, 2, 3, 4]
+    assert 7 not in unique
+
+
+@pytest.mark.parametrize("doomed", [[3, 17], list(range(0, 40, 3))])
+def test_remove_many(small_blocks, doomed):
+    unique = IndexedUniqueList(range(40))
+    unique.remove_many(doomed)
+    expected = [x for x in range(40) if x not in doomed]
+    assert list(unique) == expected
+    assert all(unique.index(x) == i for i, x in enumerate(expected))
+    with pytest.raises(ValueError):
+        unique.remove_many([1, 3])
+    assert 1 in unique
+
+
+def test_copy(small_blocks):
+    unique = IndexedUniqueList(range(20))
+    for item in unique.copy():
+        if item % 3:
+            unique.remove(item)
+    assert list(unique) == list(range(0, 20, 3))
+    assert unique.copy().index(18) == 6
@@ -0,0 +1,70 @@
+import pickle
+import threading
+import pytest
+from src import BitArray
+from src import LockedBitArray
+
+
+SIZE = 40_000
+THREADS = 4
+
+
+@pytest.fixture
+def locked():
+    return LockedBitArray(SIZE)
+
+
+def test_bad_init():
+    with pytest.raises(TypeError):
+        LockedBitArray(5.5)
+
+    with pytest.raises(ValueError):
+        LockedBitArray(0)
+
+    with pytest.raises(ValueError):
+        LockedBitArray(8, stripes=-1)
+
+
+def test_behaves_like_bit_array(locked: LockedBitArray):
+    locked[3] = 1
+    locked[-1] = 1
+    locked.setrange(100, 200)
+    locked.set_many([5, 6])
+    locked[300:308] = BitArray(8) | ~BitArray(8)
+    assert locked.count() == 112
+
+    other = BitArray(SIZE)
+    other[7] = 1
+    locked |= other
+    assert locked[7] == 1
+
+    unlocked = LockedBitArray(SIZE, stripes=0)
+    unlocked.set_many([1, 2])
+    unlocked[3] = 1
+    assert unlocked.count() == 3
+
+
+def test_concurrent_writes(locked: LockedBitArray):
+    def work(thread: int):
+        # Every thread writes into every byte
+        for start in range(thread, SIZE, THREADS * 100):
+            stop = min(start + THREADS * 100, SIZE)
+            locked.set_many(range(start, stop, THREADS))
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert locked.all()
+
+
+def test_pickle(locked: LockedBitArray):
+    locked.set_many([1, 500, SIZE - 1])
+    clone = pickle.loads(pickle.dumps(locked, protocol=5))
+    assert type(clone) is LockedBitArray
+    assert clone == locked
+    assert len(clone._locks) == len(locked._locks)
+
+    clone[2] = 1
+    assert locked[2] == 0
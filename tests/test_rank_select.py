@@ -0,0 +1,120 @@
+import random
+import pytest
+from src import BitArray
+from src import RankSelect
+
+
+def naive_rank(bit_array: BitArray, i: int) -> int:
+    return sum(bit_array.get_many(range(i)))
+
+
+@pytest.fixture
+def sparse():
+    bit_array = BitArray(200_003)
+    rng = random.Random(0)
+    for _ in range(2_000):
+        bit_array[rng.randrange(len(bit_array))] = 1
+    return bit_array
+
+
+def test_rank(sparse: BitArray):
+    directory = RankSelect(sparse)
+    for i in [0, 1, 511, 512, 513, 65_536, 100_000, 200_003]:
+        assert directory.rank(i) == naive_rank(sparse, i)
+
+    assert directory.rank(len(sparse)) == sparse.count()
+
+
+def test_select(sparse: BitArray):
+    directory = RankSelect(sparse)
+    ones = list(sparse.iter_ones())
+    assert directory.count() == len(ones)
+    for j in [0, 1, 100, len(ones) // 2, len(ones) - 1]:
+        assert directory.select(j) == ones[j]
+        assert directory.rank(ones[j]) == j
+
+
+def test_rank_select_dense():
+    # Many superblocks, every bit set
+    bit_array = BitArray(65_536 * 3)
+    bit_array.fill(1)
+    directory = RankSelect(bit_array)
+    for j in [0, 65_535, 65_536, 131_071, 65_536 * 3 - 1]:
+        assert directory.select(j) == j
+        assert directory.rank(j) == j
+
+
+def test_rank_select_empty():
+    directory = RankSelect(BitArray(512 * 128))
+    assert directory.rank(512 * 128) == 0
+    assert directory.count() == 0
+
+    with pytest.raises(IndexError):
+        directory.select(0)
+
+
+def test_incremental_rebuild(sparse: BitArray):
+    directory = RankSelect(sparse)
+    before = directory.rank(150_000)
+
+    directory[-1] = 1
+    directory[149_000] = 0
+    directory[149_001] = 1
+    assert directory[149_001] == 1
+    assert directory.rank(150_000) == naive_rank(sparse, 150_000)
+    assert directory.rank(len(sparse)) == sparse.count()
+    assert directory.select(directory.count() - 1) == len(sparse) - 1
+    assert before - 1 <= directory.rank(150_000) <= before + 1
+
+
+def test_invalidate(sparse: BitArray):
+    directory = RankSelect(sparse)
+    directory.rank(10)
+    sparse.setrange(1_000, 2_000)
+
+    directory.invalidate(1_000)
+    assert directory.rank(len(sparse)) == sparse.count()
+    assert directory.select(directory.rank(1_500)) == 1_500
+
+
+def test_bad_positions(sparse: BitArray):
+    directory = RankSelect(sparse)
+
+    with pytest.raises(IndexError):
+        directory.rank(-1)
+
+    with pytest.raises(IndexError):
+        directory.rank(len(sparse) + 1)
+
+    with pytest.raises(IndexError):
+        directory.select(directory.count())
+
+
+def test_ignores_padding_bits(tmp_path):
+    # A file written elsewhere may have set bits past the BitArray's size
+    path = tmp_path / "dirty.bits"
+    path.write_bytes(b"\xff\xff")
+    with BitArray.open(path, 10) as bit_array:
+        rs = RankSelect(bit_array)
+        assert rs.count() == 10
+        assert rs.rank(10) == 10
+        assert rs.select(9) == 9
+        with pytest.raises(IndexError):
+            rs.select(10)
+
+
+def test_growable():
+    rs = RankSelect(BitArray(10, growable=True))
+    rs[3] = 1
+    assert rs.count() == 1
+    rs[2000] = 1
+    assert len(rs) == 2001
+    assert rs.count() == 2
+    assert rs.rank(2001) == 2
+    assert rs.select(1) == 2000
+
+    bit_array = rs.bit_array
+    bit_array.extend([1] * 70_000)
+    rs.invalidate(2001)
+    assert rs.count() == 70_002
+    assert rs.select(70_001) == 72_000
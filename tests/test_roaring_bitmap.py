@@ -0,0 +1,127 @@
+import random
+import pytest
+from src import BitArray
+from src import RoaringBitmap
+
+
+SIZE = 1 << 20
+
+
+@pytest.fixture
+def sparse():
+    bitmap = RoaringBitmap(SIZE)
+    for i in (0, 5, 65_535, 65_536, SIZE - 1):
+        bitmap[i] = 1
+    return bitmap
+
+
+@pytest.fixture
+def dense():
+    # One chunk above the array container limit, one below it
+    bitmap = RoaringBitmap(SIZE)
+    for i in range(0, 20_000, 2):
+        bitmap[i] = 1
+    for i in range(70_000, 71_000):
+        bitmap[i] = 1
+    return bitmap
+
+
+def test_bad_init():
+    with pytest.raises(TypeError):
+        RoaringBitmap(5.5)
+
+    with pytest.raises(ValueError):
+        RoaringBitmap(0)
+
+
+def test_getitem_setitem(sparse: RoaringBitmap):
+    assert sparse[5] == 1
+    assert sparse[6] == 0
+    assert sparse[-1] == 1
+    sparse[5] = 0
+    assert sparse[5] == 0
+    assert sparse.count() == 4
+
+    with pytest.raises(IndexError):
+        sparse[SIZE]
+
+
+def test_container_conversion(dense: RoaringBitmap):
+    assert dense.count() == 11_000
+    for i in range(0, 20_000, 2):
+        dense[i] = 0
+    assert dense.count() == 1_000
+    assert list(dense.iter_ones()) == list(range(70_000, 71_000))
+
+
+def test_iter_ones(sparse: RoaringBitmap):
+    assert list(sparse.iter_ones()) == [0, 5, 65_535, 65_536, SIZE - 1]
+
+
+def test_operators_match_bit_array():
+    rng = random.Random(1)
+    a, b = RoaringBitmap(SIZE), RoaringBitmap(SIZE)
+    dense_a, dense_b = BitArray(SIZE), BitArray(SIZE)
+    for bitmap, bits, n in ((a, dense_a, 9_000), (b, dense_b, 300)):
+        for _ in range(n):
+            i = rng.randrange(200_000)
+            bitmap[i] = 1
+            bits[i] = 1
+    b.run_optimize()
+
+    for op in ("__and__", "__or__", "__xor__"):
+        expected = getattr(dense_a, op)(dense_b)
+        assert list(getattr(a, op)(b).iter_ones()) == list(expected.iter_ones())
+        assert list(getattr(b, op)(a).iter_ones()) == list(expected.iter_ones())
+
+
+def test_in_place_operators(sparse: RoaringBitmap, dense: RoaringBitmap):
+    original = sparse
+    sparse |= dense
+    assert sparse is original
+    assert sparse.count() == 11_004
+
+    sparse &= dense
+    assert sparse == dense
+
+    sparse ^= dense
+    assert not sparse.any()
+
+
+def test_bitwise_or_matches_bit_array_surface(sparse: RoaringBitmap):
+    other = RoaringBitmap(SIZE)
+    other[1] = 1
+    sparse.bitwise_or(other)
+    assert sparse[1] == 1
+
+    with pytest.raises(ValueError):
+        sparse.bitwise_or(RoaringBitmap(5))
+
+    with pytest.raises(TypeError):
+        sparse.bitwise_or(BitArray(SIZE))
+
+
+def test_run_optimize():
+    bitmap = RoaringBitmap(SIZE)
+    for i in range(100, 60_000):
+        bitmap[i] = 1
+    before = bitmap.__sizeof__()
+    bitmap.run_optimize()
+    assert bitmap.__sizeof__() < before / 10
+    assert bitmap.count() == 59_900
+    assert bitmap[99] == 0 and bitmap[100] == 1 and bitmap[59_999] == 1
+
+    # Writing to a run container keeps it correct
+    bitmap[100] = 0
+    bitmap[60_000] = 1
+    assert bitmap.count() == 59_900
+    assert bitmap[100] == 0 and bitmap[60_000] == 1
+
+
+def test_memory_sparse():
+    bitmap = RoaringBitmap(1 << 32)
+    for i in range(0, 1 << 32, 1 << 20):
+        bitmap[i] = 1
+    assert bitmap.count() == 4_096
+    # A BitArray of this size would need 512 MB
+    assert bitmap.__sizeof__() < 1_000_000
@@ -0,0 +1,59 @@
+import sys
+import pytest
+from src import BloomFilter
+from src import ScalableBloomFilter
+
+
+@pytest.fixture
+def scalable():
+    return ScalableBloomFilter(100, fp_rate=0.01)
+
+
+def test_bad_init():
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(0)
+
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(100, fp_rate=1.5)
+
+    with pytest.raises(TypeError):
+        ScalableBloomFilter(100, growth=1.5)
+
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(100, tightening=1)
+
+
+def test_put_contains(scalable: ScalableBloomFilter):
+    assert scalable.put("hello")
+    assert "hello" in scalable
+    assert not scalable.put("hello")
+    assert len(scalable) == 1
+
+
+def test_grows(scalable: ScalableBloomFilter):
+    assert scalable.num_filters == 1
+    before = sys.getsizeof(scalable)
+
+    scalable.put_many(range(1000))
+    assert scalable.num_filters > 1
+    assert sys.getsizeof(scalable) > before
+    assert all(i in scalable for i in range(1000))
+    # Duplicates are found in older sub-filters
+    assert len(scalable) <= 1000
+
+
+def test_fpp_stays_bounded(scalable: ScalableBloomFilter):
+    scalable.put_many(range(20_000))
+    assert scalable.expected_fpp() < 0.01
+
+    false_positives = sum(f"absent-{i}" in scalable for i in range(20_000))
+    assert false_positives / 20_000 < 0.02
+
+    # A plain BloomFilter of the same initial size is saturated by now
+    bloom = BloomFilter(100, fp_rate=0.01)
+    bloom.put_many(range(20_000))
+    assert sum(f"absent-{i}" in bloom for i in range(1000)) > 900
+
+
+def test_expected_fpp_empty(scalable: ScalableBloomFilter):
+    assert scalable.expected_fpp() == 0
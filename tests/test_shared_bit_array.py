@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+from src import BitArray
+from src import SharedBitArray
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZE = 40_000
+WORKERS = 4
+
+
+@pytest.fixture
+def shared():
+    shared = SharedBitArray(SIZE)
+    yield shared
+    shared.close()
+    shared.unlink()
+
+
+def set_interleaved(shared: SharedBitArray, worker: int) -> None:
+    # Every worker writes into every byte, so unlocked writes would collide
+    for start in range(worker, SIZE, WORKERS * 100):
+        shared.set_many(range(start, min(start + WORKERS * 100, SIZE), WORKERS))
+    for i in range(worker, SIZE, WORKERS * 7):
+        shared[i] = 1
+    shared.close()
+
+
+def test_bad_init():
+    with pytest.raises(TypeError):
+        SharedBitArray(5.5)
+
+    with pytest.raises(ValueError):
+        SharedBitArray(0)
+
+    with pytest.raises(ValueError):
+        SharedBitArray(8, stripes=-1)
+
+
+def test_behaves_like_bit_array(shared: SharedBitArray):
+    shared[3] = 1
+    shared.setrange(100, 200)
+    shared.set_many([5, 6])
+    assert shared.count() == 103
+    assert shared[100:200].all()
+
+    other = BitArray(SIZE)
+    other[7] = 1
+    shared |= other
+    assert shared[7] == 1
+
+    clone = shared.copy()
+    assert type(clone) is BitArray
+    assert clone == shared
+
+
+def test_attach_by_name(shared: SharedBitArray):
+    shared[10] = 1
+    with SharedBitArray.attach(shared.name, SIZE) as other:
+        assert other[10] == 1
+        other[11] = 1
+    assert shared[11] == 1
+
+    with pytest.raises(ValueError):
+        SharedBitArray.attach(shared.name, SIZE * 100)
+
+
+def test_attach_from_unrelated_process(shared: SharedBitArray):
+    # A process that attaches and exits must not free the creator's block
+    code = (
+        "import sys; sys.path[:0] = ['.', 'src']\n"
+        "from src import SharedBitArray\n"
+        f"other = SharedBitArray.attach({shared.name!r}, {SIZE})\n"
+        "other[12] = 1\n"
+        "other.close()\n"
+        # Wait for the child's resource tracker to clean up, if it would
+        "from multiprocessing import resource_tracker\n"
+        "resource_tracker._resource_tracker._stop()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+    with SharedBitArray.attach(shared.name, SIZE) as other:
+        assert other[12] == 1
+
+
+def test_pickles_by_name(shared: SharedBitArray):
+    unlocked = SharedBitArray(SIZE, stripes=0)
+    try:
+        clone = pickle.loads(pickle.dumps(unlocked))
+        clone[0] = 1
+        assert unlocked[0] == 1
+        clone.close()
+    finally:
+        unlocked.close()
+        unlocked.unlink()
+
+
+def test_concurrent_writers(shared: SharedBitArray):
+    processes = [
+        multiprocessing.Process(target=set_interleaved, args=(shared, worker))
+        for worker in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert shared.all()
@@ -1,5 +1,6 @@
 import pytest
 from src import UniqueList
+from src import UniqueListView
 
 
 @pytest.fixture
@@ -152,3 +153,154 @@ def test_delete(unique: UniqueList):
 def test_reversed(unique: UniqueList):
     rev = reversed(unique)
     assert UniqueList(rev)[0] == "world"
+
+
+def test_index(unique: UniqueList):
+    assert unique.index("world") == 1
+    assert unique.index("world", 1) == 1
+
+
+def test_index_invalid(unique: UniqueList):
+    with pytest.raises(ValueError):
+        unique.index("blasphemy")
+    with pytest.raises(ValueError):
+        unique.index("hello", 1)
+    with pytest.raises(ValueError):
+        unique.index("world", 0, 1)
+
+
+def test_set_at_updates_membership(unique: UniqueList):
+    unique[0] = "yes"
+    assert "yes" in unique
+    assert "hello" not in unique
+    with pytest.raises(ValueError):
+        unique.append("yes", strict=True)
+
+
+def test_extend_skips_duplicates(unique: UniqueList):
+    unique.extend(["city", "hello", "city", "lights"])
+    assert list(unique) == ["hello", "world", "city", "lights"]
+    assert "lights" in unique
+
+
+def test_extend_strict(unique: UniqueList):
+    with pytest.raises(ValueError):
+        unique.extend(["city", "hello"], strict=True)
+    with pytest.raises(ValueError):
+        unique.extend(["city", "city"], strict=True)
+    assert len(unique) == 2
+    unique.extend(["city", "lights"], strict=True)
+    assert unique[-1] == "lights"
+
+
+def test_extend_with_generator():
+    unique = UniqueList(i % 3 for i in range(10))
+    assert list(unique) == [0, 1, 2]
+
+
+def test_delete_slice():
+    unique = UniqueList(range(10))
+    del unique[2:8:2]
+    assert list(unique) == [0, 1, 3, 5, 7, 8, 9]
+    assert 2 not in unique and 6 not in unique
+    unique.append(2)
+    assert unique[-1] == 2
+
+
+def test_set_slice():
+    unique = UniqueList(range(5))
+    unique[1:3] = ["a", "b", "c"]
+    assert list(unique) == [0, "a", "b", "c", 3, 4]
+    assert 1 not in unique and "c" in unique
+    # Items being replaced may reappear
+    unique[:2] = ["a", 0]
+    assert list(unique) == ["a", 0, "b", "c", 3, 4]
+
+
+def test_set_slice_duplicates():
+    unique = UniqueList(range(5))
+    with pytest.raises(ValueError):
+        unique[:2] = [7, 7]
+    with pytest.raises(ValueError):
+        unique[:2] = [4]
+    with pytest.raises(ValueError):
+        unique[::2] = [7]
+    assert list(unique) == [0, 1, 2, 3, 4]
+    assert 7 not in unique
+
+
+def test_remove_many():
+    unique = UniqueList(range(10))
+    unique.remove_many([1, 5, 9])
+    assert list(unique) == [0, 2, 3, 4, 6, 7, 8]
+    assert 5 not in unique
+
+
+def test_remove_many_invalid(unique: UniqueList):
+    with pytest.raises(ValueError):
+        unique.remove_many(["hello", "blasphemy"])
+    assert list(unique) == ["hello", "world"]
+
+
+def test_slice_is_view():
+    unique = UniqueList(range(10))
+    view = unique[2:8:2]
+    assert isinstance(view, UniqueListView)
+    assert len(view) == 3
+    assert view[0] == 2 and view[-1] == 6
+    assert view == [2, 4, 6]
+    unique[4] = "four"
+    assert view[1] == "four"
+
+
+def test_view_contains():
+    view = UniqueList(range(10))[2:8:2]
+    assert 4 in view
+    assert 3 not in view
+    assert 8 not in view
+    assert "blasphemy" not in view
+    assert view.count(4) == 1 and view.count(3) == 0
+
+
+def test_view_index():
+    view = UniqueList(range(10))[::-3]
+    assert list(view) == [9, 6, 3, 0]
+    assert view.index(3) == 2
+    with pytest.raises(ValueError):
+        view.index(4)
+    with pytest.raises(ValueError):
+        view.index(9, 1)
+
+
+def test_view_of_view():
+    unique = UniqueList("abcdefgh")
+    view = unique[1:7][::2]
+    assert list(view) == ["b", "d", "f"]
+    assert list(reversed(view)) == ["f", "d", "b"]
+    assert view._parent is unique
+
+
+def test_view_is_read_only():
+    view = UniqueList(range(3))[:]
+    with pytest.raises(TypeError):
+        view[0] = 5
+
+
+def test_view_copy():
+    unique = UniqueList(range(5))
+    copy = unique[1:3].copy()
+    assert isinstance(copy, UniqueList)
+    assert list(copy) == [1, 2] and 2 in copy and 3 not in copy
+    copy.append(7)
+    assert 7 not in unique
+
+
+def test_copy(unique: UniqueList):
+    copy = unique.copy()
+    assert isinstance(copy, UniqueList)
+    copy.append("city")
+    assert "city" not in unique
+    # The way to change a UniqueList while looping over it
+    for item in unique.copy():
+        unique.remove(item)
+    assert len(unique) == 0
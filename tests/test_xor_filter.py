@@ -0,0 +1,50 @@
+import sys
+import pytest
+from src import Blake2bHashStrategy
+from src import XorFilter
+
+
+@pytest.fixture
+def keys():
+    return [f"key-{i}" for i in range(10_000)]
+
+
+def test_bad_init():
+    with pytest.raises(ValueError):
+        XorFilter([1, 2], fingerprint_bits=12)
+
+    with pytest.raises(TypeError):
+        XorFilter([1, 2], hash_strategy="md5")
+
+
+def test_no_false_negatives(keys):
+    xor = XorFilter(keys)
+    assert len(xor) == len(keys)
+    assert all(key in xor for key in keys)
+
+
+def test_duplicates_and_small_sets():
+    xor = XorFilter([1, 1, 2, 2.0, "a", "a"])
+    assert len(xor) == 3
+    assert 1 in xor and 2 in xor and "a" in xor
+
+    assert len(XorFilter([])) == 0
+    assert "only" in XorFilter(["only"])
+
+
+@pytest.mark.parametrize("bits", [8, 16])
+def test_fpp(keys, bits):
+    xor = XorFilter(keys, fingerprint_bits=bits)
+    false_positives = sum(f"miss-{i}" in xor for i in range(100_000))
+    assert false_positives / 100_000 < 2 * xor.expected_fpp()
+
+
+def test_size(keys):
+    xor = XorFilter(keys)
+    # About 1.23 * 8 bits per key
+    assert sys.getsizeof(xor) * 8 / len(keys) < 10.5
+
+
+def test_hash_strategy(keys):
+    xor = XorFilter(keys, hash_strategy=Blake2bHashStrategy(seed=3))
+    assert all(key in xor for key in keys)